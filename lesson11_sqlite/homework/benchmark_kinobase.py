@@ -0,0 +1,223 @@
+"""
+Бенчмарк запитів меню КІНОБАЗИ на великій базі даних.
+
+Створює тимчасову базу (за замовчуванням 1 000 000 фільмів та 5 000 000
+записів movie_cast), вимірює час запитів меню у початковому вигляді (без
+індексів) і через шар запитів MovieDatabase після міграції схеми
+(пошук за назвою - через повнотекстовий індекс FTS5), а також режими
+обчислення віку фільмів (AGE_MODES).
+
+Запуск:
+    python benchmark_kinobase.py
+    python benchmark_kinobase.py --movies 100000 --cast 500000 --repeat 5
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from kinobase import AGE_MODES, SCHEMA_TABLES, MovieDatabase, encode_page_cursor, np
+
+
+GENRES = [
+    "Драма", "Комедія", "Бойовик", "Трилер", "Жахи", "Фантастика", "Фентезі",
+    "Мелодрама", "Детектив", "Пригоди", "Анімація", "Документальний",
+    "Вестерн", "Мюзикл", "Кримінал", "Історичний", "Воєнний", "Біографія",
+]
+
+WORDS = [
+    "love", "night", "city", "war", "star", "dream", "river", "king", "shadow",
+    "road", "storm", "heart", "game", "secret", "island", "winter", "fire",
+    "ghost", "last", "lost", "dark", "golden", "wild", "silent", "blue",
+]
+
+# Запити меню у початковому вигляді (як до появи шару запитів та індексів)
+LEGACY_QUERIES: Dict[str, tuple] = {
+    "4. Фільми з акторами": ('''
+        SELECT m.title, m.release_year, m.genre, GROUP_CONCAT(a.name, ', ') as actors
+        FROM movies m
+                 INNER JOIN movie_cast mc ON m.id = mc.movie_id
+                 INNER JOIN actors a ON mc.actor_id = a.id
+        GROUP BY m.id, m.title, m.release_year, m.genre
+        ORDER BY m.title''', ()),
+    "5. Унікальні жанри": ("SELECT DISTINCT genre FROM movies ORDER BY genre", ()),
+    "6. Кількість за жанром": ('''
+        SELECT genre, COUNT(*) as count FROM movies
+        GROUP BY genre ORDER BY count DESC, genre''', ()),
+    "7. Середній рік народження": ('''
+        SELECT AVG(a.birth_year) as avg_birth_year
+        FROM actors a
+                 INNER JOIN movie_cast mc ON a.id = mc.actor_id
+                 INNER JOIN movies m ON mc.movie_id = m.id
+        WHERE m.genre = ?''', (GENRES[0],)),
+    "8. Пошук за назвою": ('''
+        SELECT id, title, release_year, genre FROM movies
+        WHERE title LIKE ? ORDER BY title''', ("%love night%",)),
+    "9. Пагінація (сторінка 1)": ('''
+        SELECT id, title, release_year, genre FROM movies
+        ORDER BY title LIMIT ? OFFSET ?''', (5, 0)),
+    # Параметри (5, зміщення) підставляються в main() залежно від розміру бази
+    "9. Пагінація (глибока сторінка)": ('''
+        SELECT id, title, release_year, genre FROM movies
+        ORDER BY title LIMIT ? OFFSET ?''', None),
+    "10. Актори та фільми (UNION)": ('''
+        SELECT name as item, 'Актор' as type FROM actors
+        UNION
+        SELECT title as item, 'Фільм' as type FROM movies
+        ORDER BY item''', ()),
+    "11. Фільми з віком": ('''
+        SELECT title, release_year, movie_age(release_year) as age
+        FROM movies ORDER BY age DESC''', ()),
+}
+
+
+def fill_database(db_path: str, movies: int, actors: int, cast: int) -> None:
+    """
+    Заповнення бази випадковими даними.
+
+    Args:
+        db_path (str): Шлях до файлу бази даних
+        movies (int): Кількість фільмів
+        actors (int): Кількість акторів
+        cast (int): Кількість записів movie_cast
+    """
+    rng = random.Random(42)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = OFF")
+    for statement in SCHEMA_TABLES:
+        conn.execute(statement)
+
+    current_year = datetime.now().year
+    with conn:
+        conn.executemany(
+            "INSERT INTO movies (title, release_year, genre) VALUES (?, ?, ?)",
+            ((f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {i}",
+              rng.randint(1900, current_year),
+              rng.choice(GENRES)) for i in range(movies))
+        )
+        conn.executemany(
+            "INSERT INTO actors (name, birth_year) VALUES (?, ?)",
+            ((f"Actor {rng.choice(WORDS).title()} {i}", rng.randint(1900, current_year - 10))
+             for i in range(actors))
+        )
+
+        # Для кожного фільму - per_movie різних акторів з кроком step,
+        # щоб не порушувати PRIMARY KEY (movie_id, actor_id)
+        per_movie = max(1, cast // movies)
+        step = max(1, actors // per_movie)
+
+        def cast_rows():
+            for movie_id in range(1, movies + 1):
+                first = rng.randrange(actors)
+                for k in range(per_movie):
+                    yield movie_id, (first + k * step) % actors + 1
+
+        conn.executemany("INSERT INTO movie_cast (movie_id, actor_id) VALUES (?, ?)", cast_rows())
+    conn.close()
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """
+    Вимірює медіанний час виконання функції.
+
+    Args:
+        func (Callable): Функція без аргументів
+        repeat (int): Кількість повторів
+
+    Returns:
+        float: Медіанний час у мілісекундах
+    """
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    """
+    Головна функція бенчмарку.
+    """
+    parser = argparse.ArgumentParser(description="Бенчмарк запитів КІНОБАЗИ")
+    parser.add_argument("--movies", type=int, default=1_000_000)
+    parser.add_argument("--actors", type=int, default=100_000)
+    parser.add_argument("--cast", type=int, default=5_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "kinobase_bench.db")
+
+        start = time.perf_counter()
+        fill_database(db_path, args.movies, args.actors, args.cast)
+        print(f"Базу заповнено за {time.perf_counter() - start:.1f} с "
+              f"({args.movies} фільмів, {args.actors} акторів, ~{args.cast} movie_cast)")
+
+        # До міграції: початкові запити без індексів
+        conn = sqlite3.connect(db_path)
+        conn.create_function("movie_age", 1, lambda year: datetime.now().year - year)
+        # Глибока сторінка - майже в кінці каталогу
+        deep_offset = max(0, args.movies - 10)
+        legacy = {
+            name: measure(
+                lambda q=query, p=(5, deep_offset) if params is None else params:
+                conn.execute(q, p).fetchall(),
+                args.repeat,
+            )
+            for name, (query, params) in LEGACY_QUERIES.items()
+        }
+        # Курсор на ту саму позицію: останній фільм перед глибокою сторінкою
+        deep_title, deep_id = conn.execute(
+            "SELECT title, id FROM movies ORDER BY title, id LIMIT 1 OFFSET ?",
+            (max(0, deep_offset - 1),)
+        ).fetchone()
+        deep_cursor = encode_page_cursor(deep_title, deep_id)
+        conn.close()
+
+        # Після міграції: шар запитів MovieDatabase
+        db = MovieDatabase(db_path)
+        current = {
+            "4. Фільми з акторами": lambda: db.fetch_movies_with_actors(),
+            "5. Унікальні жанри": lambda: db.fetch_unique_genres(),
+            "6. Кількість за жанром": lambda: db.fetch_genre_counts(),
+            "7. Середній рік народження": lambda: db.fetch_avg_actor_birth_year(GENRES[0]),
+            "8. Пошук за назвою": lambda: db.search_movies("love night", limit=50),
+            "9. Пагінація (сторінка 1)": lambda: db.fetch_movies_page(5),
+            "9. Пагінація (глибока сторінка)": lambda: db.fetch_movies_page(5, deep_cursor),
+            "10. Актори та фільми (UNION)": lambda: db.fetch_actors_and_movies(),
+            "11. Фільми з віком": lambda: db.fetch_movies_with_age(),
+        }
+
+        print(f"\n{'Запит':<32}{'до, мс':>12}{'після, мс':>12}{'прискорення':>14}")
+        print("-" * 70)
+        for name, func in current.items():
+            after = measure(func, args.repeat)
+            before = legacy[name]
+            print(f"{name:<32}{before:>12.1f}{after:>12.1f}{before / after:>13.1f}x")
+
+        # Звіт "Фільми з віком": Python-функція на кожен рядок проти
+        # обчислення в SQL та одного векторного проходу numpy
+        udf_time = measure(lambda: db.fetch_movies_with_age("udf"), args.repeat)
+        print(f"\n{'Вік фільмів, режим':<32}{'мс':>12}{'прискорення':>14}")
+        print("-" * 58)
+        for mode in AGE_MODES:
+            if mode == "numpy" and np is None:
+                print(f"{mode:<32}{'numpy не встановлено':>26}")
+                continue
+            elapsed = udf_time if mode == "udf" else measure(
+                lambda m=mode: db.fetch_movies_with_age(m), args.repeat
+            )
+            print(f"{mode:<32}{elapsed:>12.1f}{udf_time / elapsed:>13.1f}x")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
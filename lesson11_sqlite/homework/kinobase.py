@@ -2,9 +2,248 @@
 КІНОБАЗА - Система керування базою даних фільмів та акторів
 """
 
+import base64
+import json
+import re
 import sqlite3
 from datetime import datetime
-from typing import Optional, Tuple, List
+from typing import Dict, Optional, Tuple, List
+
+try:
+    import numpy as np
+except ImportError:  # numpy потрібен лише для режиму звіту "numpy"
+    np = None
+
+
+# Розмір кешу підготовлених запитів з'єднання. sqlite3 кешує скомпільовані
+# запити за текстом SQL, тому всі запити меню винесені в константи нижче:
+# однаковий текст -> повторне використання вже підготовленого запиту.
+STATEMENT_CACHE_SIZE = 256
+
+# Таблиці бази (як у create_kinobase.py). Створюються лише для нової бази,
+# див. MovieDatabase(create_tables=True).
+SCHEMA_TABLES: List[str] = [
+    """CREATE TABLE IF NOT EXISTS movies
+       (id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        release_year INTEGER NOT NULL,
+        genre TEXT NOT NULL)""",
+    """CREATE TABLE IF NOT EXISTS actors
+       (id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        birth_year INTEGER NOT NULL)""",
+    """CREATE TABLE IF NOT EXISTS movie_cast
+       (movie_id INTEGER NOT NULL,
+        actor_id INTEGER NOT NULL,
+        PRIMARY KEY (movie_id, actor_id),
+        FOREIGN KEY (movie_id) REFERENCES movies (id) ON DELETE CASCADE,
+        FOREIGN KEY (actor_id) REFERENCES actors (id) ON DELETE CASCADE)""",
+]
+
+# Міграції схеми: версія (PRAGMA user_version) -> список SQL-команд.
+# Застосовуються по черзі всі версії, більші за поточну.
+SCHEMA_MIGRATIONS: Dict[int, List[str]] = {
+    1: [
+        # ORDER BY title та пошук за назвою
+        "CREATE INDEX IF NOT EXISTS idx_movies_title ON movies (title)",
+        # GROUP BY genre та WHERE genre = ? (покриваючий індекс для COUNT)
+        "CREATE INDEX IF NOT EXISTS idx_movies_genre ON movies (genre)",
+        # ORDER BY name у списку акторів
+        "CREATE INDEX IF NOT EXISTS idx_actors_name ON actors (name)",
+        # JOIN з боку актора (PRIMARY KEY (movie_id, actor_id) покриває лише movie_id)
+        "CREATE INDEX IF NOT EXISTS idx_movie_cast_actor ON movie_cast (actor_id, movie_id)",
+    ],
+    2: [
+        # Повнотекстовий індекс назв (FTS5). content='movies' - сам текст
+        # не дублюється, індекс посилається на movies.id через rowid.
+        """CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5(
+               title,
+               content='movies',
+               content_rowid='id',
+               tokenize='unicode61 remove_diacritics 2'
+           )""",
+        # Тригери підтримують індекс у синхронному стані при add_movie та інших змінах
+        """CREATE TRIGGER IF NOT EXISTS movies_fts_insert AFTER INSERT ON movies BEGIN
+               INSERT INTO movies_fts (rowid, title) VALUES (new.id, new.title);
+           END""",
+        """CREATE TRIGGER IF NOT EXISTS movies_fts_delete AFTER DELETE ON movies BEGIN
+               INSERT INTO movies_fts (movies_fts, rowid, title) VALUES ('delete', old.id, old.title);
+           END""",
+        """CREATE TRIGGER IF NOT EXISTS movies_fts_update AFTER UPDATE OF title ON movies BEGIN
+               INSERT INTO movies_fts (movies_fts, rowid, title) VALUES ('delete', old.id, old.title);
+               INSERT INTO movies_fts (rowid, title) VALUES (new.id, new.title);
+           END""",
+        # Індексація фільмів, що вже є в базі
+        "INSERT INTO movies_fts (movies_fts) VALUES ('rebuild')",
+    ],
+}
+
+# Максимальна кількість результатів повнотекстового пошуку в меню
+SEARCH_RESULTS_LIMIT = 50
+
+# Фільми з акторами. Актори групуються прямо при послідовному обході
+# первинного ключа movie_cast (movie_id, actor_id), без GROUP BY по всім
+# колонкам movies; потім кожна група з'єднується з фільмом по id.
+MOVIES_WITH_ACTORS_QUERY = """
+    SELECT m.title,
+           m.release_year,
+           m.genre,
+           c.actors
+    FROM (SELECT mc.movie_id, GROUP_CONCAT(a.name, ', ') AS actors
+          FROM movie_cast mc
+                   INNER JOIN actors a ON a.id = mc.actor_id
+          GROUP BY mc.movie_id) c
+             INNER JOIN movies m ON m.id = c.movie_id
+    ORDER BY m.title
+"""
+
+UNIQUE_GENRES_QUERY = "SELECT DISTINCT genre FROM movies ORDER BY genre"
+
+COUNT_MOVIES_BY_GENRE_QUERY = """
+    SELECT genre, COUNT(*) AS count
+    FROM movies
+    GROUP BY genre
+    ORDER BY count DESC, genre
+"""
+
+AVG_ACTOR_BIRTH_YEAR_QUERY = """
+    SELECT AVG(a.birth_year) AS avg_birth_year
+    FROM movies m
+             INNER JOIN movie_cast mc ON mc.movie_id = m.id
+             INNER JOIN actors a ON a.id = mc.actor_id
+    WHERE m.genre = ?
+"""
+
+SEARCH_MOVIES_QUERY = """
+    SELECT id, title, release_year, genre
+    FROM movies
+    WHERE title LIKE ?
+    ORDER BY title
+"""
+
+# Повнотекстовий пошук: найрелевантніші (bm25) спочатку. LIMIT -1 - без обмеження
+FTS_SEARCH_MOVIES_QUERY = """
+    SELECT m.id, m.title, m.release_year, m.genre
+    FROM movies_fts
+             INNER JOIN movies m ON m.id = movies_fts.rowid
+    WHERE movies_fts MATCH ?
+    ORDER BY movies_fts.rank, m.title
+    LIMIT ?
+"""
+
+COUNT_MOVIES_QUERY = "SELECT COUNT(*) FROM movies"
+
+# Keyset-пагінація: наступна сторінка починається одразу після (title, id)
+# останнього показаного фільму. Пошук позиції йде по idx_movies_title
+# (індекс містить rowid, тому покриває порядок title, id), і час сторінки
+# не залежить від її номера, на відміну від OFFSET.
+FIRST_MOVIES_PAGE_QUERY = """
+    SELECT id, title, release_year, genre
+    FROM movies
+    ORDER BY title, id
+    LIMIT ?
+"""
+
+NEXT_MOVIES_PAGE_QUERY = """
+    SELECT id, title, release_year, genre
+    FROM movies
+    WHERE (title, id) > (?, ?)
+    ORDER BY title, id
+    LIMIT ?
+"""
+
+ACTORS_AND_MOVIES_QUERY = """
+    SELECT name AS item, 'Актор' AS type
+    FROM actors
+    UNION
+    SELECT title AS item, 'Фільм' AS type
+    FROM movies
+    ORDER BY item
+"""
+
+MOVIES_WITH_AGE_QUERY = """
+    SELECT title,
+           release_year,
+           movie_age(release_year) AS age
+    FROM movies
+    ORDER BY age DESC
+"""
+
+# Вік у чистому SQL: поточний рік передається параметром, тому SQLite не
+# викликає Python-функцію для кожного рядка. ORDER BY release_year
+# дає той самий порядок, що й ORDER BY age DESC.
+MOVIES_WITH_AGE_SQL_QUERY = """
+    SELECT title,
+           release_year,
+           ? - release_year AS age
+    FROM movies
+    ORDER BY release_year
+"""
+
+MOVIES_BY_RELEASE_YEAR_QUERY = """
+    SELECT title, release_year
+    FROM movies
+    ORDER BY release_year
+"""
+
+# Способи обчислення віку у звіті "Фільми з віком":
+# sql - арифметика в запиті, numpy - один векторний прохід по колонці років,
+# udf - Python-функція movie_age() на кожен рядок (початковий варіант)
+AGE_MODES = ("sql", "numpy", "udf")
+
+
+def encode_page_cursor(title: str, movie_id: int) -> str:
+    """
+    Кодує позицію останнього фільму сторінки у непрозорий курсор.
+
+    Args:
+        title (str): Назва останнього фільму сторінки
+        movie_id (int): ID останнього фільму сторінки
+
+    Returns:
+        str: Курсор для запиту наступної сторінки
+    """
+    payload = json.dumps([title, movie_id], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_page_cursor(page_cursor: str) -> Tuple[str, int]:
+    """
+    Розкодовує курсор, створений encode_page_cursor().
+
+    Args:
+        page_cursor (str): Курсор сторінки
+
+    Returns:
+        Tuple[str, int]: (назва, ID) останнього фільму попередньої сторінки
+
+    Raises:
+        ValueError: Якщо курсор пошкоджений
+    """
+    try:
+        title, movie_id = json.loads(base64.urlsafe_b64decode(page_cursor.encode("ascii")))
+        return str(title), int(movie_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Некоректний курсор сторінки: {page_cursor!r}") from e
+
+
+def build_fts_query(keyword: str) -> Optional[str]:
+    """
+    Перетворює введений користувачем текст у запит FTS5.
+
+    Кожне слово стає префіксним пошуком ("слово"*), слова об'єднуються
+    через AND. Лапки екрануються, тому спецсимволи FTS5 у введенні безпечні.
+
+    Args:
+        keyword (str): Текст для пошуку
+
+    Returns:
+        Optional[str]: Запит для MATCH або None, якщо у тексті немає слів
+    """
+    words = re.findall(r"\w+", keyword)
+    if not words:
+        return None
+    return " ".join('"{}"*'.format(word.replace('"', '""')) for word in words)
 
 
 class MovieDatabase:
@@ -17,17 +256,27 @@ class MovieDatabase:
         cursor (Optional[sqlite3.Cursor]): Курсор для виконання SQL-запитів
     """
 
-    def __init__(self, db_name: str = "kinobase.db") -> None:
+    def __init__(self, db_name: str = "kinobase.db", create_tables: bool = False,
+                 migrate: bool = True) -> None:
         """
         Ініціалізація підключення до існуючої бази даних.
         
         Args:
             db_name (str): Назва файлу бази даних. За замовчуванням "kinobase.db"
+            create_tables (bool): Створити таблиці, якщо їх ще немає (нова база)
+            migrate (bool): Одразу застосувати міграції схеми. False - індекси
+                та FTS створить пізніший виклик migrate_schema() (масове завантаження)
         """
         self.db_name: str = db_name
         self.conn: Optional[sqlite3.Connection] = None
         self.cursor: Optional[sqlite3.Cursor] = None
         self.connect()
+        if create_tables:
+            for statement in SCHEMA_TABLES:
+                self.cursor.execute(statement)
+            self.conn.commit()
+        if migrate:
+            self.migrate_schema()
         self.create_custom_function() # рееструемо кожен раз
 
     def connect(self) -> None:
@@ -38,7 +287,7 @@ class MovieDatabase:
             sqlite3.Error: Якщо не вдалося підключитися до бази даних
         """
         try:
-            self.conn = sqlite3.connect(self.db_name)
+            self.conn = sqlite3.connect(self.db_name, cached_statements=STATEMENT_CACHE_SIZE)
             self.cursor = self.conn.cursor()
             # Увімкнення підтримки зовнішніх ключів
             self.cursor.execute("PRAGMA foreign_keys = ON")
@@ -47,6 +296,198 @@ class MovieDatabase:
             print(f"Помилка підключення до бази даних: {e}")
             raise
 
+    def migrate_schema(self) -> None:
+        """
+        Застосування міграцій схеми (індексів) з SCHEMA_MIGRATIONS.
+
+        Поточна версія схеми зберігається у PRAGMA user_version, тому кожна
+        міграція виконується лише один раз.
+
+        Raises:
+            sqlite3.Error: Якщо міграцію не вдалося застосувати
+        """
+        version = self.cursor.execute("PRAGMA user_version").fetchone()[0]
+        pending = [v for v in sorted(SCHEMA_MIGRATIONS) if v > version]
+        if not pending:
+            return
+
+        try:
+            for target_version in pending:
+                for statement in SCHEMA_MIGRATIONS[target_version]:
+                    self.cursor.execute(statement)
+                # PRAGMA не підтримує параметри, версія - ціле число з коду
+                self.cursor.execute(f"PRAGMA user_version = {int(target_version)}")
+            # Оновлення статистики для планувальника запитів
+            self.cursor.execute("ANALYZE")
+            self.conn.commit()
+            print(f"✓ Схему оновлено до версії {pending[-1]}")
+        except sqlite3.Error as e:
+            print(f"✗ Помилка міграції схеми: {e}")
+            self.conn.rollback()
+            raise
+
+    # ---- Шар запитів: повертають дані без виводу на екран ----
+
+    def fetch_movies_with_actors(self) -> List[Tuple[str, int, str, str]]:
+        """
+        Повертає фільми, у яких є актори, разом зі списком акторів.
+
+        Returns:
+            List[Tuple]: (назва, рік, жанр, актори через кому), відсортовані за назвою
+        """
+        return self.cursor.execute(MOVIES_WITH_ACTORS_QUERY).fetchall()
+
+    def fetch_unique_genres(self) -> List[str]:
+        """
+        Повертає відсортований список унікальних жанрів.
+
+        Returns:
+            List[str]: Жанри
+        """
+        return [row[0] for row in self.cursor.execute(UNIQUE_GENRES_QUERY)]
+
+    def fetch_genre_counts(self) -> List[Tuple[str, int]]:
+        """
+        Повертає кількість фільмів у кожному жанрі.
+
+        Returns:
+            List[Tuple[str, int]]: (жанр, кількість), від найбільшої кількості
+        """
+        return self.cursor.execute(COUNT_MOVIES_BY_GENRE_QUERY).fetchall()
+
+    def fetch_avg_actor_birth_year(self, genre: str) -> Optional[float]:
+        """
+        Обчислює середній рік народження акторів у фільмах жанру.
+
+        Args:
+            genre (str): Жанр
+
+        Returns:
+            Optional[float]: Середній рік або None, якщо акторів немає
+        """
+        return self.cursor.execute(AVG_ACTOR_BIRTH_YEAR_QUERY, (genre,)).fetchone()[0]
+
+    def fetch_movies_by_title(self, keyword: str) -> List[Tuple[int, str, int, str]]:
+        """
+        Шукає фільми, назва яких містить ключове слово.
+
+        Args:
+            keyword (str): Ключове слово
+
+        Returns:
+            List[Tuple]: (id, назва, рік, жанр)
+        """
+        return self.cursor.execute(SEARCH_MOVIES_QUERY, (f'%{keyword}%',)).fetchall()
+
+    def search_movies(self, keyword: str,
+                      limit: Optional[int] = None) -> List[Tuple[int, str, int, str]]:
+        """
+        Повнотекстовий пошук фільмів за назвою (FTS5) з ранжуванням.
+
+        На відміну від fetch_movies_by_title (LIKE '%...%', повний перегляд
+        таблиці), шукає за індексом слів: кожне слово запиту має бути
+        початком слова у назві.
+
+        Args:
+            keyword (str): Слова для пошуку
+            limit (Optional[int]): Максимальна кількість результатів (None - всі)
+
+        Returns:
+            List[Tuple]: (id, назва, рік, жанр), від найрелевантніших
+        """
+        fts_query = build_fts_query(keyword)
+        if fts_query is None:
+            return []
+        return self.cursor.execute(
+            FTS_SEARCH_MOVIES_QUERY, (fts_query, -1 if limit is None else limit)
+        ).fetchall()
+
+    def count_movies(self) -> int:
+        """
+        Повертає загальну кількість фільмів.
+
+        Returns:
+            int: Кількість фільмів
+        """
+        return self.cursor.execute(COUNT_MOVIES_QUERY).fetchone()[0]
+
+    def fetch_movies_page(self, page_size: int,
+                          page_cursor: Optional[str] = None
+                          ) -> Tuple[List[Tuple[int, str, int, str]], Optional[str]]:
+        """
+        Повертає одну сторінку фільмів, відсортованих за назвою (keyset-пагінація).
+
+        Args:
+            page_size (int): Кількість фільмів на сторінці
+            page_cursor (Optional[str]): Курсор з попереднього виклику
+                або None для першої сторінки
+
+        Returns:
+            Tuple: (список (id, назва, рік, жанр), курсор наступної сторінки
+                або None, якщо сторінка остання)
+
+        Raises:
+            ValueError: Якщо курсор пошкоджений
+        """
+        # Запитуємо на один рядок більше, щоб дізнатися, чи є наступна сторінка
+        if page_cursor is None:
+            rows = self.cursor.execute(FIRST_MOVIES_PAGE_QUERY, (page_size + 1,)).fetchall()
+        else:
+            title, movie_id = decode_page_cursor(page_cursor)
+            rows = self.cursor.execute(
+                NEXT_MOVIES_PAGE_QUERY, (title, movie_id, page_size + 1)
+            ).fetchall()
+
+        if len(rows) <= page_size:
+            return rows, None
+
+        rows = rows[:page_size]
+        last_id, last_title = rows[-1][0], rows[-1][1]
+        return rows, encode_page_cursor(last_title, last_id)
+
+    def fetch_actors_and_movies(self) -> List[Tuple[str, str]]:
+        """
+        Повертає об'єднаний список імен акторів та назв фільмів.
+
+        Returns:
+            List[Tuple[str, str]]: (ім'я або назва, тип)
+        """
+        return self.cursor.execute(ACTORS_AND_MOVIES_QUERY).fetchall()
+
+    def fetch_movies_with_age(self, mode: str = "sql") -> List[Tuple[str, int, int]]:
+        """
+        Повертає фільми з їхнім віком.
+
+        Args:
+            mode (str): Спосіб обчислення віку, один з AGE_MODES
+
+        Returns:
+            List[Tuple]: (назва, рік, вік), від найстаріших
+
+        Raises:
+            ValueError: Якщо режим невідомий
+            RuntimeError: Якщо для режиму "numpy" не встановлено numpy
+        """
+        current_year = datetime.now().year
+
+        if mode == "sql":
+            return self.cursor.execute(MOVIES_WITH_AGE_SQL_QUERY, (current_year,)).fetchall()
+
+        if mode == "numpy":
+            if np is None:
+                raise RuntimeError("Для режиму 'numpy' потрібен пакет numpy")
+            rows = self.cursor.execute(MOVIES_BY_RELEASE_YEAR_QUERY).fetchall()
+            if not rows:
+                return []
+            titles, years = zip(*rows)
+            ages = current_year - np.fromiter(years, dtype=np.int64, count=len(years))
+            return list(zip(titles, years, ages.tolist()))
+
+        if mode == "udf":
+            return self.cursor.execute(MOVIES_WITH_AGE_QUERY).fetchall()
+
+        raise ValueError(f"Невідомий режим: {mode}. Доступні: {', '.join(AGE_MODES)}")
+
     def create_custom_function(self) -> None:
         """
         Створення та реєстрація власної SQL-функції movie_age().
@@ -264,19 +705,7 @@ class MovieDatabase:
         """
         print("\n---- ФІЛЬМИ ТА АКТОРИ ----")
         try:
-            query = '''
-                    SELECT m.title, \
-                           m.release_year, \
-                           m.genre, \
-                           GROUP_CONCAT(a.name, ', ') as actors
-                    FROM movies m
-                             INNER JOIN movie_cast mc ON m.id = mc.movie_id
-                             INNER JOIN actors a ON mc.actor_id = a.id
-                    GROUP BY m.id, m.title, m.release_year, m.genre
-                    ORDER BY m.title \
-                    '''
-            self.cursor.execute(query)
-            movies = self.cursor.fetchall()
+            movies = self.fetch_movies_with_actors()
 
             if not movies:
                 print("Немає фільмів з акторами")
@@ -294,15 +723,14 @@ class MovieDatabase:
         """
         print("\n---- УНІКАЛЬНІ ЖАНРИ DISTINCT ----")
         try:
-            self.cursor.execute("SELECT DISTINCT genre FROM movies ORDER BY genre")
-            genres = self.cursor.fetchall()
+            genres = self.fetch_unique_genres()
 
             if not genres:
                 print("Немає жанрів у базі")
                 return
 
             for i, genre in enumerate(genres, 1):
-                print(f"{i}. {genre[0]}")
+                print(f"{i}. {genre}")
         except sqlite3.Error as e:
             print(f"✗ Помилка отримання жанрів: {e}")
 
@@ -312,14 +740,7 @@ class MovieDatabase:
         """
         print("\n---- КІЛЬКІСТЬ ФІЛЬМІВ ЗА ЖАНРОМ - GROUP BY- ORDER BY---")
         try:
-            query = '''
-                    SELECT genre, COUNT(*) as count
-                    FROM movies
-                    GROUP BY genre
-                    ORDER BY count DESC, genre \
-                    '''
-            self.cursor.execute(query)
-            results = self.cursor.fetchall()
+            results = self.fetch_genre_counts()
 
             if not results:
                 print("Немає фільмів у базі")
@@ -343,29 +764,25 @@ class MovieDatabase:
                 print("✗ Жанр не може бути порожнім!")
                 return
 
-            query = '''
-                    SELECT AVG(a.birth_year) as avg_birth_year
-                    FROM actors a
-                             INNER JOIN movie_cast mc ON a.id = mc.actor_id
-                             INNER JOIN movies m ON mc.movie_id = m.id
-                    WHERE m.genre = ? \
-                    '''
-            self.cursor.execute(query, (genre,))
-            result = self.cursor.fetchone()
-
-            if result[0] is None:
+            avg_birth_year = self.fetch_avg_actor_birth_year(genre)
+
+            if avg_birth_year is None:
                 print(f"Немає акторів у фільмах жанру '{genre}'")
                 return
 
-            print(f"\nСередній рік народження акторів у жанрі '{genre}': {result[0]:.1f}")
+            print(f"\nСередній рік народження акторів у жанрі '{genre}': {avg_birth_year:.1f}")
         except sqlite3.Error as e:
             print(f"✗ Помилка обчислення: {e}")
 
     def search_movies_by_title(self) -> None:
         """
-        Пошук фільмів за ключовим словом у назві (використовує LIKE).
+        Пошук фільмів за назвою: підрядок (LIKE, за замовчуванням) або
+        слова (повнотекстовий індекс FTS5, з ранжуванням).
+
+        Якщо FTS5 нічого не знайшов (наприклад, "atrix" - не початок слова),
+        виконується пошук підрядка.
         """
-        print("\n---- ПОШУК ФІЛЬМУ LIKE ----")
+        print("\n---- ПОШУК ФІЛЬМУ ----")
         try:
             keyword = input("Введіть ключове слово для пошуку: ").strip()
 
@@ -373,34 +790,39 @@ class MovieDatabase:
                 print("✗ Ключове слово не може бути порожнім!")
                 return
 
-            query = '''
-                    SELECT id, title, release_year, genre
-                    FROM movies
-                    WHERE title LIKE ?
-                    ORDER BY title \
-                    '''
-            self.cursor.execute(query, (f'%{keyword}%',))
-            movies = self.cursor.fetchall()
+            use_fts = input("Режим: підрядок LIKE (Enter) або слова FTS5 (2): ").strip() == "2"
+            truncated = False
+            if use_fts:
+                # Зайвий рядок показує, що результати обрізано лімітом
+                movies = self.search_movies(keyword, limit=SEARCH_RESULTS_LIMIT + 1)
+                truncated = len(movies) > SEARCH_RESULTS_LIMIT
+                movies = movies[:SEARCH_RESULTS_LIMIT]
+                if not movies:
+                    print("FTS5 нічого не знайшов - шукаємо підрядок (LIKE)")
+                    use_fts = False
+            if not use_fts:
+                movies = self.fetch_movies_by_title(keyword)
 
             if not movies:
                 print(f"Фільми з '{keyword}' не знайдено")
                 return
 
-            print(f"\nЗнайдені фільми:")
+            print(f"\nЗнайдені фільми{' (FTS5, від найрелевантніших)' if use_fts else ''}:")
             for i, movie in enumerate(movies, 1):
                 print(f"{i}. {movie[1]} ({movie[2]}), Жанр: {movie[3]}")
+            if truncated:
+                print(f"... показано перші {SEARCH_RESULTS_LIMIT} результатів, уточніть запит")
         except sqlite3.Error as e:
             print(f"✗ Помилка пошуку: {e}")
 
     def show_movies_paginated(self) -> None:
         """
-        Відображення фільмів з пагінацією (використовує LIMIT та OFFSET).
+        Відображення фільмів з пагінацією (keyset: WHERE (title, id) > курсор, LIMIT).
         """
         print("\n---- ПЕРЕГЛЯД ФІЛЬМІВ (ПАГІНАЦІЯ) ----")
         try:
             # Підрахунок загальної кількості фільмів
-            self.cursor.execute("SELECT COUNT(*) FROM movies")
-            total = self.cursor.fetchone()[0]
+            total = self.count_movies()
 
             if total == 0:
                 print("Немає фільмів у базі")
@@ -409,26 +831,20 @@ class MovieDatabase:
             page_size = 5
             total_pages = (total + page_size - 1) // page_size
             page = 1
+            shown = 0
+            page_cursor = None
 
             while True:
-                offset = (page - 1) * page_size
-
-                query = '''
-                        SELECT id, title, release_year, genre
-                        FROM movies
-                        ORDER BY title LIMIT ? \
-                        OFFSET ? \
-                        '''
-                self.cursor.execute(query, (page_size, offset))
-                movies = self.cursor.fetchall()
+                movies, page_cursor = self.fetch_movies_page(page_size, page_cursor)
 
                 print(f"\n--- Сторінка {page} з {total_pages} ---")
-                for i, movie in enumerate(movies, offset + 1):
+                for i, movie in enumerate(movies, shown + 1):
                     print(f"{i}. {movie[1]} ({movie[2]}), Жанр: {movie[3]}")
+                shown += len(movies)
 
                 print(f"\nВсього фільмів: {total}")
 
-                if page < total_pages:
+                if page_cursor is not None:
                     action = input("\nНаступна сторінка (Enter) або вихід (q): ").strip().lower()
                     if action == 'q':
                         break
@@ -445,16 +861,7 @@ class MovieDatabase:
         """
         print("\n---- ІМЕНА АКТОРІВ ТА НАЗВИ ФІЛЬМІВ ----")
         try:
-            query = '''
-                    SELECT name as item, 'Актор' as type \
-                    FROM actors
-                    UNION
-                    SELECT title as item, 'Фільм' as type \
-                    FROM movies
-                    ORDER BY item \
-                    '''
-            self.cursor.execute(query)
-            results = self.cursor.fetchall()
+            results = self.fetch_actors_and_movies()
 
             if not results:
                 print("База даних порожня")
@@ -467,19 +874,14 @@ class MovieDatabase:
 
     def show_movies_with_age(self) -> None:
         """
-        Відображення фільмів з їхнім віком (використовує власну функцію movie_age).
+        Відображення фільмів з їхнім віком.
+
+        Вік обчислюється в самому запиті (режим "sql"), без виклику
+        функції movie_age() для кожного рядка.
         """
         print("\n---- ФІЛЬМИ ТА ЇХНІЙ ВІК ----")
         try:
-            query = '''
-                    SELECT title, \
-                           release_year, \
-                           movie_age(release_year) as age
-                    FROM movies
-                    ORDER BY age DESC \
-                    '''
-            self.cursor.execute(query)
-            movies = self.cursor.fetchall()
+            movies = self.fetch_movies_with_age()
 
             if not movies:
                 print("Немає фільмів у базі")
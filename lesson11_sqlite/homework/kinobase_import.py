@@ -0,0 +1,371 @@
+"""
+КІНОБАЗА - неінтерактивне масове завантаження фільмів та акторів.
+
+Файли читаються потоково (рядок за рядком) і записуються пачками через
+executemany в межах однієї транзакції на пачку. ID фільмів та акторів
+призначаються заздалегідь, тому зв'язки movie_cast будуються в пам'яті
+без повторних SELECT, а імена акторів перетворюються на ID через словник.
+
+Під час завантаження в базі лише таблиці: індекси та тригери FTS5 з міграцій
+схеми видаляються (або ще не створені), а після завантаження будуються
+заново одним проходом, і повнотекстовий індекс перебудовується один раз
+('rebuild'), а не оновлюється тригером на кожен вставлений фільм.
+
+Формати файлів (визначаються за розширенням):
+    .csv            - з заголовком
+    .jsonl, .ndjson - один JSON-об'єкт на рядок (потокове читання)
+    .json           - JSON-масив об'єктів (читається повністю)
+
+Поля:
+    актори: name, birth_year
+    фільми: title, release_year, genre, actors
+            (у CSV - імена через ';', у JSON - список імен)
+
+Запуск:
+    python kinobase_import.py --actors actors.csv --movies movies.jsonl
+    python kinobase_import.py --db big.db --movies movies.csv --batch-size 100000
+"""
+
+import argparse
+import csv
+import json
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from kinobase import SCHEMA_MIGRATIONS, MovieDatabase
+
+
+DEFAULT_BATCH_SIZE = 50_000
+
+# Роздільник імен акторів у колонці actors CSV-файлу
+CSV_ACTORS_SEPARATOR = ";"
+
+# Налаштування з'єднання на час завантаження:
+# WAL + synchronous=NORMAL - коміт без fsync кожної сторінки журналу,
+# великий кеш сторінок та тимчасові структури в пам'яті
+IMPORT_PRAGMAS = [
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -262144",  # 256 МБ
+]
+
+# Індекси та тригери з міграцій схеми: (тип, назва). На час завантаження
+# видаляються, migrate_schema() після завантаження створює їх знову
+DEFERRED_SCHEMA_OBJECTS: List[Tuple[str, str]] = [
+    (match.group(1), match.group(2))
+    for statements in SCHEMA_MIGRATIONS.values()
+    for statement in statements
+    for match in [re.match(r"\s*CREATE (INDEX|TRIGGER) IF NOT EXISTS (\w+)", statement)]
+    if match
+]
+
+INSERT_ACTOR_QUERY = "INSERT INTO actors (id, name, birth_year) VALUES (?, ?, ?)"
+INSERT_MOVIE_QUERY = "INSERT INTO movies (id, title, release_year, genre) VALUES (?, ?, ?, ?)"
+INSERT_CAST_QUERY = "INSERT OR IGNORE INTO movie_cast (movie_id, actor_id) VALUES (?, ?)"
+
+
+@dataclass
+class ImportReport:
+    """
+    Підсумок завантаження одного файлу.
+
+    Attributes:
+        imported (int): Кількість доданих записів
+        skipped (int): Кількість пропущених некоректних записів
+        cast_links (int): Кількість доданих зв'язків movie_cast
+        unknown_actors (int): Кількість імен акторів, яких немає в базі
+        seconds (float): Тривалість завантаження
+    """
+    imported: int = 0
+    skipped: int = 0
+    cast_links: int = 0
+    unknown_actors: int = 0
+    seconds: float = 0.0
+
+    def __str__(self) -> str:
+        rate = self.imported / self.seconds if self.seconds else 0
+        return (f"додано {self.imported}, пропущено {self.skipped}, "
+                f"зв'язків movie_cast {self.cast_links}, невідомих акторів {self.unknown_actors}, "
+                f"{self.seconds:.1f} с ({rate:,.0f} записів/с)")
+
+
+def read_records(path: Path) -> Iterator[dict]:
+    """
+    Потоково читає записи з CSV, JSON Lines або JSON-файлу.
+
+    Args:
+        path (Path): Шлях до файлу
+
+    Yields:
+        dict: Один запис
+
+    Raises:
+        ValueError: Якщо формат файлу не підтримується
+    """
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        with open(path, newline="", encoding="utf-8") as file:
+            yield from csv.DictReader(file)
+    elif suffix in (".jsonl", ".ndjson"):
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+    elif suffix == ".json":
+        with open(path, encoding="utf-8") as file:
+            yield from json.load(file)
+    else:
+        raise ValueError(f"Непідтримуваний формат файлу: {path}")
+
+
+def batched(records: Iterable, size: int) -> Iterator[List]:
+    """
+    Розбиває потік записів на пачки.
+
+    Args:
+        records (Iterable): Записи
+        size (int): Розмір пачки
+
+    Yields:
+        List: Пачка з не більше ніж size записів
+    """
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def parse_actor_names(value) -> List[str]:
+    """
+    Перетворює поле actors (рядок CSV або JSON-список) у список імен.
+
+    Args:
+        value: Значення поля actors
+
+    Returns:
+        List[str]: Імена без повторів, у початковому порядку
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(CSV_ACTORS_SEPARATOR)
+    names = (str(name).strip() for name in value)
+    return list(dict.fromkeys(name for name in names if name))
+
+
+class BulkImporter:
+    """
+    Масове завантаження даних у базу КІНОБАЗИ.
+
+    Attributes:
+        db (MovieDatabase): База даних (до close() - без індексів та тригерів FTS)
+        batch_size (int): Кількість записів в одній транзакції
+        actor_ids (Dict[str, int]): Ім'я актора -> ID
+    """
+
+    def __init__(self, db_name: str, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        """
+        Підключення до бази та підготовка словника акторів.
+
+        Args:
+            db_name (str): Файл бази даних (буде створено, якщо не існує)
+            batch_size (int): Кількість записів в одній транзакції
+        """
+        self.db = MovieDatabase(db_name, create_tables=True, migrate=False)
+        self.batch_size = batch_size
+        for pragma in IMPORT_PRAGMAS:
+            self.db.cursor.execute(pragma)
+        self._drop_deferred_schema()
+
+        # Якщо в базі кілька акторів з однаковим ім'ям - береться перший
+        self.actor_ids: Dict[str, int] = {}
+        for actor_id, name in self.db.cursor.execute("SELECT id, name FROM actors ORDER BY id DESC"):
+            self.actor_ids[name] = actor_id
+
+        self._next_actor_id = self._next_id("actors")
+        self._next_movie_id = self._next_id("movies")
+
+    def _drop_deferred_schema(self) -> None:
+        """
+        Видаляє індекси та тригери FTS до завантаження.
+
+        user_version скидається в 0, тому migrate_schema() відновить їх і
+        перебудує FTS навіть якщо завантаження перерветься (при наступному
+        відкритті бази через MovieDatabase).
+        """
+        for object_type, name in DEFERRED_SCHEMA_OBJECTS:
+            # Назви - з коду (SCHEMA_MIGRATIONS), не з введення користувача
+            self.db.cursor.execute(f"DROP {object_type} IF EXISTS {name}")
+        self.db.cursor.execute("PRAGMA user_version = 0")
+        self.db.conn.commit()
+
+    def _next_id(self, table: str) -> int:
+        """
+        Наступний вільний ID таблиці (з урахуванням AUTOINCREMENT).
+
+        Args:
+            table (str): Назва таблиці (з коду, не з введення користувача)
+
+        Returns:
+            int: Перший ID для нових записів
+        """
+        max_id = self.db.cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+        row = self.db.cursor.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)
+        ).fetchone()
+        return max(max_id, row[0] if row else 0) + 1
+
+    def _write_batch(self, statements: List[Tuple[str, List[tuple]]]) -> None:
+        """
+        Записує пачку рядків в одній транзакції.
+
+        Args:
+            statements (List[Tuple]): Пари (SQL, рядки для executemany)
+        """
+        try:
+            self.db.cursor.execute("BEGIN")
+            for query, rows in statements:
+                if rows:
+                    self.db.cursor.executemany(query, rows)
+            self.db.conn.commit()
+        except sqlite3.Error:
+            self.db.conn.rollback()
+            raise
+
+    def import_actors(self, records: Iterable[dict]) -> ImportReport:
+        """
+        Завантажує акторів.
+
+        Args:
+            records (Iterable[dict]): Записи з полями name, birth_year
+
+        Returns:
+            ImportReport: Підсумок завантаження
+        """
+        report = ImportReport()
+        start = time.perf_counter()
+
+        for batch in batched(records, self.batch_size):
+            rows = []
+            for record in batch:
+                try:
+                    name = str(record["name"]).strip()
+                    birth_year = int(record["birth_year"])
+                except (KeyError, TypeError, ValueError):
+                    report.skipped += 1
+                    continue
+                if not name:
+                    report.skipped += 1
+                    continue
+
+                actor_id = self._next_actor_id
+                self._next_actor_id += 1
+                rows.append((actor_id, name, birth_year))
+                self.actor_ids.setdefault(name, actor_id)
+
+            self._write_batch([(INSERT_ACTOR_QUERY, rows)])
+            report.imported += len(rows)
+
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def import_movies(self, records: Iterable[dict]) -> ImportReport:
+        """
+        Завантажує фільми та їхні зв'язки з акторами.
+
+        Актори шукаються за ім'ям серед існуючих у базі та завантажених
+        import_actors(); невідомі імена пропускаються.
+
+        Args:
+            records (Iterable[dict]): Записи з полями title, release_year, genre, actors
+
+        Returns:
+            ImportReport: Підсумок завантаження
+        """
+        report = ImportReport()
+        start = time.perf_counter()
+
+        for batch in batched(records, self.batch_size):
+            movie_rows = []
+            cast_rows = []
+            for record in batch:
+                try:
+                    title = str(record["title"]).strip()
+                    release_year = int(record["release_year"])
+                    genre = str(record["genre"]).strip()
+                except (KeyError, TypeError, ValueError):
+                    report.skipped += 1
+                    continue
+                if not title or not genre:
+                    report.skipped += 1
+                    continue
+
+                movie_id = self._next_movie_id
+                self._next_movie_id += 1
+                movie_rows.append((movie_id, title, release_year, genre))
+
+                for name in parse_actor_names(record.get("actors")):
+                    actor_id = self.actor_ids.get(name)
+                    if actor_id is None:
+                        report.unknown_actors += 1
+                    else:
+                        cast_rows.append((movie_id, actor_id))
+
+            self._write_batch([(INSERT_MOVIE_QUERY, movie_rows), (INSERT_CAST_QUERY, cast_rows)])
+            report.imported += len(movie_rows)
+            report.cast_links += len(cast_rows)
+
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def close(self) -> None:
+        """
+        Побудова індексів та FTS, оновлення статистики планувальника та
+        закриття бази.
+        """
+        try:
+            self.db.migrate_schema()
+            self.db.cursor.execute("PRAGMA optimize")
+        finally:
+            self.db.close()
+
+
+def main() -> None:
+    """
+    Головна функція: завантажує спочатку акторів, потім фільми.
+    """
+    parser = argparse.ArgumentParser(description="Масове завантаження даних у КІНОБАЗУ")
+    parser.add_argument("--db", default="kinobase.db", help="файл бази даних")
+    parser.add_argument("--actors", type=Path, help="файл з акторами (.csv/.jsonl/.json)")
+    parser.add_argument("--movies", type=Path, help="файл з фільмами (.csv/.jsonl/.json)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    if not args.actors and not args.movies:
+        parser.error("потрібно вказати --actors та/або --movies")
+
+    importer: Optional[BulkImporter] = None
+    try:
+        importer = BulkImporter(args.db, args.batch_size)
+        if args.actors:
+            print(f"Актори ({args.actors}): {importer.import_actors(read_records(args.actors))}")
+        if args.movies:
+            print(f"Фільми ({args.movies}): {importer.import_movies(read_records(args.movies))}")
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"✗ Помилка завантаження: {e}")
+    finally:
+        if importer:
+            importer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# Бенчмарк паралельної суми з task3_array_digits.py:
+#   - parallel_sum: список ділиться на підсписки, кожен серіалізується
+#     (pickle) і передається в процес пулу;
+#   - ParallelReducer: масив у shared memory, процеси отримують лише межі;
+#   - NumPy в одному потоці (np.sum) та вбудована sum() як базові рівні.
+#
+# Запуск:
+#     python benchmark_array_digits.py
+#     python benchmark_array_digits.py --size 20000000 --processes 4
+
+import argparse
+import time
+from multiprocessing import cpu_count
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from task3_array_digits import ParallelReducer, SharedArray, parallel_sum
+
+
+def measure(func: Callable, repeat: int) -> Tuple[float, object]:
+    """Найкращий час з repeat запусків і результат."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарк паралельної суми")
+    parser.add_argument("--size", type=int, default=10_000_000)
+    parser.add_argument("--processes", type=int, default=cpu_count())
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    data = np.random.default_rng(42).integers(1, 101, args.size)
+    as_list: List[int] = data.tolist()
+    total = int(data.sum())
+
+    with SharedArray(data) as shared, \
+            ParallelReducer(shared, args.processes) as reducer:
+        # (назва, функція, очікуваний результат); гістограма - кількість
+        rows = [
+            ("parallel_sum (pickle підсписків)",
+             lambda: parallel_sum(as_list, args.processes), total),
+            ("ParallelReducer.sum (shared memory)", reducer.sum, total),
+            ("ParallelReducer.histogram (10 bins)",
+             lambda: int(reducer.histogram(10, (1, 101))[0].sum()),
+             args.size),
+            ("np.sum, 1 потік", lambda: int(data.sum()), total),
+            ("sum(list), 1 потік", lambda: sum(as_list), total),
+        ]
+        results = [(label, *measure(func, args.repeat), expected)
+                   for label, func, expected in rows]
+
+    print(f"Елементів: {args.size:,}, процесів: {args.processes}, "
+          f"ядер: {cpu_count()}")
+    print(f"\n{'Спосіб':<40}{'час, с':>10}{'швидше за parallel_sum':>25}")
+    print("-" * 75)
+    base = results[0][1]
+    for label, seconds, _, _ in results:
+        print(f"{label:<40}{seconds:>10.3f}{base / seconds:>24.1f}x")
+
+    correct = all(result == expected for _, _, result, expected in results)
+    print(f"\nРезультати збігаються: {'так' if correct else 'НІ'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Бенчмарк факторіалу з task7_factorial.py: час обчислення n! та
+# перетворення результату в десятковий рядок.
+#
+#   - рівні частини + reduce + str(): попередня версія parallel_factorial;
+#   - parallel_factorial + int_to_str: збалансовані частини, дерево
+#     добутків, паралельне злиття, перетворення "поділяй і володарюй";
+#   - factorial_decimal: верхні рівні дерева множаться в Decimal;
+#   - math.factorial + int_to_str: однопотоковий C-код як базовий рівень.
+#
+# str(int) у CPython 3.11 квадратичний, тому попередня версія запускається
+# лише для n <= --old-max (для n = 10^6 вона працює кілька хвилин).
+#
+# Запуск:
+#     python benchmark_factorial.py
+#     python benchmark_factorial.py --n 100000 1000000 10000000 --processes 4
+
+import argparse
+import math
+import multiprocessing
+import sys
+import time
+from functools import reduce
+from typing import Callable, Tuple
+
+from task7_factorial import (chunk_ranges, factorial_decimal, int_to_str,
+                             parallel_factorial, partial_factorial)
+
+
+def equal_chunks_factorial(n: int, num_processes: int) -> int:
+    """Попередня версія parallel_factorial: рівні частини та reduce."""
+    ranges = chunk_ranges(n, num_processes)
+    with multiprocessing.Pool(processes=num_processes) as pool:
+        partial_results = pool.starmap(partial_factorial, ranges)
+    return reduce(lambda x, y: x * y, partial_results)
+
+
+def measure(compute: Callable, to_str: Callable) -> Tuple[float, float, str]:
+    """(час обчислення, час перетворення в рядок, рядок)."""
+    start = time.perf_counter()
+    value = compute()
+    computed = time.perf_counter()
+    digits = to_str(value)
+    return computed - start, time.perf_counter() - computed, digits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарк факторіалу")
+    parser.add_argument("--n", type=int, nargs="+",
+                        default=[100_000, 1_000_000])
+    parser.add_argument("--processes", type=int,
+                        default=multiprocessing.cpu_count())
+    parser.add_argument("--old-max", type=int, default=200_000)
+    args = parser.parse_args()
+    sys.set_int_max_str_digits(0)
+
+    print(f"Процесів: {args.processes}, ядер: {multiprocessing.cpu_count()}")
+    print(f"\n{'n':>10}  {'Спосіб':<34}{'n!, с':>9}{'str, с':>9}"
+          f"{'разом, с':>10}{'цифр':>11}")
+    print("-" * 85)
+    for n in args.n:
+        rows = [
+            ("parallel_factorial + int_to_str",
+             lambda: parallel_factorial(n, args.processes), int_to_str),
+            ("factorial_decimal",
+             lambda: factorial_decimal(n, args.processes), str),
+            ("math.factorial + int_to_str",
+             lambda: math.factorial(n), int_to_str),
+        ]
+        if n <= args.old_max:
+            rows.insert(0, ("рівні частини + reduce + str()",
+                            lambda: equal_chunks_factorial(n, args.processes),
+                            str))
+
+        reference = None
+        for label, compute, to_str in rows:
+            compute_time, str_time, digits = measure(compute, to_str)
+            reference = reference or digits
+            mark = "" if digits == reference else "  НЕ ЗБІГАЄТЬСЯ"
+            print(f"{n:>10}  {label:<34}{compute_time:>9.2f}{str_time:>9.2f}"
+                  f"{compute_time + str_time:>10.2f}{len(digits):>11}{mark}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,14 +8,24 @@
 # використайте бібліотеки requests або urllib для завантаження файлів.
 
 from concurrent.futures import ThreadPoolExecutor
+import os
+import time
 import requests
 from typing import Dict
 
+CHUNK_SIZE: int = 64 * 1024
+
 
 def download_file(url: str, filename: str) -> None:
     """
     Завантажує файл із заданої URL-адреси та зберігає його під вказаним ім’ям.
 
+    Відповідь читається шматками по CHUNK_SIZE і одразу пишеться на диск,
+    тож пам'ять не залежить від розміру файлу. Незавершений файл лежить
+    як <filename>.part; наступний запуск продовжить його Range-запитом.
+    (Асинхронний рушій з паралельними сегментами - lesson14_async/homework/
+    downloader.py.)
+
     Parameters:
         url (str): Посилання на файл для завантаження.
         filename (str): Ім’я, під яким зберігатиметься файл локально.
@@ -23,17 +33,35 @@ def download_file(url: str, filename: str) -> None:
     Returns:
         None
     """
+    part = filename + ".part"
     try:
         print(f"Завантажую {filename} ...")
-        response = requests.get(url, timeout=10)  # надсилаємо HTTP GET-запит
-        # викликає помилку, якщо статус 4xx або 5xx:
-        response.raise_for_status()
+        start = time.perf_counter()
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        downloaded = 0
+        # stream=True - тіло не завантажується в пам'ять одразу
+        with requests.get(url, headers=headers, stream=True,
+                          timeout=10) as response:
+            # 416 - діапазон поза файлом: .part уже містить увесь файл
+            if response.status_code != 416:
+                # викликає помилку, якщо статус 4xx або 5xx:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    offset = 0  # Сервер не підтримує Range - починаємо заново
 
-        # записуємо вміст відповіді у файл
-        with open(filename, "wb") as f:
-            f.write(response.content)
+                # записуємо вміст відповіді у файл шматками
+                with open(part, "ab" if offset else "wb") as f:
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        f.write(chunk)
+                        downloaded += len(chunk)
 
-        print(f"{filename} готово!")
+        os.replace(part, filename)
+        seconds = max(time.perf_counter() - start, 1e-9)
+        resumed = f", продовжено з {offset} байт" if offset else ""
+        print(f"{filename} готово! {downloaded / 2**20:.2f} МБ за "
+              f"{seconds:.2f} с ({downloaded / 2**20 / seconds:.2f} МБ/с"
+              f"{resumed})")
     except requests.exceptions.RequestException as e:
         print(f"Не вдалося завантажити {filename}: {e}")
 
@@ -50,10 +78,11 @@ files: Dict[str, str] = {
     # notfoundfile.zip": "file4.zip"  # цей файл викличе помилку 404
 }
 
-# Використовуємо ThreadPoolExecutor для паралельного завантаження файлів
-with ThreadPoolExecutor(max_workers=3) as executor:
-    for url, filename in files.items():
-        executor.submit(download_file, url, filename)
+if __name__ == "__main__":
+    # Використовуємо ThreadPoolExecutor для паралельного завантаження файлів
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        for url, filename in files.items():
+            executor.submit(download_file, url, filename)
 
 # Result
 # Завантажую file1.pdf ...
@@ -3,11 +3,16 @@
 # і рахує суму кожної частини паралельно в різних процесах.
 # Використовуйте модуль multiprocessing.
 
-from multiprocessing import Pool, cpu_count
-from typing import List
+from multiprocessing import Pool, cpu_count, shared_memory
+from typing import List, Optional, Tuple
 import random
 import time
 
+import numpy as np
+
+# Операції паралельної редукції над SharedArray
+REDUCTIONS = ("sum", "min", "max", "mean", "histogram")
+
 
 def chunk_sum(numbers: List[int]) -> int:
     """
@@ -49,11 +54,195 @@ def parallel_sum(array: List[int], num_processes: int) -> int:
     return sum(partial_sums)
 
 
+# --------------------------------------
+# Редукції без копіювання даних: масив лежить у shared memory,
+# процеси отримують лише межі своєї частини (start, stop).
+
+class SharedArray:
+    """
+    NumPy-масив у multiprocessing.shared_memory.
+
+    Процеси пулу підключаються до блоку пам'яті за іменем, тому дані
+    не серіалізуються і не копіюються. Блок треба звільнити через
+    close() (або використати як контекстний менеджер).
+    """
+
+    def __init__(self, data=None, size: int = 0, dtype: str = "int64"):
+        """
+        Parameters:
+            data: Дані для копіювання в shared memory (або None).
+            size (int): Розмір порожнього масиву, якщо data не задано.
+            dtype (str): Тип елементів порожнього масиву.
+        """
+        source = np.asarray(data) if data is not None else None
+        if source is not None:
+            size, dtype = source.size, source.dtype
+        self.dtype = np.dtype(dtype)
+        self.size = size
+        self.shm = shared_memory.SharedMemory(
+            create=True, size=max(1, size * self.dtype.itemsize))
+        self.array = np.ndarray((size,), dtype=self.dtype,
+                                buffer=self.shm.buf)
+        if source is not None:
+            self.array[:] = source.ravel()
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self) -> None:
+        """Звільнити блок shared memory."""
+        # Спершу прибираємо view, інакше buffer не закриється
+        self.array = None
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> "SharedArray":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+# Стан процесу пулу: масив підключається один раз в initializer
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+_worker_array: Optional[np.ndarray] = None
+
+
+def _attach_shared(name: str, size: int, dtype: str) -> None:
+    global _worker_shm, _worker_array
+    _worker_shm = shared_memory.SharedMemory(name=name)
+    _worker_array = np.ndarray((size,), dtype=dtype, buffer=_worker_shm.buf)
+
+
+def _reduce_chunk(task: Tuple) -> object:
+    """Часткова редукція елементів [start, stop) масиву процесу."""
+    op, start, stop, bins, value_range = task
+    chunk = _worker_array[start:stop]
+    if op in ("sum", "mean"):
+        return chunk.sum().item()
+    if op == "min":
+        return chunk.min().item() if chunk.size else None
+    if op == "max":
+        return chunk.max().item() if chunk.size else None
+    return np.histogram(chunk, bins=bins, range=value_range)[0]
+
+
+class ParallelReducer:
+    """
+    Пул процесів для редукцій над SharedArray (sum/min/max/mean/histogram).
+
+    Приклад:
+        with SharedArray(data) as shared, ParallelReducer(shared) as reducer:
+            total = reducer.sum()
+    """
+
+    def __init__(self, shared: SharedArray,
+                 num_processes: Optional[int] = None,
+                 chunks_per_process: int = 4):
+        """
+        Parameters:
+            shared (SharedArray): Масив у shared memory.
+            num_processes (int): Кількість процесів (за замовчуванням
+                cpu_count()).
+            chunks_per_process (int): На скільки частин ділити роботу
+                кожного процесу (дрібніші частини краще балансуються).
+        """
+        self.shared = shared
+        self.num_processes = num_processes or cpu_count()
+        num_chunks = max(1, self.num_processes * chunks_per_process)
+        bounds = np.linspace(0, shared.size, num_chunks + 1, dtype=np.int64)
+        self.ranges = [(int(start), int(stop))
+                       for start, stop in zip(bounds, bounds[1:])
+                       if stop > start]
+        self.pool: Optional[Pool] = None
+
+    def __enter__(self) -> "ParallelReducer":
+        self.pool = Pool(self.num_processes, initializer=_attach_shared,
+                         initargs=(self.shared.name, self.shared.size,
+                                   self.shared.dtype.str))
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.pool.close()
+        self.pool.join()
+
+    def reduce(self, op: str, bins: int = 10,
+               value_range: Optional[Tuple[float, float]] = None):
+        """
+        Виконує редукцію паралельно: процесам передаються лише межі частин.
+
+        Parameters:
+            op (str): Одна з REDUCTIONS.
+            bins (int): Кількість інтервалів гістограми.
+            value_range (Tuple[float, float]): Межі гістограми
+                (за замовчуванням - від min до max масиву).
+
+        Returns:
+            Число для sum/min/max/mean; (counts, edges) для histogram.
+        """
+        if op not in REDUCTIONS:
+            raise ValueError(f"Невідома операція {op!r}, "
+                             f"доступні: {REDUCTIONS}")
+        if op == "histogram" and value_range is None:
+            # Межі мають бути однакові для всіх частин
+            value_range = (self.reduce("min"), self.reduce("max"))
+
+        tasks = [(op, start, stop, bins, value_range)
+                 for start, stop in self.ranges]
+        partials = self.pool.map(_reduce_chunk, tasks)
+
+        if op == "sum":
+            return sum(partials)
+        if op == "mean":
+            return sum(partials) / self.shared.size
+        if op in ("min", "max"):
+            values = [value for value in partials if value is not None]
+            return (min if op == "min" else max)(values)
+        counts = np.sum(partials, axis=0)
+        return counts, np.histogram_bin_edges([], bins=bins,
+                                              range=value_range)
+
+    def sum(self):
+        return self.reduce("sum")
+
+    def min(self):
+        return self.reduce("min")
+
+    def max(self):
+        return self.reduce("max")
+
+    def mean(self) -> float:
+        return self.reduce("mean")
+
+    def histogram(self, bins: int = 10,
+                  value_range: Optional[Tuple[float, float]] = None):
+        return self.reduce("histogram", bins, value_range)
+
+
+def parallel_sum_shared(array, num_processes: int) -> int:
+    """
+    Паралельно обчислює суму масиву через shared memory.
+
+    Parameters:
+        array: Вхідний масив чисел (список або np.ndarray).
+        num_processes (int): Кількість процесів для обробки.
+
+    Returns:
+        int: Загальна сума всіх чисел у масиві.
+    """
+    with SharedArray(array) as shared, \
+            ParallelReducer(shared, num_processes) as reducer:
+        return reducer.sum()
+
+
 # --------------------------------------
 if __name__ == "__main__":
     # Створюємо великий масив випадкових чисел
     N = 10_000_000  # 10 мільйонів
-    big_array: List[int] = [random.randint(1, 100) for _ in range(N)]
+    # Масив одразу генеруємо в shared memory - без проміжного списку
+    shared = SharedArray(size=N, dtype="int64")
+    shared.array[:] = np.random.default_rng().integers(1, 101, N)
 
     # Кількість процесів (можна вручну або cpu_count())
     processes = cpu_count()
@@ -61,11 +250,20 @@ if __name__ == "__main__":
     print(f"Обчислення суми {N} чисел за допомогою {processes} процесів...")
 
     start = time.time()
-    total = parallel_sum(big_array, processes)
-    end = time.time()
+    with ParallelReducer(shared, processes) as reducer:
+        total = reducer.sum()
+        end = time.time()
+        print(f"Сума: {total}")
+        print(f"Час виконання: {end - start:.2f} секунд")
+
+        # Інші редукції в тому ж пулі
+        print(f"Мінімум: {reducer.min()}, максимум: {reducer.max()}, "
+              f"середнє: {reducer.mean():.4f}")
+        counts, edges = reducer.histogram(bins=4)
+        print(f"Гістограма: {counts.tolist()} (межі: {edges.tolist()})")
+    shared.close()
 
-    print(f"Сума: {total}")
-    print(f"Час виконання: {end - start:.2f} секунд")
+    # Порівняння з parallel_sum та NumPy - benchmark_array_digits.py
 
 # chunk_size = 10_000_000 // 4 = 2_500_000
 # chunks = [array[i:i + chunk_size] for i in range(0, 10_000_000, 2_500_000)]
@@ -4,14 +4,35 @@
 # розподіляючи обчислення між ними.
 
 import sys
-from functools import reduce
+import decimal
+import math
 import multiprocessing
-from typing import Tuple
+from decimal import Decimal
+from multiprocessing.pool import Pool
+from typing import Callable, List, Tuple
 
 # Підвищує ліміт для конвертації int -> str.
 # обмеження - за замовчуванням 4300 цифр
+# (int_to_str нижче працює через Decimal і цього ліміту не має)
 sys.set_int_max_str_digits(1000000)
 
+# Діапазони, коротші за LEAF_SIZE чисел, множаться простим циклом
+LEAF_SIZE = 64
+# Добутки діапазонів, коротших за DECIMAL_LEAF_SIZE, рахуються в int
+# і лише потім переводяться в Decimal
+DECIMAL_LEAF_SIZE = 1024
+# Числа до DECIMAL_LEAF_BITS біт переводяться в Decimal напряму
+DECIMAL_LEAF_BITS = 4096
+# Під час паралельного злиття значення передаються між процесами
+# (pickle), тому для малих n вигідніше рахувати в одному процесі
+MIN_PARALLEL_N = 20_000
+
+# Контекст для точної цілочисельної арифметики Decimal: множення великих
+# Decimal у libmpdec (теоретико-числове перетворення) значно швидше
+# за множення int у CPython
+EXACT = decimal.Context(prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX,
+                        Emin=decimal.MIN_EMIN, traps=[decimal.Inexact])
+
 
 def partial_factorial(start: int, end: int) -> int:
     """
@@ -53,10 +74,188 @@ def chunk_ranges(n: int, num_chunks: int) -> list[Tuple[int, int]]:
     return ranges
 
 
+def range_product(start: int, end: int) -> int:
+    """
+    Добуток чисел у діапазоні [start, end] методом бінарного розбиття.
+
+    Діапазон ділиться навпіл, доки не стане коротшим за LEAF_SIZE:
+    множаться числа близького розміру, і алгоритм Карацуби в int
+    працює ефективно (на відміну від множення по одному числу).
+
+    Parameters:
+        start (int): Початок діапазону.
+        end (int): Кінець діапазону.
+
+    Returns:
+        int: Добуток чисел у діапазоні.
+    """
+    if end - start < LEAF_SIZE:
+        return partial_factorial(start, end)
+    mid = (start + end) // 2
+    return range_product(start, mid) * range_product(mid + 1, end)
+
+
+def range_product_decimal(start: int, end: int) -> Decimal:
+    """
+    Те саме, що range_product, але верхні рівні дерева множаться в Decimal.
+
+    Parameters:
+        start (int): Початок діапазону.
+        end (int): Кінець діапазону.
+
+    Returns:
+        Decimal: Добуток чисел у діапазоні (ціле значення).
+    """
+    if end - start < DECIMAL_LEAF_SIZE:
+        return int_to_decimal(range_product(start, end))
+    mid = (start + end) // 2
+    return EXACT.multiply(range_product_decimal(start, mid),
+                          range_product_decimal(mid + 1, end))
+
+
+def int_to_decimal(value: int) -> Decimal:
+    """
+    Переводить int у Decimal методом "поділяй і володарюй".
+
+    value = hi * 2^w + lo: половини переводяться рекурсивно і
+    з'єднуються множенням у Decimal. Розбиття за бітами - лінійне,
+    тому загальна складність визначається швидким множенням Decimal,
+    а не квадратичним перетворенням int -> str у CPython 3.11.
+
+    Parameters:
+        value (int): Ціле число.
+
+    Returns:
+        Decimal: Те саме число.
+    """
+    powers = {}
+
+    def power_of_two(w: int) -> Decimal:
+        if w not in powers:
+            powers[w] = EXACT.power(Decimal(2), w)
+        return powers[w]
+
+    def convert(x: int, bits: int) -> Decimal:
+        if bits <= DECIMAL_LEAF_BITS:
+            return Decimal(x)
+        half = bits >> 1
+        hi, lo = x >> half, x & ((1 << half) - 1)
+        return EXACT.add(EXACT.multiply(convert(hi, bits - half),
+                                        power_of_two(half)),
+                         convert(lo, half))
+
+    if value < 0:
+        return EXACT.minus(int_to_decimal(-value))
+    return convert(value, value.bit_length())
+
+
+def int_to_str(value: int) -> str:
+    """
+    Десятковий запис int через int_to_decimal (без ліміту на кількість цифр).
+
+    Parameters:
+        value (int): Ціле число.
+
+    Returns:
+        str: Десятковий запис числа.
+    """
+    return str(int_to_decimal(value))
+
+
+def balanced_ranges(n: int, num_chunks: int) -> List[Tuple[int, int]]:
+    """
+    Ділить [1, n] на частини з приблизно однаковою кількістю роботи.
+
+    Робота над діапазоном пропорційна розміру його добутку, тобто сумі
+    log(i). Межі підбираються так, щоб кожна частина мала рівну частку
+    log(n!) = lgamma(n + 1): пізні частини виходять коротшими.
+
+    Parameters:
+        n (int): Кінцеве число факторіалу.
+        num_chunks (int): Кількість частин.
+
+    Returns:
+        list of tuples: Список кортежів (start, end).
+    """
+    total = math.lgamma(n + 1)
+    ranges = []
+    start = 1
+    for k in range(1, num_chunks + 1):
+        # Бінарний пошук найменшого end з ln(end!) >= k/num_chunks * ln(n!)
+        target = total * k / num_chunks
+        low, end = start, n
+        while low < end:
+            mid = (low + end) // 2
+            if math.lgamma(mid + 1) < target:
+                low = mid + 1
+            else:
+                end = mid
+        if end >= start:
+            ranges.append((start, end))
+            start = end + 1
+    return ranges
+
+
+def _multiply_ints(a: int, b: int) -> int:
+    return a * b
+
+
+def _multiply_decimals(a: Decimal, b: Decimal) -> Decimal:
+    return EXACT.multiply(a, b)
+
+
+def tree_merge(values: list, multiply: Callable,
+               pool: Pool = None):
+    """
+    Перемножує значення попарно, рівень за рівнем (дерево добутків).
+
+    Пари одного рівня незалежні і множаться паралельно в pool;
+    на відміну від reduce, множаться числа однакового розміру.
+
+    Parameters:
+        values (list): Часткові добутки.
+        multiply (Callable): Функція множення двох значень.
+        pool (Pool, optional): Пул процесів; None - в поточному процесі.
+
+    Returns:
+        Добуток усіх значень.
+    """
+    while len(values) > 1:
+        pairs = list(zip(values[0::2], values[1::2]))
+        if pool is not None and len(pairs) > 1:
+            merged = pool.starmap(multiply, pairs)
+        else:
+            merged = [multiply(a, b) for a, b in pairs]
+        if len(values) % 2:
+            merged.append(values[-1])
+        values = merged
+    return values[0]
+
+
+def _factorial(n: int, num_processes: int, chunk_product: Callable,
+               multiply: Callable):
+    """Спільна частина parallel_factorial та factorial_decimal."""
+    if num_processes is None:
+        num_processes = multiprocessing.cpu_count()
+
+    if n < MIN_PARALLEL_N or num_processes == 1:
+        return chunk_product(1, n)
+
+    # Кілька частин на процес - щоб злиття теж було паралельним
+    ranges = balanced_ranges(n, num_processes * 2)
+    with multiprocessing.Pool(processes=num_processes) as pool:
+        partial_results = pool.starmap(chunk_product, ranges)
+        return tree_merge(partial_results, multiply, pool)
+
+
 def parallel_factorial(n: int, num_processes: int = None) -> int:
     """
     Обчислює факторіал числа n паралельно з використанням кількох процесів.
 
+    [1, n] ділиться на частини з рівною кількістю роботи
+    (balanced_ranges), кожна рахується деревом добутків (range_product),
+    а часткові добутки зливаються паралельним деревом (tree_merge).
+
     Parameters:
         n (int): Число, факторіал якого потрібно обчислити.
         num_processes (int, optional): Кількість процесів.
@@ -67,17 +266,28 @@ def parallel_factorial(n: int, num_processes: int = None) -> int:
     """
     if n == 0 or n == 1:
         return 1
+    return _factorial(n, num_processes, range_product, _multiply_ints)
 
-    if num_processes is None:
-        num_processes = multiprocessing.cpu_count()
 
-    ranges = chunk_ranges(n, num_processes)
+def factorial_decimal(n: int, num_processes: int = None) -> Decimal:
+    """
+    Обчислює n! одразу в Decimal - найшвидший шлях до десяткового запису.
 
-    with multiprocessing.Pool(processes=num_processes) as pool:
-        partial_results = pool.starmap(partial_factorial, ranges)
+    Великі добутки множаться в Decimal, а str(Decimal) - лінійний,
+    тому для n ~ 10^6..10^7 це значно швидше, ніж parallel_factorial
+    з подальшим перетворенням у рядок.
 
-    # Об'єднуємо часткові добутки
-    return reduce(lambda x, y: x * y, partial_results)
+    Parameters:
+        n (int): Число, факторіал якого потрібно обчислити.
+        num_processes (int, optional): Кількість процесів.
+
+    Returns:
+        Decimal: Факторіал числа n (str() дає всі цифри).
+    """
+    if n == 0 or n == 1:
+        return Decimal(1)
+    return _factorial(n, num_processes, range_product_decimal,
+                      _multiply_decimals)
 
 
 if __name__ == "__main__":
@@ -89,6 +299,15 @@ if __name__ == "__main__":
     start_time = time.time()
     result = parallel_factorial(n)
     end_time = time.time()
+    digits = int_to_str(result)
+    str_time = time.time()
 
-    print(f"Факторіал {n} (довжина результату: {len(str(result))} цифр)")
-    print(f"Час виконання: {end_time - start_time:.2f} секунд")
+    print(f"Факторіал {n} (довжина результату: {len(digits)} цифр)")
+    print(f"Час виконання: {end_time - start_time:.2f} секунд "
+          f"(+ {str_time - end_time:.2f} с на перетворення в рядок)")
+
+    start_time = time.time()
+    digits = str(factorial_decimal(n))
+    print(f"factorial_decimal: {len(digits)} цифр "
+          f"за {time.time() - start_time:.2f} секунд")
+    # Порівняння з попередньою версією - benchmark_factorial.py
@@ -0,0 +1,321 @@
+# Рушій завантаження файлів на aiohttp.
+#
+# - Тіло відповіді читається шматками (chunk_size) і одразу пишеться на диск,
+#   тож пам'ять не залежить від розміру файлу: не більше write_buffer байт
+#   на кожен сегмент.
+# - Запис у файл виконується в потоці (asyncio.to_thread) і не блокує
+#   event loop.
+# - Великі файли (від 2 * min_segment_size) діляться на segments діапазонів,
+#   які завантажуються паралельно HTTP Range-запитами.
+# - Прогрес зберігається у файлі <ім'я>.part.json. Перерване завантаження
+#   продовжується з місця зупинки, якщо сервер підтримує Range.
+# - Для кожного файлу повертається DownloadResult з розміром, часом та
+#   швидкістю.
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import aiohttp
+from aiohttp import ClientError, ClientSession
+
+CHUNK_SIZE: int = 64 * 1024
+WRITE_BUFFER: int = 1024 * 1024
+MIN_SEGMENT_SIZE: int = 8 * 1024 * 1024
+
+
+class DownloadError(Exception):
+    """Помилка завантаження, яку не виправить повторна спроба."""
+
+
+@dataclass
+class DownloadResult:
+    """Результат завантаження одного файлу."""
+    url: str
+    path: str
+    size: int = 0          # розмір файлу на диску
+    downloaded: int = 0    # байт завантажено в цьому запуску
+    seconds: float = 0.0
+    segments: int = 1
+    resumed: bool = False
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def throughput(self) -> float:
+        """Швидкість завантаження, байт/с."""
+        return self.downloaded / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        if not self.ok:
+            return f"❌ {self.path}: {self.error}"
+        resumed = ", продовжено" if self.resumed else ""
+        return (f"✅ {self.path}: {self.size / 2**20:.1f} МБ за "
+                f"{self.seconds:.2f} с ({self.throughput / 2**20:.1f} МБ/с, "
+                f"сегментів: {self.segments}{resumed})")
+
+
+class Downloader:
+    """
+    Потокове завантаження файлів з продовженням та паралельними сегментами.
+
+    Використання:
+        async with Downloader() as downloader:
+            results = await downloader.download_many([(url, "file.bin")])
+    """
+
+    def __init__(self,
+                 max_concurrent: int = 3,
+                 segments: int = 4,
+                 min_segment_size: int = MIN_SEGMENT_SIZE,
+                 chunk_size: int = CHUNK_SIZE,
+                 write_buffer: int = WRITE_BUFFER,
+                 retries: int = 3,
+                 timeout: Optional[float] = None) -> None:
+        """
+        :param max_concurrent: Скільки файлів завантажувати одночасно.
+        :param segments: Максимальна кількість паралельних діапазонів на файл.
+        :param min_segment_size: Мінімальний розмір одного діапазону, байт.
+        :param chunk_size: Розмір шматка, що читається з мережі, байт.
+        :param write_buffer: Скільки байт накопичувати перед записом на диск.
+        :param retries: Кількість повторних спроб для кожного діапазону.
+        :param timeout: Таймаут читання з сокета, с (None - без обмеження).
+        """
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.segments = segments
+        self.min_segment_size = min_segment_size
+        self.chunk_size = chunk_size
+        self.write_buffer = write_buffer
+        self.retries = retries
+        self.timeout = aiohttp.ClientTimeout(total=None, sock_read=timeout)
+        self.session: Optional[ClientSession] = None
+
+    async def __aenter__(self) -> "Downloader":
+        # identity: Content-Length і Range мають стосуватись байтів файлу,
+        # а не стиснутого gzip тіла
+        self.session = aiohttp.ClientSession(
+            timeout=self.timeout, headers={"Accept-Encoding": "identity"})
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.session.close()
+
+    async def download_many(self, items: List[Tuple[str, str]]
+                            ) -> List[DownloadResult]:
+        """
+        Завантажує всі файли (не більше max_concurrent одночасно).
+
+        :param items: Список кортежів (url, filename).
+        :return: Результати в порядку items.
+        """
+        return await asyncio.gather(*(self.download(url, filename)
+                                      for url, filename in items))
+
+    async def download(self, url: str, filename: str) -> DownloadResult:
+        """
+        Завантажує один файл; помилки повертаються в DownloadResult.error.
+
+        :param url: Посилання на файл.
+        :param filename: Локальний шлях для збереження файлу.
+        """
+        result = DownloadResult(url, filename)
+        async with self.semaphore:
+            start = time.perf_counter()
+            try:
+                await self._download(url, Path(filename), result)
+            except (ClientError, asyncio.TimeoutError, DownloadError,
+                    OSError) as e:
+                result.error = str(e) or type(e).__name__
+            result.seconds = time.perf_counter() - start
+        print(result)
+        return result
+
+    async def _probe(self, url: str) -> Tuple[Optional[int], bool,
+                                               Optional[str]]:
+        """HEAD-запит: (розмір, чи підтримується Range, ETag)."""
+        async with self.session.head(url, allow_redirects=True) as response:
+            if response.status == 405:
+                # HEAD не підтримується - розмір дізнаємось з GET
+                return None, False, None
+            response.raise_for_status()
+            size = response.headers.get("Content-Length")
+            ranges = response.headers.get("Accept-Ranges", "") == "bytes"
+            etag = response.headers.get("ETag")
+            return (int(size) if size is not None else None,
+                    ranges and size is not None, etag)
+
+    async def _download(self, url: str, path: Path,
+                        result: DownloadResult) -> None:
+        part = path.with_name(path.name + ".part")
+        state_file = path.with_name(path.name + ".part.json")
+        size, ranges, etag = await self._probe(url)
+
+        if not ranges:
+            # Без Range продовжити не вийде - качаємо одним потоком з нуля
+            await self._stream(url, part, [0, size, 0], {}, result)
+        else:
+            state = _load_state(state_file)
+            if (state and state["size"] == size and state["etag"] == etag
+                    and part.exists()):
+                result.resumed = True
+            else:
+                state = {"url": url, "size": size, "etag": etag,
+                         "segments": self._split(size)}
+                # Файл потрібного розміру: кожен сегмент пише у свою частину
+                await asyncio.to_thread(_preallocate, part, size)
+                await asyncio.to_thread(_save_state, state_file, state)
+
+            segments = state["segments"]
+            result.segments = len(segments)
+            headers = {"If-Range": etag} if etag else {}
+            tasks = [asyncio.create_task(
+                self._stream(url, part, segment, headers, result,
+                             state_file=state_file, state=state))
+                for segment in segments
+                if segment[2] < segment[1] - segment[0]]
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                # Якщо один сегмент впав, решта не повинна писати далі
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        os.replace(part, path)
+        if state_file.exists():
+            state_file.unlink()
+        result.size = path.stat().st_size
+
+    def _split(self, size: int) -> List[List[int]]:
+        """Ділить [0, size) на сегменти [start, end, завантажено]."""
+        if size == 0:
+            return [[0, 0, 0]]
+        count = max(1, min(self.segments, size // self.min_segment_size))
+        step = -(-size // count)
+        return [[start, min(start + step, size), 0]
+                for start in range(0, size, step)]
+
+    async def _stream(self, url: str, part: Path, segment: List[int],
+                      headers: dict, result: DownloadResult,
+                      state_file: Optional[Path] = None,
+                      state: Optional[dict] = None) -> None:
+        """
+        Завантажує сегмент [start, end) у файл part з повторними спробами.
+
+        segment[2] - скільки байт сегмента вже записано; оновлюється після
+        кожного запису на диск разом із файлом стану (якщо він є).
+        """
+        start, end, _ = segment
+        ranged = state is not None
+        mode = "r+b" if ranged else "wb"
+
+        for attempt in range(self.retries + 1):
+            request_headers = dict(headers)
+            if ranged:
+                request_headers["Range"] = (f"bytes={start + segment[2]}-"
+                                            f"{end - 1}")
+            try:
+                async with self.session.get(url,
+                                            headers=request_headers
+                                            ) as response:
+                    response.raise_for_status()
+                    if ranged and response.status != 206:
+                        # If-Range не збігся: файл на сервері змінився
+                        state_file.unlink(missing_ok=True)
+                        raise DownloadError("файл на сервері змінився, "
+                                            "завантажте його заново")
+
+                    f = await asyncio.to_thread(open, part, mode)
+                    try:
+                        await asyncio.to_thread(f.seek, start + segment[2])
+                        buffer = bytearray()
+                        async for chunk in response.content.iter_chunked(
+                                self.chunk_size):
+                            buffer += chunk
+                            if len(buffer) >= self.write_buffer:
+                                await self._flush(f, buffer, segment, result,
+                                                  state_file, state)
+                        await self._flush(f, buffer, segment, result,
+                                          state_file, state)
+                    finally:
+                        await asyncio.to_thread(f.close)
+                    if end is not None and segment[2] < end - start:
+                        raise aiohttp.ClientPayloadError("з'єднання "
+                                                         "обірвалось")
+                    return
+            except aiohttp.ClientResponseError:
+                # 4xx/5xx на цьому етапі повтор не виправить
+                raise
+            except (ClientError, asyncio.TimeoutError) as e:
+                if attempt == self.retries:
+                    raise
+                print(f"🔁 {part.name} [{start}-{end}]: {e}, повтор "
+                      f"з байта {start + segment[2]}")
+                if not ranged:
+                    # Без Range продовжити не вийде - починаємо спочатку
+                    segment[2] = 0
+                await asyncio.sleep(0.5 * 2 ** attempt)
+
+    async def _flush(self, f, buffer: bytearray, segment: List[int],
+                     result: DownloadResult, state_file: Optional[Path],
+                     state: Optional[dict]) -> None:
+        if not buffer:
+            return
+        await asyncio.to_thread(f.write, buffer)
+        segment[2] += len(buffer)
+        result.downloaded += len(buffer)
+        buffer.clear()
+        if state is not None:
+            # Стан пишемо після даних - після збою продовжимо не далі
+            # записаного. Знімок JSON робимо в event loop
+            await asyncio.to_thread(f.flush)
+            await asyncio.to_thread(_save_state, state_file,
+                                    json.dumps(state), f".{segment[0]}")
+
+
+def _preallocate(part: Path, size: int) -> None:
+    with open(part, "wb") as f:
+        f.truncate(size)
+
+
+def _load_state(state_file: Path) -> Optional[dict]:
+    try:
+        with open(state_file, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_state(state_file: Path, state, suffix: str = "") -> None:
+    """Атомарно записує стан (dict або вже готовий JSON-рядок)."""
+    data = state if isinstance(state, str) else json.dumps(state)
+    # Окремий тимчасовий файл на сегмент: сегменти пишуть стан одночасно
+    tmp = state_file.with_name(state_file.name + suffix + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(data)
+    os.replace(tmp, state_file)
+
+
+async def main(items: List[Tuple[str, str]]) -> None:
+    async with Downloader() as downloader:
+        results = await downloader.download_many(items)
+    total = sum(result.downloaded for result in results)
+    seconds = max((result.seconds for result in results), default=0)
+    print(f"\nЗавантажено {total / 2**20:.1f} МБ за {seconds:.2f} с")
+
+
+# -----------------------------------------------------------------------------
+if __name__ == "__main__":
+    import sys
+
+    # python downloader.py URL [URL ...]
+    Path("downloads").mkdir(exist_ok=True)
+    asyncio.run(main([(url, f"downloads/{url.rstrip('/').split('/')[-1]}")
+                      for url in sys.argv[1:]]))
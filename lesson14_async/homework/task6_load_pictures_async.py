@@ -12,38 +12,28 @@
 # дозволяє запускати всі завдання одночасно і очікувати їх завершення.
 
 import asyncio
-import aiohttp
-from aiohttp import ClientSession, ClientError
 from typing import List, Tuple
 from pathlib import Path
 
-# Семафор для обмеження одночасних завантажень
-semaphore = asyncio.Semaphore(3)
+from downloader import Downloader, DownloadResult
 
 
-async def download_image(session: ClientSession,
+async def download_image(downloader: Downloader,
                          url: str,
-                         filename: str) -> None:
+                         filename: str) -> DownloadResult:
     """
     Завантажує зображення з вказаного URL та зберігає його у файл.
-    Використовує семафор для обмеження кількості одночасних завантажень.
 
-    :param session: Сесія aiohttp.
+    Тіло відповіді пишеться на диск шматками (без блокування event loop),
+    перерване завантаження продовжується з місця зупинки. Кількість
+    одночасних завантажень обмежує семафор Downloader (max_concurrent).
+
+    :param downloader: Рушій завантаження з відкритою сесією aiohttp.
     :param url: URL зображення.
     :param filename: Локальний шлях для збереження файлу.
+    :return: Результат завантаження (розмір, час, швидкість або помилка).
     """
-    async with semaphore:
-        try:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                image_data: bytes = await response.read()
-                with open(filename, "wb") as f:
-                    f.write(image_data)
-                print(f"✅ Завантажено: {filename}")
-        except ClientError as e:
-            print(f"❌ Помилка при завантаженні {url}: {e}")
-        except Exception as e:
-            print(f"❌ Неочікувана помилка з {url}: {e}")
+    return await downloader.download(url, filename)
 
 
 async def main(image_list: List[Tuple[str, str]]) -> None:
@@ -52,9 +42,9 @@ async def main(image_list: List[Tuple[str, str]]) -> None:
 
     :param image_list: Список кортежів (url, filename).
     """
-    async with aiohttp.ClientSession() as session:
+    async with Downloader(max_concurrent=3) as downloader:
         tasks: List[asyncio.Task] = [
-            asyncio.create_task(download_image(session, url, filename))
+            asyncio.create_task(download_image(downloader, url, filename))
             for url, filename in image_list
         ]
         await asyncio.gather(*tasks)
@@ -1,16 +1,60 @@
 """
 Модуль для парсингу новинного сайту з підтримкою декількох сторінок.
+
+Сторінки можна завантажувати послідовно (parse_multiple_pages) або
+асинхронно (parse_multiple_pages_async, потребує aiohttp): з пулом
+з'єднань, обмеженням одночасних запитів до хоста, rate limiting-ом
+за алгоритмом token bucket та повторними спробами з jitter.
 """
 
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Callable, Any
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+import asyncio
 import csv
+import random
 import time
 import re
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# User-Agent маскує ваш скрипт щоб ідентифікувати ваш скрипт як
+# звичайний браузер, а не як бота.
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+                  'AppleWebKit/537.36'
+}
+
+# Одна сесія на всі запити - з'єднання з сервером перевикористовуються
+session = requests.Session()
+session.headers.update(HEADERS)
+
+# HTTP-статуси, після яких має сенс повторити запит
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def page_url(base_url: str, page_num: int) -> str:
+    """
+    Формує URL сторінки новин за її номером.
+
+    Args:
+        base_url: Базова URL сайту
+        page_num: Номер сторінки (з 1)
+
+    Returns:
+        URL сторінки
+    """
+    if page_num == 1:
+        return f"{base_url}/ukr/news/"
+    return f"{base_url}/ukr/news/page-{page_num}.html"
+
 
 def get_page(url: str) -> Optional[BeautifulSoup]:
     """
@@ -24,13 +68,7 @@ def get_page(url: str) -> Optional[BeautifulSoup]:
         BeautifulSoup об'єкт або None у випадку помилки
     """
     try:
-        # User-Agent маскує ваш скрипт щоб ідентифікувати ваш скрипт як
-        # звичайний браузер, а не як бота.
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-                          'AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
+        response = session.get(url, timeout=10)
         response.raise_for_status()
         response.encoding = 'utf-8'
 
@@ -163,10 +201,7 @@ def parse_multiple_pages(base_url: str,
 
     for page_num in range(1, num_pages + 1):
         # Формування URL для кожної сторінки
-        if page_num == 1:
-            url = f"{base_url}/ukr/news/"
-        else:
-            url = f"{base_url}/ukr/news/page-{page_num}.html"
+        url = page_url(base_url, page_num)
 
         print(f"\nЗавантаження сторінки {page_num}: {url}")
 
@@ -191,6 +226,201 @@ def parse_multiple_pages(base_url: str,
     return all_news
 
 
+class TokenBucket:
+    """
+    Rate limiter за алгоритмом token bucket для asyncio.
+
+    Токени поповнюються зі швидкістю rate на секунду до capacity; кожен
+    запит забирає один токен. capacity визначає допустимий "сплеск".
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Чекає, поки з'явиться токен, і забирає його."""
+        # Lock робить чергу очікування FIFO
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity,
+                                  self.tokens + (now - self.updated)
+                                  * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncCrawler:
+    """
+    Асинхронний завантажувач сторінок з "ввічливими" обмеженнями.
+
+    Args:
+        max_per_host: Максимум одночасних з'єднань до одного хоста
+        rate: Запитів на секунду до одного хоста
+        burst: Скільки запитів можна зробити підряд без очікування
+        retries: Кількість повторних спроб після помилки
+        backoff: Базова затримка між спробами, с (росте як 2^спроба)
+        timeout: Таймаут одного запиту, с
+        parse_workers: Кількість потоків для парсингу HTML
+    """
+
+    def __init__(self, max_per_host: int = 4, rate: float = 2.0,
+                 burst: int = 2, retries: int = 3, backoff: float = 0.5,
+                 timeout: float = 10, parse_workers: int = 4):
+        if aiohttp is None:
+            raise ImportError("Для асинхронного режиму встановіть aiohttp: "
+                              "pip install aiohttp")
+        self.max_per_host = max_per_host
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.parse_workers = parse_workers
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.burst)
+        return self.buckets[host]
+
+    def _retry_delay(self, attempt: int,
+                     retry_after: Optional[str] = None) -> float:
+        """Затримка перед повтором: Retry-After або backoff з jitter."""
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        # "Full jitter": випадкова затримка, щоб клієнти не синхронізувались
+        return random.uniform(0, self.backoff * 2 ** attempt)
+
+    async def fetch(self, client: 'aiohttp.ClientSession',
+                    url: str) -> Optional[str]:
+        """
+        Завантажує сторінку з повторними спробами.
+
+        Args:
+            client: Сесія aiohttp (пул з'єднань)
+            url: URL адреса сторінки
+
+        Returns:
+            HTML-код сторінки або None, якщо всі спроби невдалі
+        """
+        for attempt in range(self.retries + 1):
+            await self._bucket(url).acquire()
+            retry_after = None
+            try:
+                async with client.get(url) as response:
+                    if response.status in RETRY_STATUSES:
+                        retry_after = response.headers.get('Retry-After')
+                        error = f"HTTP {response.status}"
+                    else:
+                        response.raise_for_status()
+                        return await response.text(encoding='utf-8')
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if isinstance(e, aiohttp.ClientResponseError):
+                    # 404 і подібні помилки повтор не виправить
+                    print(f"Помилка при завантаженні сторінки {url}: {e}")
+                    return None
+                error = str(e) or type(e).__name__
+
+            if attempt < self.retries:
+                delay = self._retry_delay(attempt, retry_after)
+                print(f"Спроба {attempt + 1} для {url} невдала ({error}), "
+                      f"повтор через {delay:.1f} с")
+                await asyncio.sleep(delay)
+
+        print(f"Помилка при завантаженні сторінки {url}: {error}")
+        return None
+
+    async def crawl(self, urls: List[str],
+                    parser: Callable[[str, str], Any]) -> List[Any]:
+        """
+        Завантажує сторінки конкурентно і парсить їх у пулі потоків.
+
+        Парсинг сторінки починається, щойно вона завантажена, тож він
+        іде паралельно із завантаженням наступних сторінок.
+
+        Args:
+            urls: Список URL адрес
+            parser: Функція parser(html, url), виконується в потоці
+
+        Returns:
+            Результати parser у порядку urls (None для невдалих сторінок)
+        """
+        loop = asyncio.get_running_loop()
+        connector = aiohttp.TCPConnector(limit_per_host=self.max_per_host)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        with ThreadPoolExecutor(self.parse_workers) as pool:
+            async with aiohttp.ClientSession(connector=connector,
+                                             timeout=timeout,
+                                             headers=HEADERS) as client:
+                async def process(url: str) -> Any:
+                    html = await self.fetch(client, url)
+                    if html is None:
+                        return None
+                    return await loop.run_in_executor(pool, parser,
+                                                      html, url)
+
+                return await asyncio.gather(*(process(url) for url in urls))
+
+
+def parse_html(html: str, base_url: str) -> List[Dict[str, str]]:
+    """
+    Парсить HTML-код сторінки новин (для виконання в пулі потоків).
+
+    Args:
+        html: HTML-код сторінки
+        base_url: Базова URL сайту
+
+    Returns:
+        Список словників з інформацією про новини
+    """
+    return parse_news(BeautifulSoup(html, 'lxml'), base_url)
+
+
+async def parse_multiple_pages_async(base_url: str, num_pages: int = 3,
+                                     **crawler_options
+                                     ) -> List[Dict[str, str]]:
+    """
+    Асинхронно парсить декілька сторінок новин.
+
+    Args:
+        base_url: Базова URL сайту
+        num_pages: Кількість сторінок для парсингу
+        **crawler_options: Параметри AsyncCrawler (rate, max_per_host, ...)
+
+    Returns:
+        Список всіх новин з усіх сторінок у порядку сторінок
+    """
+    crawler = AsyncCrawler(**crawler_options)
+    urls = [page_url(base_url, page_num)
+            for page_num in range(1, num_pages + 1)]
+    print(f"\nЗавантаження {num_pages} сторінок (асинхронно)")
+
+    pages = await crawler.crawl(urls, lambda html, url: parse_html(html,
+                                                                   base_url))
+
+    all_news = []
+    for page_num, news_data in enumerate(pages, start=1):
+        if news_data is None:
+            print(f"Пропускаємо сторінку {page_num}")
+        elif news_data:
+            all_news.extend(news_data)
+            print(f"Знайдено {len(news_data)} новин на сторінці {page_num}")
+        else:
+            print(f"Новин не знайдено на сторінці {page_num}")
+
+    return all_news
+
+
 def filter_by_date(data: List[Dict[str, str]],
                    days: int = 2) -> List[Dict[str, str]]:
     """
@@ -331,11 +561,9 @@ def get_user_input() -> tuple[int, int]:
     print("\n" + "-" * 50)
     print("Налаштування прийнято:")
     print(f"  - Кількість сторінок: {num_pages}")
-    print(
-        f"  - Фільтр по датах: "
-        f"{'всі новини' if filter_days == 0 else f'останні {filter_days} '
-                                                 f'днів'}"
-    )
+    days_label = ('всі новини' if filter_days == 0
+                  else f'останні {filter_days} днів')
+    print(f"  - Фільтр по датах: {days_label}")
 
     print("~" * 50)
 
@@ -355,8 +583,12 @@ def main() -> None:
     print(f"ПОЧАТОК ПАРСИНГУ {num_pages} СТОРІНОК")
     print("~" * 50)
 
-    # Парсинг декількох сторінок
-    all_news = parse_multiple_pages(base_url, num_pages)
+    # Парсинг декількох сторінок (асинхронно, якщо встановлено aiohttp)
+    if aiohttp is not None:
+        all_news = asyncio.run(parse_multiple_pages_async(base_url,
+                                                          num_pages))
+    else:
+        all_news = parse_multiple_pages(base_url, num_pages)
 
     if not all_news:
         print("\nНовини не знайдено на жодній сторінці")
@@ -1,32 +1,141 @@
 import fnmatch
-from datetime import datetime
-from typing import Callable, Dict, List
+import re
+from typing import Callable, Dict, List, Optional, Pattern, Set
+
+from event_log import EventLog
+
+
+class _TrieNode:
+    """Вузол індексу підписок: один сегмент імені події"""
+
+    __slots__ = ("regex", "children", "globs", "patterns")
+
+    def __init__(self, regex: Optional[Pattern] = None):
+        self.regex = regex  # для wildcard-сегмента: скомпільований fnmatch-шаблон
+        self.children: Dict[str, "_TrieNode"] = {}  # точні сегменти: "user"
+        self.globs: Dict[str, "_TrieNode"] = {}  # сегменти з wildcard: "*", "us*r"
+        self.patterns: Set[str] = set()  # шаблони, що закінчуються в цьому вузлі
+
+
+class WildcardIndex:
+    """
+    Індекс wildcard-підписок у вигляді дерева сегментів (trie).
+
+    Шаблон "user.*.deleted" розбивається по крапках на сегменти, і пошук
+    шаблонів для події йде по дереву сегмент за сегментом, а не перебором
+    усіх підписок. Семантика та сама, що й у fnmatch: "*" може захопити
+    кілька сегментів ("user.*" підходить і для "user.profile.updated"),
+    тому сегмент з wildcard перевіряється на 1..N сегментах події.
+    Шаблони з "[...]" (всередині може бути крапка) перевіряються через fnmatch.
+    """
+
+    def __init__(self):
+        self.root = _TrieNode()
+        self.fallback: Set[str] = set()
+
+    def add(self, pattern: str):
+        if "[" in pattern:
+            self.fallback.add(pattern)
+            return
+
+        node = self.root
+        for segment in pattern.split("."):
+            if "*" in segment or "?" in segment:
+                if segment not in node.globs:
+                    node.globs[segment] = _TrieNode(re.compile(fnmatch.translate(segment)))
+                node = node.globs[segment]
+            else:
+                node = node.children.setdefault(segment, _TrieNode())
+        node.patterns.add(pattern)
+
+    def remove(self, pattern: str):
+        if "[" in pattern:
+            self.fallback.discard(pattern)
+            return
+
+        # Видаляємо шаблон і прибираємо вузли, що стали порожніми
+        path = []
+        node = self.root
+        for segment in pattern.split("."):
+            branch = node.globs if "*" in segment or "?" in segment else node.children
+            if segment not in branch:
+                return
+            path.append((branch, segment))
+            node = branch[segment]
+        node.patterns.discard(pattern)
+
+        for branch, segment in reversed(path):
+            child = branch[segment]
+            if child.patterns or child.children or child.globs:
+                break
+            del branch[segment]
+
+    def match(self, event_name: str) -> Set[str]:
+        """Повертає всі шаблони, яким відповідає подія"""
+        segments = event_name.split(".")
+        found: Set[str] = set()
+        self._walk(self.root, segments, 0, found)
+        for pattern in self.fallback:
+            if fnmatch.fnmatch(event_name, pattern):
+                found.add(pattern)
+        return found
+
+    def _walk(self, node: _TrieNode, segments: List[str], pos: int, found: Set[str]):
+        if pos == len(segments):
+            found.update(node.patterns)
+            return
+
+        child = node.children.get(segments[pos])
+        if child is not None:
+            self._walk(child, segments, pos + 1, found)
+
+        # Wildcard-сегмент може відповідати кільком сегментам події разом з крапками
+        for glob_child in node.globs.values():
+            for end in range(pos + 1, len(segments) + 1):
+                if glob_child.regex.match(".".join(segments[pos:end])):
+                    self._walk(glob_child, segments, end, found)
 
 
 class EventBus:
     """EventBus з підтримкою wildcard та логування"""
 
-    def __init__(self):
+    def __init__(self, log_capacity: int = 10_000, log_spill_path: Optional[str] = None):
         self.listeners: Dict[str, List[Callable]] = {}
-        self.event_log: List[Dict] = []
+        # Лог зберігає лише останні log_capacity подій (старіші - у log_spill_path, якщо задано)
+        self.event_log = EventLog(log_capacity, log_spill_path)
+        # Wildcard-підписки: індекс для пошуку і порядок підписки для виклику
+        self.wildcards = WildcardIndex()
+        self._wildcard_order: Dict[str, int] = {}
+        self._subscriptions = 0
 
     def subscribe(self, event_name: str, callback: Callable):
+        if "*" in event_name and event_name not in self.listeners:
+            self.wildcards.add(event_name)
+            self._wildcard_order[event_name] = self._subscriptions
+        self._subscriptions += 1
         self.listeners.setdefault(event_name, []).append(callback)
         print(f"✅ Підписка: {callback.__name__} -> {event_name}")
 
     def unsubscribe(self, event_name: str, callback: Callable):
         if event_name in self.listeners:
             self.listeners[event_name].remove(callback)
+            if not self.listeners[event_name]:
+                del self.listeners[event_name]
+                if "*" in event_name:
+                    self.wildcards.remove(event_name)
+                    del self._wildcard_order[event_name]
             print(f"❌ Відписка: {callback.__name__} від {event_name}")
 
+    def _wildcard_patterns(self, event_name: str) -> List[str]:
+        """Wildcard-шаблони для події у порядку підписки"""
+        patterns = self.wildcards.match(event_name)
+        if len(patterns) > 1:
+            return sorted(patterns, key=self._wildcard_order.__getitem__)
+        return list(patterns)
+
     def emit(self, event_name: str, data: dict = None):
         # Лог події
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "event": event_name,
-            "data": data
-        }
-        self.event_log.append(log_entry)
+        self.event_log.append(event_name, data)
         print(f"\n🔔 Подія: {event_name} | Дані: {data}")
 
         # Exact match listeners
@@ -35,11 +144,10 @@ class EventBus:
                 self._safe_call(callback, data)
 
         # Wildcard listeners (user.*, *.created, user.*.deleted, etc.)
-        for pattern, callbacks in self.listeners.items():
-            if "*" in pattern and fnmatch.fnmatch(event_name,
-                                                  pattern):  # проверяет, соответствует ли заданная строка определённому шаблону, используя специальные символы, такие как * (любое количество символов) и ? (один символ). Это удобный инструмент для поиска файлов по шаблонам или фильтрации строк
-                for callback in callbacks:
-                    self._safe_call(callback, data)
+        # Шаблони шукаються в індексі за сегментами імені, а не перебором усіх підписок
+        for pattern in self._wildcard_patterns(event_name):
+            for callback in self.listeners[pattern]:
+                self._safe_call(callback, data)
 
     def _safe_call(self, callback, data):
         try:
@@ -48,11 +156,15 @@ class EventBus:
             print(f"❗ Помилка в {callback.__name__}: {e}")
 
     def get_logs(self):
-        return self.event_log
+        return self.event_log.get_logs()
+
+    def close(self):
+        """Дописати у файл витіснені з логу події (якщо задано log_spill_path)"""
+        self.event_log.close()
 
     def print_logs(self):
         print("\n📋 Логи подій:")
-        for log in self.event_log:
+        for log in self.get_logs():
             print(f"  {log['timestamp']} | {log['event']} | {log['data']}")
 
 
@@ -106,3 +218,4 @@ if __name__ == "__main__":
 
     # Виводимо логи
     bus.print_logs()
+    bus.close()
@@ -143,4 +143,5 @@ if __name__ == "__main__":
     print("📜 ІСТОРІЯ ПОДІЙ")
     print("=" * 50)
     for log in bus.event_log:
-        print(f"{log['timestamp']} | {log['event']}")
\ No newline at end of file
+        print(f"{log['timestamp']} | {log['event']}")
+    bus.close()
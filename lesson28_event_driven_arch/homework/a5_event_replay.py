@@ -1,17 +1,45 @@
 import json
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+from event_log import EventLog
+
+# Так json.dumps записує поле з назвою події в рядок логу
+EVENT_NAME_PREFIX = b'"event": "'
+
+# Розмір блоку при обчисленні контрольної суми логу
+DIGEST_CHUNK_SIZE = 1024 * 1024
 
 # ====================================
 # EVENTBUS З EVENT REPLAY
 # ====================================
 class EventBusWithReplay:
-    """EventBus з можливістю запису та відтворення подій"""
-
-    def __init__(self, log_file="events.log"):
+    """
+    EventBus з можливістю запису та відтворення подій.
+
+    Стан агрегатів (об'єктів з методами snapshot() -> dict та restore(state),
+    див. register_aggregate) періодично зберігається у snapshot-файл разом
+    з позицією в логі, кількістю подій до неї та CRC32 цього префікса логу.
+    Replay відновлює стан зі snapshot-у і відтворює лише події, записані
+    після нього, а не всю історію. Якщо префікс логу змінився (лог очищено
+    чи переписано, навіть не коротшим), snapshot ігнорується.
+    """
+
+    def __init__(self, log_file="events.log", log_capacity=10_000, snapshot_every=0):
         self.listeners = {}
-        self.event_log = []
+        # У пам'яті - лише останні події; повна історія для replay - у log_file
+        self.event_log = EventLog(log_capacity)
         self.log_file = log_file
+        self.snapshot_file = log_file + ".snapshot"
+        # Snapshot кожні snapshot_every подій (0 - лише вручну через take_snapshot())
+        self.snapshot_every = snapshot_every
+        self.aggregates = {}
+        self._events_since_snapshot = 0
+        # (позиція, кількість подій, CRC32) вже порахованого префікса логу:
+        # take_snapshot() дочитує лише нові байти
+        self._log_digest = (0, 0, 0)
 
     def subscribe(self, event_name, callback):
         """Підписатися на подію"""
@@ -19,6 +47,15 @@ class EventBusWithReplay:
             self.listeners[event_name] = []
         self.listeners[event_name].append(callback)
 
+    def register_aggregate(self, name, aggregate):
+        """
+        Зареєструвати агрегат, стан якого потрапляє в snapshot.
+
+        Агрегат повинен мати методи snapshot() -> dict (JSON-сумісний стан)
+        та restore(state). Його listener-и - звичайні підписки на методи агрегату.
+        """
+        self.aggregates[name] = aggregate
+
     def emit(self, event_name, data=None):
         """Випустити подію"""
         event = {
@@ -28,7 +65,7 @@ class EventBusWithReplay:
         }
 
         # Додаємо в лог
-        self.event_log.append(event)
+        self.event_log.append(event_name, data)
 
         # Записуємо в файл
         self._save_to_file(event)
@@ -36,8 +73,16 @@ class EventBusWithReplay:
         print(f"🔔 Подія: {event_name}")
 
         # Викликаємо listener-и
-        if event_name in self.listeners:
-            for callback in self.listeners[event_name]:
+        self._dispatch(self.listeners, event_name, data)
+
+        self._events_since_snapshot += 1
+        if self.snapshot_every and self._events_since_snapshot >= self.snapshot_every:
+            self.take_snapshot()
+
+    @staticmethod
+    def _dispatch(listeners, event_name, data):
+        if event_name in listeners:
+            for callback in listeners[event_name]:
                 try:
                     callback(data)
                 except Exception as e:
@@ -48,47 +93,197 @@ class EventBusWithReplay:
         with open(self.log_file, 'a', encoding='utf-8') as f:
             f.write(json.dumps(event, ensure_ascii=False) + '\n')
 
-    def replay_from_file(self, filename=None):
-        """Перезапустити події з файлу"""
+    def take_snapshot(self):
+        """Зберегти стан агрегатів разом з поточною позицією (байт) в логі"""
+        if os.path.exists(self.log_file):
+            self._log_digest = _log_digest(self.log_file, os.path.getsize(self.log_file),
+                                           self._log_digest)
+        else:
+            self._log_digest = (0, 0, 0)
+        position, events, checksum = self._log_digest
+        snapshot = {
+            "timestamp": datetime.now().isoformat(),
+            "position": position,
+            "events": events,
+            "checksum": checksum,
+            "aggregates": {name: aggregate.snapshot() for name, aggregate in self.aggregates.items()}
+        }
+        # Атомарний запис: тимчасовий файл + rename
+        tmp_file = self.snapshot_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(tmp_file, self.snapshot_file)
+        self._events_since_snapshot = 0
+        print(f"📸 Snapshot збережено (позиція в логі: {snapshot['position']} байт)")
+
+    def _load_snapshot(self, filename):
+        """Snapshot для filename або None, якщо його немає чи він не відповідає логу"""
+        snapshot_file = filename + ".snapshot"
+        if not os.path.exists(snapshot_file):
+            return None
+        with open(snapshot_file, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        # Лог міг бути очищений або замінений після snapshot-у
+        if snapshot["position"] > os.path.getsize(filename):
+            print("⚠️ Snapshot новіший за лог - ігноруємо його")
+            return None
+        _, events, checksum = _log_digest(filename, snapshot["position"])
+        if (events, checksum) != (snapshot.get("events"), snapshot.get("checksum")):
+            print("⚠️ Лог до позиції snapshot-у змінився - ігноруємо snapshot")
+            return None
+        return snapshot
+
+    def replay_from_file(self, filename=None, use_snapshot=True, parallel=False, verbose=True):
+        """
+        Перезапустити події з файлу.
+
+        Args:
+            filename: Лог подій (за замовчуванням - self.log_file)
+            use_snapshot: Відновити агрегати з останнього snapshot-у і
+                відтворити лише події після нього
+            parallel: Відтворювати кожен агрегат в окремому процесі
+                (агрегати мають бути незалежними і серіалізованими через pickle)
+            verbose: Друкувати кожну відтворену подію
+        """
         filename = filename or self.log_file
 
         print(f"\n{'=' * 50}")
         print(f"🔄 REPLAY: Відтворення подій з {filename}")
         print('=' * 50)
 
-        try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    try:
-                        event = json.loads(line.strip())
-                        event_name = event['event']
-                        data = event['data']
-
-                        print(f"\n[{line_num}] Replay: {event_name} | {event['timestamp']}")
-
-                        # Викликаємо listener-и (БЕЗ повторного збереження)
-                        if event_name in self.listeners:
-                            for callback in self.listeners[event_name]:
-                                try:
-                                    callback(data)
-                                except Exception as e:
-                                    print(f"❗ Помилка: {e}")
-
-                    except json.JSONDecodeError as e:
-                        print(f"⚠️ Помилка парсингу рядка {line_num}: {e}")
-
-            print(f"\n✅ Replay завершено")
-
-        except FileNotFoundError:
+        if not os.path.exists(filename):
             print(f"❌ Файл {filename} не знайдено")
+            return
+
+        position = 0
+        snapshot = self._load_snapshot(filename) if use_snapshot else None
+        if snapshot:
+            for name, state in snapshot["aggregates"].items():
+                if name in self.aggregates:
+                    self.aggregates[name].restore(state)
+            position = snapshot["position"]
+            print(f"📸 Стан відновлено зі snapshot-у {snapshot['timestamp']}, "
+                  f"відтворюємо події після {position} байт")
+
+        if parallel and self.aggregates:
+            replayed = self._replay_parallel(filename, position)
+        else:
+            replayed = _replay_tail(filename, position, self.listeners, verbose)
+
+        print(f"\n✅ Replay завершено (відтворено подій: {replayed})")
+
+    def _replay_parallel(self, filename, position):
+        """Кожен агрегат відтворює свої події в окремому процесі і повертає новий стан"""
+        owned = {name: {} for name in self.aggregates}
+        shared = {}
+        for event_name, callbacks in self.listeners.items():
+            for callback in callbacks:
+                owner = next((name for name, aggregate in self.aggregates.items()
+                              if getattr(callback, "__self__", None) is aggregate), None)
+                target = owned[owner] if owner else shared
+                target.setdefault(event_name, []).append(callback)
+
+        names = list(self.aggregates)
+        with ProcessPoolExecutor(max_workers=len(names)) as pool:
+            futures = [pool.submit(_replay_aggregate, filename, position, self.aggregates[name], owned[name])
+                       for name in names]
+            # Listener-и поза агрегатами відтворюються в цьому процесі
+            replayed = _replay_tail(filename, position, shared, verbose=False)
+            for name, future in zip(names, futures):
+                state, count = future.result()
+                self.aggregates[name].restore(state)
+                replayed = max(replayed, count)
+        return replayed
 
     def clear_log_file(self):
-        """Очистити файл логів"""
+        """Очистити файл логів (і snapshot, що на нього посилається)"""
         with open(self.log_file, 'w') as f:
             f.write('')
+        if os.path.exists(self.snapshot_file):
+            os.remove(self.snapshot_file)
+        self._events_since_snapshot = 0
+        self._log_digest = (0, 0, 0)
         print(f"🗑️ Файл {self.log_file} очищено")
 
 
+def _log_digest(filename, position, start=(0, 0, 0)):
+    """
+    (position, кількість подій, CRC32) перших position байт логу.
+
+    start - вже порахований коротший префікс цього ж логу; з нього
+    продовжується підрахунок, щоб не перечитувати весь файл.
+    """
+    offset, events, checksum = start if start[0] <= position else (0, 0, 0)
+    with open(filename, 'rb') as f:
+        f.seek(offset)
+        while offset < position:
+            chunk = f.read(min(DIGEST_CHUNK_SIZE, position - offset))
+            if not chunk:
+                break
+            events += chunk.count(b'\n')
+            checksum = zlib.crc32(chunk, checksum)
+            offset += len(chunk)
+    return offset, events, checksum
+
+
+def _replay_tail(filename, position, listeners, verbose=True):
+    """
+    Потоково відтворити події з байтової позиції position.
+
+    Файл читається рядок за рядком у двійковому режимі. Назва події
+    береться прямо з байтів рядка, і повністю в JSON розбираються лише
+    події, на які є listener-и (або всі - якщо verbose).
+    """
+    replayed = 0
+    with open(filename, 'rb') as f:
+        f.seek(position)
+        for line_num, line in enumerate(f, 1):
+            # Рядок без \n ще дописується - зупиняємось на ньому
+            if not line.endswith(b'\n'):
+                break
+
+            if not verbose:
+                event_name = _peek_event_name(line)
+                if event_name is not None and event_name not in listeners:
+                    replayed += 1
+                    continue
+
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"⚠️ Помилка парсингу рядка {line_num}: {e}")
+                continue
+
+            replayed += 1
+            event_name = event['event']
+            if verbose:
+                print(f"\n[{line_num}] Replay: {event_name} | {event['timestamp']}")
+
+            # Викликаємо listener-и (БЕЗ повторного збереження)
+            EventBusWithReplay._dispatch(listeners, event_name, event['data'])
+    return replayed
+
+
+def _peek_event_name(line):
+    """Назва події з рядка логу без повного розбору JSON (None - не вдалося)"""
+    start = line.find(EVENT_NAME_PREFIX)
+    if start == -1:
+        return None
+    start += len(EVENT_NAME_PREFIX)
+    end = line.find(b'"', start)
+    name = line[start:end]
+    # Екрановані символи (\" тощо) - нехай розбирає json
+    if end == -1 or b'\\' in name:
+        return None
+    return name.decode('utf-8')
+
+
+def _replay_aggregate(filename, position, aggregate, listeners):
+    """Точка входу процесу: відтворити події одного агрегату і повернути його стан"""
+    count = _replay_tail(filename, position, listeners, verbose=False)
+    return aggregate.snapshot(), count
+
+
 # ====================================
 # СИМУЛЯЦІЯ БАНКІВСЬКИХ ОПЕРАЦІЙ
 # ====================================
@@ -119,14 +314,22 @@ class BankAccount:
     def show_balance(self):
         print(f"\n💵 Поточний баланс рахунку #{self.account_id}: {self.balance} грн")
 
+    def snapshot(self):
+        """Стан рахунку для snapshot-у"""
+        return {"balance": self.balance}
+
+    def restore(self, state):
+        """Відновити стан рахунку зі snapshot-у"""
+        self.balance = state["balance"]
+
 
 # ====================================
 # ДЕМОНСТРАЦІЯ
 # ====================================
 
 if __name__ == "__main__":
-    # Очищаємо старий лог
-    bus = EventBusWithReplay("events.log")
+    # Очищаємо старий лог; snapshot стану - кожні 3 події
+    bus = EventBusWithReplay("events.log", snapshot_every=3)
     bus.clear_log_file()
 
     print("\n" + "=" * 50)
@@ -136,7 +339,8 @@ if __name__ == "__main__":
     # Створюємо рахунок
     account = BankAccount(account_id=12345, initial_balance=1000)
 
-    # Підписуємося на події
+    # Підписуємося на події; рахунок - агрегат, його стан потрапляє в snapshot
+    bus.register_aggregate("account", account)
     bus.subscribe("account.deposit", account.deposit)
     bus.subscribe("account.withdraw", account.withdraw)
 
@@ -161,14 +365,29 @@ if __name__ == "__main__":
     account2 = BankAccount(account_id=99999, initial_balance=1000)
 
     # Підписуємося
+    bus2.register_aggregate("account", account2)
     bus2.subscribe("account.deposit", account2.deposit)
     bus2.subscribe("account.withdraw", account2.withdraw)
 
-    # REPLAY - відтворюємо всі події з файлу
+    # REPLAY - стан зі snapshot-у + події після нього
     bus2.replay_from_file()
 
     account2.show_balance()
 
+    print("\n\n" + "=" * 50)
+    print("СЦЕНАРІЙ 3: Повний replay без snapshot-у, агрегат - в окремому процесі")
+    print("=" * 50 + "\n")
+
+    bus3 = EventBusWithReplay("events.log")
+    account3 = BankAccount(account_id=77777, initial_balance=1000)
+    bus3.register_aggregate("account", account3)
+    bus3.subscribe("account.deposit", account3.deposit)
+    bus3.subscribe("account.withdraw", account3.withdraw)
+
+    bus3.replay_from_file(use_snapshot=False, parallel=True)
+
+    account3.show_balance()
+
     # print("\n" + "=" * 50)
     # print("📝 ВИСНОВОК:")
     # print("=" * 50)
@@ -15,60 +15,288 @@
 import time
 import threading
 import json
-from queue import Queue
-from typing import Callable
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+EXCHANGE_TYPES = ("fanout", "direct", "topic")
 
 
 # ====================================
-# ІМІТАЦІЯ RABBITMQ ЧЕРЕЗ QUEUE
+# ІМІТАЦІЯ RABBITMQ: EXCHANGE -> ЧЕРГИ
 # ====================================
 
-class SimulatedRabbitMQ:
-    """Проста імітація RabbitMQ для навчання"""
+@dataclass
+class Message:
+    """Повідомлення в черзі"""
+    body: str
+    exchange: str
+    routing_key: str
+    delivery_count: int = 0  # Скільки разів повідомлення вже видавалось і не було підтверджено
+
+    @property
+    def redelivered(self) -> bool:
+        return self.delivery_count > 0
+
+
+@lru_cache(maxsize=4096)
+def topic_matches(binding_key: str, routing_key: str) -> bool:
+    """Чи підходить routing_key під binding_key topic exchange (* - одне слово, # - 0 і більше слів)"""
+    return _match_words(tuple(binding_key.split(".")), tuple(routing_key.split(".")))
+
+
+def _match_words(pattern: Tuple[str, ...], words: Tuple[str, ...]) -> bool:
+    if not pattern:
+        return not words
+    head = pattern[0]
+    if head == "#":
+        return any(_match_words(pattern[1:], words[i:]) for i in range(len(words) + 1))
+    if not words:
+        return False
+    return head in ("*", words[0]) and _match_words(pattern[1:], words[1:])
+
+
+class Exchange:
+    """Exchange з маршрутизацією fanout / direct / topic"""
+
+    def __init__(self, name: str, exchange_type: str = "fanout"):
+        if exchange_type not in EXCHANGE_TYPES:
+            raise ValueError(f"Невідомий тип exchange '{exchange_type}', доступні: {EXCHANGE_TYPES}")
+        self.name = name
+        self.exchange_type = exchange_type
+        self.bindings: List[Tuple[str, str]] = []  # (черга, binding key)
+        self._routes: Dict[str, List[str]] = {}   # кеш routing key -> черги
+
+    def bind(self, queue_name: str, binding_key: str = ""):
+        if (queue_name, binding_key) not in self.bindings:
+            self.bindings.append((queue_name, binding_key))
+            self._routes.clear()
+
+    def route(self, routing_key: str) -> List[str]:
+        """Черги, в які потрапить повідомлення з цим routing key"""
+        queues = self._routes.get(routing_key)
+        if queues is None:
+            queues = []
+            for queue_name, binding_key in self.bindings:
+                if (self.exchange_type == "fanout"
+                        or self.exchange_type == "direct" and binding_key == routing_key
+                        or self.exchange_type == "topic" and topic_matches(binding_key, routing_key)):
+                    if queue_name not in queues:
+                        queues.append(queue_name)
+            self._routes[routing_key] = queues
+        return queues
+
+
+class BrokerQueue:
+    """
+    Черга з prefetch, підтвердженнями та work-stealing.
+
+    Consumer забирає до prefetch повідомлень у власний буфер; незайнятий consumer
+    спершу бере нові повідомлення з черги, а коли вона порожня - "краде" половину
+    буфера найбільш завантаженого сусіда. Очікування - на Condition, без polling-у.
+    """
+
+    def __init__(self, name: str, max_redeliveries: int = 3):
+        self.name = name
+        self.max_redeliveries = max_redeliveries
+        self.messages = deque()
+        self.buffers: Dict[str, deque] = {}  # consumer tag -> видані, ще не взяті в обробку
+        self.unacked = 0                     # видані consumer-ам і ще не підтверджені
+        self.dead_letters: List[Message] = []
+        self.closed = False
+        self.lock = threading.Lock()
+        self.available = threading.Condition(self.lock)  # з'явились повідомлення / черга закрита
+        self.idle = threading.Condition(self.lock)       # черга порожня і все підтверджено
+        self._next_tag = 0
+
+    def put(self, message: Message):
+        with self.lock:
+            self.messages.append(message)
+            self.available.notify()
+
+    def register(self, worker_name: str) -> str:
+        with self.lock:
+            self._next_tag += 1
+            tag = f"{worker_name}#{self._next_tag}"
+            self.buffers[tag] = deque()
+            return tag
+
+    def unregister(self, tag: str):
+        """Повернути в чергу все, що consumer забрав, але не почав обробляти"""
+        with self.lock:
+            buffer = self.buffers.pop(tag)
+            self.unacked -= len(buffer)
+            while buffer:
+                message = buffer.pop()
+                message.delivery_count += 1
+                self.messages.appendleft(message)
+            self.available.notify_all()
+
+    def get(self, tag: str, prefetch: int) -> Optional[Message]:
+        """Наступне повідомлення для consumer-а; None - черга закрита"""
+        with self.lock:
+            buffer = self.buffers[tag]
+            while not self.closed:
+                if not buffer and not self._fetch(buffer, prefetch):
+                    self._steal(tag, buffer)
+                if buffer:
+                    return buffer.popleft()
+                self.available.wait()
+            return None
+
+    def _fetch(self, buffer: deque, prefetch: int) -> bool:
+        count = min(prefetch, len(self.messages))
+        for _ in range(count):
+            buffer.append(self.messages.popleft())
+        self.unacked += count
+        if count > 1:
+            # Залишок буфера можуть вкрасти consumer-и, що чекають
+            self.available.notify(count - 1)
+        return count > 0
+
+    def _steal(self, tag: str, buffer: deque):
+        victim = max((b for t, b in self.buffers.items() if t != tag), key=len, default=None)
+        if victim:
+            for _ in range((len(victim) + 1) // 2):
+                buffer.appendleft(victim.pop())
+
+    def ack(self, message: Message):
+        with self.lock:
+            self.unacked -= 1
+            self._notify_if_idle()
+
+    def nack(self, message: Message, requeue: bool = True):
+        """Не підтвердити: повернути в голову черги або, після max_redeliveries, у dead letters"""
+        with self.lock:
+            self.unacked -= 1
+            message.delivery_count += 1
+            if requeue and message.delivery_count <= self.max_redeliveries:
+                self.messages.appendleft(message)
+                self.available.notify()
+            else:
+                self.dead_letters.append(message)
+                self._notify_if_idle()
+
+    def _notify_if_idle(self):
+        if not self.messages and not self.unacked:
+            self.idle.notify_all()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Дочекатися, поки всі повідомлення оброблені й підтверджені"""
+        with self.lock:
+            return self.idle.wait_for(lambda: not self.messages and not self.unacked, timeout)
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            self.available.notify_all()
 
-    def __init__(self):
-        # Словник черг: {"exchange_name": Queue()}
-        self.exchanges = {}
+
+class SimulatedRabbitMQ:
+    """Імітація RabbitMQ: exchange-і з маршрутизацією, черги, prefetch, ack/redelivery"""
+
+    def __init__(self, max_redeliveries: int = 3, verbose: bool = True):
+        self.exchanges: Dict[str, Exchange] = {}
+        self.queues: Dict[str, BrokerQueue] = {}
+        self.max_redeliveries = max_redeliveries
+        self.verbose = verbose
+        # False після stop(): publish() більше не приймає повідомлень
         self.running = True
 
-    def create_exchange(self, exchange_name):
+    def create_exchange(self, exchange_name, exchange_type="fanout"):
         """Створити exchange (точку обміну повідомленнями)"""
         if exchange_name not in self.exchanges:
-            self.exchanges[exchange_name] = Queue()
-            print(f"✅ Exchange '{exchange_name}' створено")
-
-    def publish(self, exchange_name, message):
-        """Опублікувати повідомлення (Producer)"""
-        if exchange_name in self.exchanges:
-            self.exchanges[exchange_name].put(message)
-            print(f"📤 Опубліковано в '{exchange_name}': {message}")
-        else:
+            self.exchanges[exchange_name] = Exchange(exchange_name, exchange_type)
+            print(f"✅ Exchange '{exchange_name}' ({exchange_type}) створено")
+
+    def declare_queue(self, queue_name):
+        """Створити чергу"""
+        if queue_name not in self.queues:
+            self.queues[queue_name] = BrokerQueue(queue_name, self.max_redeliveries)
+            print(f"✅ Черга '{queue_name}' створена")
+
+    def bind(self, queue_name, exchange_name, routing_key=""):
+        """Прив'язати чергу до exchange (для fanout routing_key ігнорується)"""
+        self.declare_queue(queue_name)
+        self.exchanges[exchange_name].bind(queue_name, routing_key)
+        print(f"🔗 '{exchange_name}' -> '{queue_name}' (ключ: '{routing_key}')")
+
+    def publish(self, exchange_name, message, routing_key="") -> int:
+        """Опублікувати повідомлення (Producer); повертає кількість черг-отримувачів"""
+        if not self.running:
+            # Consumer-и вже зупинені - повідомлення ніхто не отримає
+            print(f"❌ Брокер зупинено, повідомлення в '{exchange_name}' відхилено")
+            return 0
+        exchange = self.exchanges.get(exchange_name)
+        if exchange is None:
             print(f"❌ Exchange '{exchange_name}' не існує")
-
-    def consume(self, exchange_name, callback: Callable, worker_name: str):
-        """Споживати повідомлення (Consumer/Worker)"""
-        print(f"🚀 Worker '{worker_name}' підключився до '{exchange_name}'")
-
-        while self.running:
-            try:
-                # Отримуємо повідомлення з черги
-                message = self.exchanges[exchange_name].get(timeout=1)
-                print(f"\n📥 [{worker_name}] Отримано: {message}")
+            return 0
+
+        queue_names = exchange.route(routing_key)
+        for queue_name in queue_names:
+            self.queues[queue_name].put(Message(message, exchange_name, routing_key))
+        if self.verbose:
+            print(f"📤 Опубліковано в '{exchange_name}' [{routing_key}] -> {queue_names}: {message}")
+        return len(queue_names)
+
+    def consume(self, queue_name, callback: Callable, worker_name: str, prefetch: int = 1):
+        """
+        Споживати повідомлення (Consumer/Worker) до stop().
+
+        Успішний callback підтверджує повідомлення (ack), виняток - повертає
+        його в чергу для повторної доставки (nack).
+        """
+        queue = self.queues[queue_name]
+        tag = queue.register(worker_name)
+        print(f"🚀 Worker '{worker_name}' підключився до '{queue_name}' (prefetch={prefetch})")
+
+        try:
+            while True:
+                message = queue.get(tag, prefetch)
+                if message is None:
+                    break
+                if self.verbose:
+                    redelivered = " (повторно)" if message.redelivered else ""
+                    print(f"\n📥 [{worker_name}] Отримано{redelivered}: {message.body}")
 
                 try:
-                    callback(message)
+                    callback(message.body)
                 except Exception as e:
                     print(f"❗ [{worker_name}] Помилка обробки: {e}")
-
-                self.exchanges[exchange_name].task_done()
-
-            except:
-                # Черга порожня - чекаємо далі
-                continue
+                    queue.nack(message)
+                else:
+                    queue.ack(message)
+        finally:
+            queue.unregister(tag)
+
+    def start_consumers(self, queue_name, callback: Callable, worker_name: str,
+                        count: int = 1, prefetch: int = 1) -> List[threading.Thread]:
+        """Запустити count конкуруючих consumer-ів черги в окремих потоках"""
+        threads = []
+        for i in range(count):
+            name = worker_name if count == 1 else f"{worker_name} {i + 1}"
+            thread = threading.Thread(target=self.consume, args=(queue_name, callback, name, prefetch),
+                                      daemon=True)
+            thread.start()
+            threads.append(thread)
+        return threads
+
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        """Дочекатися, поки всі черги оброблені"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for queue in self.queues.values():
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not queue.join(remaining):
+                return False
+        return True
 
     def stop(self):
         """Зупинити всі worker-и"""
         self.running = False
+        for queue in self.queues.values():
+            queue.close()
 
 
 # ====================================
@@ -121,11 +349,13 @@ class AnalyticsWorker:
 
     def __init__(self):
         self.total_users = 0
+        self.lock = threading.Lock()  # process() можуть викликати кілька consumer-ів
 
     def process(self, message):
         """Обробити подію"""
         data = json.loads(message)
-        self.total_users += 1
+        with self.lock:
+            self.total_users += 1
 
         print(f"  📊 [Analytics Worker] Оновлюю статистику...")
         time.sleep(0.5)
@@ -141,31 +371,18 @@ if __name__ == "__main__":
     print("ДЕМОНСТРАЦІЯ RABBITMQ PATTERN")
     print("=" * 60 + "\n")
 
-    # Створюємо "RabbitMQ"
+    # Створюємо "RabbitMQ": fanout exchange копіює кожну подію в чергу кожного сервісу
     rabbitmq = SimulatedRabbitMQ()
-    rabbitmq.create_exchange("user_events")
+    rabbitmq.create_exchange("user_events", "fanout")
+    rabbitmq.bind("email_queue", "user_events")
+    rabbitmq.bind("analytics_queue", "user_events")
 
     # Створюємо analytics worker
     analytics = AnalyticsWorker()
 
-    # Запускаємо worker-ів в окремих потоках
-    email_thread = threading.Thread(
-        target=rabbitmq.consume,
-        args=("user_events", email_worker, "Email Worker"),
-        daemon=True
-    )
-
-    analytics_thread = threading.Thread(
-        target=rabbitmq.consume,
-        args=("user_events", analytics.process, "Analytics Worker"),
-        daemon=True
-    )
-
-    email_thread.start()
-    analytics_thread.start()
-
-    # Даємо worker-ам час на підключення
-    time.sleep(1)
+    # Два конкуруючі email worker-и ділять одну чергу, analytics - окрема черга
+    rabbitmq.start_consumers("email_queue", email_worker, "Email Worker", count=2)
+    rabbitmq.start_consumers("analytics_queue", analytics.process, "Analytics Worker")
 
     print("\n" + "=" * 60)
     print("PRODUCER: Реєструємо користувачів")
@@ -176,20 +393,42 @@ if __name__ == "__main__":
 
     # Реєструємо користувачів
     registration_service.register_user(1, "alice@example.com")
-    time.sleep(2)
-
     registration_service.register_user(2, "bob@example.com")
-    time.sleep(2)
-
     registration_service.register_user(3, "charlie@example.com")
-    time.sleep(2)
+
+    # Чекаємо, поки всі повідомлення оброблені й підтверджені (без фіксованих sleep)
+    rabbitmq.wait_until_idle()
+
+    print("\n" + "=" * 60)
+    print("TOPIC EXCHANGE ТА ПОВТОРНА ДОСТАВКА")
+    print("=" * 60 + "\n")
+
+    rabbitmq.create_exchange("audit", "topic")
+    rabbitmq.bind("user_audit", "audit", "user.*")
+    rabbitmq.bind("deletions", "audit", "#.deleted")
+
+    attempts = {}
+
+    def flaky_worker(message):
+        """Падає на першій спробі - повідомлення буде доставлене повторно"""
+        attempts[message] = attempts.get(message, 0) + 1
+        if attempts[message] == 1:
+            raise ConnectionError("Сервіс тимчасово недоступний")
+        print(f"  🗑️ [Deletions Worker] Оброблено з {attempts[message]}-ї спроби")
+
+    rabbitmq.start_consumers("user_audit", lambda message: None, "Audit Worker", prefetch=10)
+    rabbitmq.start_consumers("deletions", flaky_worker, "Deletions Worker")
+
+    rabbitmq.publish("audit", "user 1 updated", routing_key="user.updated")   # -> user_audit
+    rabbitmq.publish("audit", "user 2 deleted", routing_key="user.deleted")   # -> обидві черги
+    rabbitmq.publish("audit", "order 7 deleted", routing_key="order.deleted")  # -> deletions
+    rabbitmq.wait_until_idle()
 
     # Зупиняємо
     print("\n" + "=" * 60)
     print("Зупинка системи...")
     print("=" * 60)
     rabbitmq.stop()
-    time.sleep(1)
 
     print("\n" + "=" * 60)
     print("ВИСНОВКИ:")
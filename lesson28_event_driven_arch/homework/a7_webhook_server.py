@@ -14,10 +14,78 @@ curl -X POST http://localhost:5000/webhook/order \
 """
 
 from flask import Flask, request, jsonify
+import bisect
+import queue
 import threading
 import time
 from datetime import datetime
-from queue import Queue
+
+from event_log import EventLog
+
+
+# Межі кошиків гістограми затримки (секунди) від emit() до обробки події
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Через скільки секунд клієнту повторити webhook, якщо черга заповнена (429)
+RETRY_AFTER_SECONDS = 1
+
+
+# ====================================
+# МЕТРИКИ
+# ====================================
+
+class WebhookMetrics:
+    """Лічильники та гістограма затримок обробки подій (потокобезпечні)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.accepted = 0
+        self.dropped = 0
+        self.handled = 0
+        self.listener_errors = 0
+        # Останній кошик - все, що довше за LATENCY_BUCKETS[-1]
+        self.latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+
+    def record_accepted(self):
+        with self._lock:
+            self.accepted += 1
+
+    def record_dropped(self):
+        with self._lock:
+            self.dropped += 1
+
+    def record_handled(self, latencies, errors=0):
+        """Врахувати пачку оброблених подій одним захопленням lock-а"""
+        with self._lock:
+            self.handled += len(latencies)
+            self.listener_errors += errors
+            for latency in latencies:
+                self.latency_counts[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+                self.latency_sum += latency
+
+    def to_dict(self, queue_depth, queue_capacity):
+        with self._lock:
+            # Кумулятивна гістограма, як у Prometheus: кількість подій <= межі
+            buckets = {}
+            total = 0
+            for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), self.latency_counts):
+                total += count
+                buckets["+Inf" if bound == float("inf") else str(bound)] = total
+            return {
+                "queue_depth": queue_depth,
+                "queue_capacity": queue_capacity,
+                "accepted": self.accepted,
+                "dropped": self.dropped,
+                "handled": self.handled,
+                "listener_errors": self.listener_errors,
+                "latency_seconds": {
+                    "buckets": buckets,
+                    "count": self.handled,
+                    "sum": round(self.latency_sum, 6),
+                    "avg": round(self.latency_sum / self.handled, 6) if self.handled else 0,
+                },
+            }
 
 
 # ====================================
@@ -25,12 +93,25 @@ from queue import Queue
 # ====================================
 
 class EventBus:
-    """Простий EventBus для обробки webhook-ів"""
+    """
+    EventBus для обробки webhook-ів.
 
-    def __init__(self):
+    Черга обмежена max_queue_size подіями: якщо вона заповнена, emit()
+    не чекає, а повертає False (сервер відповідає 429). Події обробляє пул
+    з workers потоків, кожен забирає з черги пачку до batch_size подій.
+    """
+
+    def __init__(self, workers=4, batch_size=32, max_queue_size=1_000,
+                 log_capacity=10_000, log_spill_path=None):
         self.listeners = {}
-        self.event_queue = Queue()
-        self.event_log = []
+        self.event_queue = queue.Queue(maxsize=max_queue_size)
+        # Лог отриманих подій: лише останні log_capacity (кільцевий буфер)
+        self.event_log = EventLog(log_capacity, log_spill_path)
+        self.metrics = WebhookMetrics()
+        self.workers = workers
+        self.batch_size = batch_size
+        self.worker_threads = []
+        # False після stop(): emit() відхиляє нові події
         self.running = True
 
     def subscribe(self, event_name, callback):
@@ -40,44 +121,97 @@ class EventBus:
         self.listeners[event_name].append(callback)
 
     def emit(self, event_name, data):
-        """Додати подію в чергу"""
+        """Додати подію в чергу; False - черга заповнена або bus зупинено, подію відкинуто"""
+        if not self.running:
+            self.metrics.record_dropped()
+            return False
         event = {
             "timestamp": datetime.now().isoformat(),
             "event": event_name,
-            "data": data
+            "data": data,
+            "enqueued_at": time.monotonic()
         }
-        self.event_queue.put(event)
-        self.event_log.append(event)
-
-    def worker(self):
-        """Worker для обробки подій"""
-        print("🚀 EventBus Worker запущено")
-
-        while self.running:
+        try:
+            self.event_queue.put_nowait(event)
+        except queue.Full:
+            self.metrics.record_dropped()
+            return False
+        self.metrics.record_accepted()
+        self.event_log.append(event_name, data)
+        return True
+
+    def _handle(self, event):
+        """Викликати listener-и однієї події; повертає кількість помилок"""
+        event_name = event["event"]
+        data = event["data"]
+        errors = 0
+
+        print(f"\n🔔 Обробка: {event_name} | {data}")
+
+        # Викликаємо listener-и
+        for callback in self.listeners.get(event_name, ()):
             try:
-                event = self.event_queue.get(timeout=1)
-                event_name = event["event"]
-                data = event["data"]
-
-                print(f"\n🔔 Обробка: {event_name} | {data}")
-
-                # Викликаємо listener-и
-                if event_name in self.listeners:
-                    for callback in self.listeners[event_name]:
-                        try:
-                            callback(data)
-                        except Exception as e:
-                            print(f"❗ Помилка в {callback.__name__}: {e}")
+                callback(data)
+            except Exception as e:
+                errors += 1
+                print(f"❗ Помилка в {callback.__name__}: {e}")
+        return errors
 
+    def worker(self):
+        """Worker: забирає з черги пачки до batch_size подій"""
+        print(f"🚀 EventBus Worker запущено: {threading.current_thread().name}")
+
+        while True:
+            # Блокуюче очікування без опитування; None - сигнал зупинки
+            # (кожен worker забирає рівно один None, тому далі його не читаємо)
+            batch = [self.event_queue.get()]
+            while batch[-1] is not None and len(batch) < self.batch_size:
+                try:
+                    batch.append(self.event_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            latencies = []
+            errors = 0
+            for event in batch:
+                if event is None:
+                    continue
+                try:
+                    errors += self._handle(event)
+                except Exception as e:
+                    errors += 1
+                    print(f"❗ Критична помилка в worker: {e}")
+                latencies.append(time.monotonic() - event["enqueued_at"])
+            self.metrics.record_handled(latencies, errors)
+
+            for _ in batch:
                 self.event_queue.task_done()
-
-            except:
-                continue
+            if None in batch:
+                print("🛑 EventBus Worker зупинено")
+                return
 
     def start_worker(self):
-        """Запустити worker в окремому потоці"""
-        worker_thread = threading.Thread(target=self.worker, daemon=True)
-        worker_thread.start()
+        """Запустити пул worker-ів в окремих потоках"""
+        self.running = True
+        for number in range(1, self.workers + 1):
+            worker_thread = threading.Thread(target=self.worker, name=f"webhook-worker-{number}", daemon=True)
+            worker_thread.start()
+            self.worker_threads.append(worker_thread)
+
+    def stop(self):
+        """Дочекатися обробки черги, зупинити worker-и і дописати лог"""
+        # Нові події більше не приймаються; вже прийняті - дообробляються
+        self.running = False
+        self.event_queue.join()
+        for _ in self.worker_threads:
+            self.event_queue.put(None)
+        for worker_thread in self.worker_threads:
+            worker_thread.join()
+        self.worker_threads = []
+        self.event_log.close()
+
+    def get_metrics(self):
+        return self.metrics.to_dict(self.event_queue.qsize(), self.event_queue.maxsize)
 
 
 # ====================================
@@ -142,6 +276,7 @@ curl -X POST http://localhost:5000/webhook/order \\
     </pre>
 
     <p><a href="/logs">📋 Переглянути логи</a></p>
+    <p><a href="/metrics">📈 Метрики черги</a></p>
     """
 
 
@@ -168,8 +303,14 @@ def webhook_order():
         print(f"Status: {status}")
         print(f"Full data: {data}")
 
-        # Генеруємо подію в EventBus
-        event_bus.emit("order.created", data)
+        # Генеруємо подію в EventBus; черга заповнена - просимо повторити пізніше
+        if not event_bus.emit("order.created", data):
+            response = jsonify({
+                "error": "Too many webhooks, queue is full",
+                "retry_after": RETRY_AFTER_SECONDS
+            })
+            response.headers["Retry-After"] = str(RETRY_AFTER_SECONDS)
+            return response, 429
 
         # Повертаємо успішну відповідь
         return jsonify({
@@ -185,13 +326,22 @@ def webhook_order():
 
 @app.route('/logs', methods=['GET'])
 def get_logs():
-    """Переглянути всі отримані події"""
+    """Переглянути останні отримані події (?limit=N)"""
+    limit = request.args.get('limit', type=int)
     return jsonify({
-        "total_events": len(event_bus.event_log),
-        "events": event_bus.event_log
+        "total_events": event_bus.event_log.total,
+        "stored_events": len(event_bus.event_log),
+        "capacity": event_bus.event_log.capacity,
+        "events": event_bus.event_log.get_logs(limit)
     })
 
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Глибина черги, гістограма затримок обробки, кількість відкинутих подій"""
+    return jsonify(event_bus.get_metrics())
+
+
 @app.route('/health', methods=['GET'])
 def health():
     """Перевірка здоров'я сервера"""
@@ -209,19 +359,22 @@ if __name__ == '__main__':
     print("\n" + "=" * 60)
     print("🎣 WEBHOOK SERVER")
     print("=" * 60)
-    print("✅ EventBus worker запущено")
+    print(f"✅ EventBus worker-и запущено: {event_bus.workers}")
     print("✅ Flask сервер запускається...")
     print("\n📌 Відкрий в браузері: http://localhost:5000")
     print("📌 Для тестування використовуй curl або Postman")
     print("\n" + "=" * 60 + "\n")
 
     # Запускаємо Flask сервер
-    app.run(
-        host='0.0.0.0',
-        port=5000,
-        debug=True,
-        use_reloader=False  # Щоб worker не запустився двічі
-    )
+    try:
+        app.run(
+            host='0.0.0.0',
+            port=5000,
+            debug=True,
+            use_reloader=False  # Щоб worker не запустився двічі
+        )
+    finally:
+        event_bus.stop()
 
 # ====================================
 # ПРИКЛАДИ ТЕСТУВАННЯ
@@ -244,6 +397,9 @@ curl http://localhost:5000/logs
 # 4. Health check:
 curl http://localhost:5000/health
 
+# 5. Метрики (глибина черги, затримки, відкинуті події):
+curl http://localhost:5000/metrics
+
 # РЕАЛЬНІ ПРИКЛАДИ WEBHOOK-ІВ:
 # - GitHub: коли хтось робить push в репозиторій
 # - Stripe: коли користувач оплачує
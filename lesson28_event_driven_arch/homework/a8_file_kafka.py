@@ -12,45 +12,373 @@ KAFKA НА ФАЙЛАХ - розуміння log-based storage
 3. Чому Kafka такий швидкий
 """
 
+import bisect
 import json
+import multiprocessing
 import os
+import re
+import struct
+import threading
+import time
+import zlib
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+
+# Топік складається з партицій kafka_data/<topic>-<partition>/, кожна партиція -
+# окремий лог з сегментів: kafka_data/<topic>-<partition>/<base_offset>.log
+# Новий сегмент починається, коли поточний перевищує SEGMENT_BYTES
+SEGMENT_BYTES = 1024 * 1024
+# Розріджений індекс <base_offset>.index: кожне INDEX_INTERVAL-е повідомлення
+# записується як пара (offset відносно сегмента, позиція в байтах)
+INDEX_INTERVAL = 64
+INDEX_ENTRY = struct.Struct(">II")
+# Ширина імені сегмента (як у Kafka: 00000000000000000000.log)
+SEGMENT_NAME_WIDTH = 20
+
+# Коли producer викликає fsync (скидання даних з кешу ОС на диск):
+# never - ніколи (дані в ОС, переживуть падіння процесу, але не ОС),
+# batch - після запису кожної пачки і в flush(), always - після кожного повідомлення
+FSYNC_POLICIES = ("never", "batch", "always")
 
 
 # ====================================
-# FILE-BASED KAFKA PRODUCER
+# СЕГМЕНТОВАНИЙ ЛОГ ТОПІКА
 # ====================================
 
-class FileKafkaProducer:
-    """Producer що пише повідомлення в файл"""
+class SegmentedTopicLog:
+    """
+    Append-only лог топіка з сегментів та розрідженого індексу offset -> байт.
+
+    Читання з offset-у: бінарний пошук сегмента за base offset, потім
+    бінарний пошук в індексі сегмента, seek() на знайдену позицію і
+    пропуск не більше INDEX_INTERVAL рядків. Вартість не залежить від
+    кількості повідомлень в топіку.
+    """
 
-    def __init__(self, topic: str, data_dir: str = "kafka_data"):
+    def __init__(self, topic: str, data_dir: str = "kafka_data", segment_bytes: int = SEGMENT_BYTES):
         self.topic = topic
-        self.data_dir = data_dir
-        self.topic_file = os.path.join(data_dir, f"{topic}.log")
+        self.topic_dir = os.path.join(data_dir, topic)
+        self.segment_bytes = segment_bytes
+        self.created = not os.path.isdir(self.topic_dir)
+        os.makedirs(self.topic_dir, exist_ok=True)
+        if self.created:
+            # Порожній перший сегмент: партиція існує, навіть якщо в неї ще не писали
+            open(self._path(0, ".log"), 'ab').close()
+
+        self.base_offsets: List[int] = []
+        # Кеш індексів: base offset -> (відносні offset-и, позиції)
+        self._indexes: Dict[int, Tuple[List[int], List[int]]] = {}
+        self._refresh_segments()
+
+        # Стан запису (ініціалізується при першому append)
+        self._writer = None
+        self._index_writer = None
+        self._next_offset: Optional[int] = None
+        self._segment_size = 0
+
+    def _path(self, base_offset: int, suffix: str) -> str:
+        return os.path.join(self.topic_dir, f"{base_offset:0{SEGMENT_NAME_WIDTH}d}{suffix}")
+
+    def _refresh_segments(self):
+        """Перечитати список сегментів (інший процес міг додати новий)"""
+        self.base_offsets = sorted(
+            int(name[:-4]) for name in os.listdir(self.topic_dir) if name.endswith(".log")
+        )
+        if not self.base_offsets:
+            self.base_offsets = [0]
+        # Індекс останнього (активного) сегмента міг дописатися
+        self._indexes.pop(self.base_offsets[-1], None)
+
+    def _load_index(self, base_offset: int) -> Tuple[List[int], List[int]]:
+        if base_offset not in self._indexes:
+            offsets, positions = [0], [0]
+            path = self._path(base_offset, ".index")
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    data = f.read()
+                data = data[:len(data) - len(data) % INDEX_ENTRY.size]
+                for relative, position in INDEX_ENTRY.iter_unpack(data):
+                    if relative:
+                        offsets.append(relative)
+                        positions.append(position)
+            self._indexes[base_offset] = (offsets, positions)
+        return self._indexes[base_offset]
+
+    def _segment_for(self, offset: int) -> int:
+        """Base offset сегмента, в якому лежить offset"""
+        if offset >= self.base_offsets[-1]:
+            self._refresh_segments()
+        return self.base_offsets[bisect.bisect_right(self.base_offsets, offset) - 1]
+
+    def _seek(self, f, base_offset: int, offset: int) -> int:
+        """Переставити файл сегмента на offset; повертає offset поточного рядка"""
+        offsets, positions = self._load_index(base_offset)
+        i = bisect.bisect_right(offsets, offset - base_offset) - 1
+        f.seek(positions[i])
+        current = base_offset + offsets[i]
+        while current < offset:
+            line = f.readline()
+            if not line.endswith(b'\n'):
+                break
+            current += 1
+        return current
+
+    def read(self, offset: int, max_messages: int) -> List[bytes]:
+        """Прочитати до max_messages сирих записів, починаючи з offset"""
+        lines: List[bytes] = []
+        while len(lines) < max_messages:
+            base_offset = self._segment_for(offset)
+            path = self._path(base_offset, ".log")
+            if not os.path.exists(path):
+                break
+            with open(path, 'rb') as f:
+                if self._seek(f, base_offset, offset) < offset:
+                    break
+                while len(lines) < max_messages:
+                    line = f.readline()
+                    # Рядок без \n ще дописується producer-ом - прочитаємо пізніше
+                    if not line.endswith(b'\n'):
+                        break
+                    lines.append(line)
+                    offset += 1
+            # Далі - або наступний сегмент, або кінець логу
+            following = bisect.bisect_right(self.base_offsets, base_offset)
+            if following == len(self.base_offsets) or self.base_offsets[following] != offset:
+                break
+        return lines
+
+    def end_offset(self) -> int:
+        """Offset, який отримає наступне повідомлення (= кількість повідомлень)"""
+        if self._next_offset is not None:
+            return self._next_offset
+        self._refresh_segments()
+        base_offset = self.base_offsets[-1]
+        path = self._path(base_offset, ".log")
+        if not os.path.exists(path):
+            return base_offset
+        with open(path, 'rb') as f:
+            return self._seek(f, base_offset, float("inf"))
+
+    def append(self, line: bytes) -> int:
+        """Дописати запис (рядок з \n) у кінець логу; повертає його offset"""
+        if self._next_offset is None:
+            self._open_writer()
+        elif self._segment_size >= self.segment_bytes:
+            self._roll_segment()
+
+        offset = self._next_offset
+        relative = offset - self.base_offsets[-1]
+        if relative and relative % INDEX_INTERVAL == 0:
+            self._index_writer.write(INDEX_ENTRY.pack(relative, self._segment_size))
+            self._indexes.pop(self.base_offsets[-1], None)
+
+        self._writer.write(line)
+        self._segment_size += len(line)
+        self._next_offset += 1
+        return offset
+
+    def next_offset(self) -> int:
+        """Offset, який отримає наступний append()"""
+        if self._next_offset is None:
+            self._open_writer()
+        return self._next_offset
+
+    def flush(self, fsync: bool = False):
+        """Скинути буфери запису в ОС (і на диск, якщо fsync=True)"""
+        if self._writer:
+            self._index_writer.flush()
+            self._writer.flush()
+            if fsync:
+                os.fsync(self._index_writer.fileno())
+                os.fsync(self._writer.fileno())
+
+    def _open_writer(self):
+        self._next_offset = self.end_offset()
+        base_offset = self.base_offsets[-1]
+        path = self._path(base_offset, ".log")
+        self._writer = open(path, 'ab')
+        self._index_writer = open(self._path(base_offset, ".index"), 'ab')
+        self._segment_size = os.path.getsize(path)
+
+    def _roll_segment(self):
+        # Заповнений сегмент більше не змінюється - фіксуємо його на диску
+        self.flush(fsync=True)
+        self._close_files()
+        self.base_offsets.append(self._next_offset)
+        self._writer = open(self._path(self._next_offset, ".log"), 'ab')
+        self._index_writer = open(self._path(self._next_offset, ".index"), 'ab')
+        self._segment_size = 0
+
+    def _close_files(self):
+        if self._writer:
+            self._writer.close()
+            self._index_writer.close()
+            self._writer = None
+            self._index_writer = None
+
+    def close(self):
+        self._close_files()
+        self._next_offset = None
+
+
+# ====================================
+# ПАРТИЦІЇ
+# ====================================
+
+def partition_dir_name(topic: str, partition: int) -> str:
+    """Назва директорії партиції, як у Kafka: orders-0, orders-1, ..."""
+    return f"{topic}-{partition}"
+
+
+def topic_partitions(topic: str, data_dir: str = "kafka_data") -> int:
+    """Кількість партицій існуючого топіка (0 - топіка немає)"""
+    if not os.path.isdir(data_dir):
+        return 0
+    pattern = re.compile(rf"{re.escape(topic)}-(\d+)")
+    return sum(1 for name in os.listdir(data_dir)
+               if pattern.fullmatch(name) and os.path.isdir(os.path.join(data_dir, name)))
 
-        # Створюємо директорію якщо не існує
-        os.makedirs(data_dir, exist_ok=True)
 
-        # Якщо файл не існує - створюємо
-        if not os.path.exists(self.topic_file):
-            with open(self.topic_file, 'w') as f:
-                pass
-            print(f"✅ Topic '{topic}' створено")
+class RecordMetadata(NamedTuple):
+    """Куди записано повідомлення"""
+    partition: int
+    offset: int
 
-    def send(self, message: dict):
-        """Відправити повідомлення (append в кінець файлу)"""
+
+# ====================================
+# FILE-BASED KAFKA PRODUCER
+# ====================================
+
+class FileKafkaProducer:
+    """
+    Producer що пише повідомлення в партиції топіка.
+
+    Партиція обирається за хешем ключа (повідомлення з однаковим ключем
+    потрапляють в одну партицію і читаються в порядку запису), без ключа -
+    по колу. Файли сегментів відкриті весь час роботи producer-а.
+    Повідомлення накопичуються в пам'яті і записуються пачкою, коли їх стає
+    batch_size або коли з першого повідомлення в пачці минуло linger_ms
+    мілісекунд (таймер у фоні). Після flush() усі надіслані повідомлення
+    записані в лог і, для fsync_policy "batch"/"always", збережені на диск.
+    """
+
+    def __init__(self, topic: str, data_dir: str = "kafka_data", segment_bytes: int = SEGMENT_BYTES,
+                 batch_size: int = 1, linger_ms: float = 0, fsync_policy: str = "never",
+                 partitions: Optional[int] = None):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"fsync_policy має бути одним з {FSYNC_POLICIES}")
+        if batch_size < 1:
+            raise ValueError("batch_size має бути додатним")
+
+        existing = topic_partitions(topic, data_dir)
+        if partitions is None:
+            partitions = existing or 1
+        elif existing and existing != partitions:
+            raise ValueError(f"Topic '{topic}' вже має {existing} партицій, а не {partitions}")
+        if partitions < 1:
+            raise ValueError("partitions має бути додатним")
+
+        self.topic = topic
+        self.data_dir = data_dir
+        self.partitions = partitions
+        self.logs = [SegmentedTopicLog(partition_dir_name(topic, partition), data_dir, segment_bytes)
+                     for partition in range(partitions)]
+        # "always" - кожне повідомлення окремою пачкою з fsync
+        self.batch_size = 1 if fsync_policy == "always" else batch_size
+        self.linger_ms = linger_ms
+        self.fsync_policy = fsync_policy
+
+        self._buffers: List[List[bytes]] = [[] for _ in range(partitions)]
+        self._buffered = 0
+        self._next_partition = 0
+        self._lock = threading.Lock()
+        self._linger_timer: Optional[threading.Timer] = None
+
+        if not existing:
+            print(f"✅ Topic '{topic}' створено (партицій: {partitions})")
+
+    @staticmethod
+    def _encode(message: dict, key=None) -> bytes:
         record = {
             "timestamp": datetime.now().isoformat(),
+            "key": key,
             "message": message
         }
-
-        # Дописуємо в кінець файлу (append-only)
-        with open(self.topic_file, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(record, ensure_ascii=False) + '\n')
-
-        print(f"📤 Producer -> {self.topic}: {message}")
+        return (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+
+    def partition_for(self, key=None) -> int:
+        """Партиція для ключа: стабільний хеш (crc32), без ключа - по колу"""
+        if key is None:
+            partition = self._next_partition
+            self._next_partition = (partition + 1) % self.partitions
+            return partition
+        return zlib.crc32(str(key).encode('utf-8')) % self.partitions
+
+    def send(self, message: dict, key=None) -> RecordMetadata:
+        """Відправити повідомлення (append в кінець партиції)"""
+        with self._lock:
+            metadata = self._enqueue(self.partition_for(key), self._encode(message, key))
+            self._maybe_write()
+        print(f"📤 Producer -> {self.topic}[{metadata.partition}]: {message}")
+        return metadata
+
+    def send_batch(self, messages: List[dict], keys: Optional[List] = None) -> List[RecordMetadata]:
+        """Відправити кілька повідомлень (keys - ключ для кожного повідомлення)"""
+        if keys is not None and len(keys) != len(messages):
+            raise ValueError("Кількість ключів не збігається з кількістю повідомлень")
+        keys = keys if keys is not None else [None] * len(messages)
+        with self._lock:
+            result = [self._enqueue(self.partition_for(key), self._encode(message, key))
+                      for message, key in zip(messages, keys)]
+            self._maybe_write()
+        print(f"📤 Producer -> {self.topic}: {len(messages)} повідомлень")
+        return result
+
+    def _enqueue(self, partition: int, line: bytes) -> RecordMetadata:
+        """Додати запис у буфер партиції (викликається під self._lock)"""
+        buffer = self._buffers[partition]
+        offset = self.logs[partition].next_offset() + len(buffer)
+        buffer.append(line)
+        self._buffered += 1
+        return RecordMetadata(partition, offset)
+
+    def _maybe_write(self):
+        """Записати пачку, якщо вона заповнилась, інакше - запустити таймер linger"""
+        if self._buffered >= self.batch_size or self.linger_ms <= 0:
+            self._write_buffers(fsync=self.fsync_policy != "never")
+        elif self._linger_timer is None:
+            self._linger_timer = threading.Timer(self.linger_ms / 1000, self._linger_flush)
+            self._linger_timer.daemon = True
+            self._linger_timer.start()
+
+    def _linger_flush(self):
+        with self._lock:
+            self._linger_timer = None
+            self._write_buffers(fsync=self.fsync_policy != "never")
+
+    def _write_buffers(self, fsync: bool):
+        """Записати буфери партицій в лог (викликається під self._lock)"""
+        if self._linger_timer is not None:
+            self._linger_timer.cancel()
+            self._linger_timer = None
+        for log, buffer in zip(self.logs, self._buffers):
+            if buffer:
+                for line in buffer:
+                    log.append(line)
+                buffer.clear()
+                log.flush(fsync=fsync)
+        self._buffered = 0
+
+    def flush(self):
+        """Записати всі надіслані повідомлення (з fsync згідно з fsync_policy)"""
+        with self._lock:
+            self._write_buffers(fsync=self.fsync_policy != "never")
+
+    def close(self):
+        self.flush()
+        for log in self.logs:
+            log.close()
 
 
 # ====================================
@@ -58,18 +386,37 @@ class FileKafkaProducer:
 # ====================================
 
 class FileKafkaConsumer:
-    """Consumer що читає з певного offset-у"""
-
-    def __init__(self, topic: str, consumer_id: str, data_dir: str = "kafka_data"):
+    """
+    Consumer що читає одну партицію топіка з певного offset-у.
+
+    Offset зберігається у файл не після кожного poll(), а пачками: як у Kafka
+    з auto commit, poll() вважає обробленими записи попереднього poll() і
+    зберігає їхній offset, коли з останнього commit-у їх набралось
+    commit_every; а також в commit() / close(). Після аварійного завершення
+    частина повідомлень буде прочитана повторно (at-least-once).
+    """
+
+    def __init__(self, topic: str, consumer_id: str, data_dir: str = "kafka_data",
+                 commit_every: int = 100, partition: int = 0,
+                 offset_file: Optional[str] = None, verbose: bool = True):
         self.topic = topic
         self.consumer_id = consumer_id
         self.data_dir = data_dir
-        self.topic_file = os.path.join(data_dir, f"{topic}.log")
-        self.offset_file = os.path.join(data_dir, f"{consumer_id}_offset.txt")
+        self.partition = partition
+        self.log = SegmentedTopicLog(partition_dir_name(topic, partition), data_dir)
+        if offset_file is None:
+            suffix = "" if partition == 0 else f"_{partition}"
+            offset_file = os.path.join(data_dir, f"{consumer_id}{suffix}_offset.txt")
+        self.offset_file = offset_file
+        self.commit_every = commit_every
+        self.verbose = verbose
 
         # Завантажуємо поточний offset
         self.current_offset = self._load_offset()
-        print(f"✅ Consumer '{consumer_id}' підключився до '{topic}' (offset: {self.current_offset})")
+        self.committed_offset = self.current_offset
+        if verbose:
+            print(f"✅ Consumer '{consumer_id}' підключився до '{topic}[{partition}]' "
+                  f"(offset: {self.current_offset})")
 
     def _load_offset(self) -> int:
         """Завантажити збережений offset"""
@@ -79,49 +426,53 @@ class FileKafkaConsumer:
         return 0
 
     def _save_offset(self):
-        """Зберегти поточний offset"""
-        with open(self.offset_file, 'w') as f:
+        """Зберегти поточний offset (атомарно: тимчасовий файл + rename)"""
+        tmp_file = self.offset_file + ".tmp"
+        with open(tmp_file, 'w') as f:
             f.write(str(self.current_offset))
+        os.replace(tmp_file, self.offset_file)
+        self.committed_offset = self.current_offset
+
+    def commit(self):
+        """Зберегти offset, якщо він змінився з останнього commit-у"""
+        if self.current_offset != self.committed_offset:
+            self._save_offset()
 
     def poll(self, max_messages: int = 10) -> List[Dict]:
         """
         Прочитати нові повідомлення з offset-у
 
         Це як Kafka's consumer.poll():
-        - Читає тільки нові повідомлення
-        - Оновлює offset
+        - Читає тільки нові повідомлення (seek за індексом, без перечитування)
+        - Оновлює offset, зберігає його пачками
         """
-        messages = []
-
-        if not os.path.exists(self.topic_file):
-            return messages
-
-        with open(self.topic_file, 'r', encoding='utf-8') as f:
-            # Пропускаємо рядки до current_offset
-            for _ in range(self.current_offset):
-                f.readline()
-
-            # Читаємо нові повідомлення
-            for _ in range(max_messages):
-                line = f.readline()
-                if not line:
-                    break
-
-                try:
-                    record = json.loads(line.strip())
-                    messages.append(record)
-                    self.current_offset += 1
-                except json.JSONDecodeError:
-                    continue
-
-        # Зберігаємо новий offset
-        self._save_offset()
-
-        if messages:
+        return [message for _, message in self.poll_with_offsets(max_messages)]
+
+    def poll_with_offsets(self, max_messages: int = 10) -> List[Tuple[int, Dict]]:
+        """poll(), що повертає пари (offset, повідомлення)"""
+        # Записи попереднього poll() вже оброблені - зберігаємо їхній offset
+        # до читання нової пачки (нова пачка ще не оброблена)
+        if self.current_offset - self.committed_offset >= self.commit_every:
+            self._save_offset()
+
+        records = []
+        for line in self.log.read(self.current_offset, max_messages):
+            offset = self.current_offset
+            self.current_offset += 1
+            try:
+                records.append((offset, json.loads(line)))
+            except json.JSONDecodeError:
+                continue
+
+        if records and self.verbose:
             print(
-                f"📥 Consumer '{self.consumer_id}' прочитав {len(messages)} повідомлень (новий offset: {self.current_offset})")
+                f"📥 Consumer '{self.consumer_id}' прочитав {len(records)} повідомлень (новий offset: {self.current_offset})")
+
+        return records
 
-        return messages
+    def seek(self, offset: int):
+        """Перейти до offset-у без commit-у (наступний poll() почне з нього)"""
+        self.current_offset = offset
 
     def reset_offset(self, offset: int = 0):
         """Скинути offset (для replay)"""
@@ -130,18 +481,169 @@ class FileKafkaConsumer:
         print(f"🔄 Consumer '{self.consumer_id}' offset скинуто на {offset}")
 
     def get_total_messages(self) -> int:
-        """Скільки всього повідомлень в топіку"""
-        if not os.path.exists(self.topic_file):
-            return 0
+        """Скільки всього повідомлень в партиції"""
+        return self.log.end_offset()
+
+    def close(self):
+        """Зберегти offset перед завершенням"""
+        self.commit()
+
+
+# ====================================
+# CONSUMER GROUP
+# ====================================
+
+def assign_partitions(partitions: int, members: int) -> List[List[int]]:
+    """Round-robin розподіл: учасник i отримує партиції i, i + members, ..."""
+    return [list(range(member, partitions, members)) for member in range(members)]
+
+
+class FileKafkaConsumerGroup:
+    """
+    Група consumer-ів: кожна партиція топіка належить рівно одному учаснику.
+
+    Учасники працюють в окремих процесах (multiprocessing), тому обробка
+    масштабується на кількість ядер. Offset-и групи зберігаються окремо для
+    кожної партиції: kafka_data/groups/<group_id>/<topic>-<partition>.offset,
+    тож наступний запуск групи (з будь-якою кількістю учасників) продовжить
+    з місця, де зупинився попередній. Розподіл партицій статичний
+    (assign_partitions) і визначається при створенні групи.
+    """
 
-        with open(self.topic_file, 'r') as f:
-            return sum(1 for _ in f)
+    def __init__(self, topic: str, group_id: str, members: int, data_dir: str = "kafka_data",
+                 commit_every: int = 100):
+        partitions = topic_partitions(topic, data_dir)
+        if partitions == 0:
+            raise ValueError(f"Topic '{topic}' не знайдено в {data_dir}")
+        if members < 1:
+            raise ValueError("members має бути додатним")
+
+        self.topic = topic
+        self.group_id = group_id
+        self.data_dir = data_dir
+        self.commit_every = commit_every
+        self.partitions = partitions
+        self.assignment = assign_partitions(partitions, members)
+        self.offsets_dir = os.path.join(data_dir, "groups", group_id)
+        os.makedirs(self.offsets_dir, exist_ok=True)
+
+    def create_consumers(self, member: int) -> List[FileKafkaConsumer]:
+        """Consumer-и для партицій, що належать учаснику member"""
+        return [
+            FileKafkaConsumer(
+                self.topic, f"{self.group_id}-{member}", self.data_dir, self.commit_every,
+                partition=partition,
+                offset_file=os.path.join(self.offsets_dir, f"{partition_dir_name(self.topic, partition)}.offset"),
+                verbose=False,
+            )
+            for partition in self.assignment[member]
+        ]
+
+    def run(self, handler: Callable[[Dict], None], max_messages: int = 500,
+            processes: bool = True) -> List[int]:
+        """
+        Прочитати всі нові повідомлення топіка силами групи.
+
+        Args:
+            handler: Обробник одного запису; для processes=True має бути
+                функцією рівня модуля (передається в інший процес)
+            max_messages: Скільки повідомлень читати з партиції за один poll
+            processes: False - учасники виконуються по черзі в поточному процесі
+
+        Returns:
+            Кількість оброблених повідомлень для кожного учасника
+
+        Raises:
+            RuntimeError: handler впав в одному з процесів учасників (при
+                processes=False виняток handler-а передається як є). Offset
+                партиції зберігається до запису, на якому впав handler, тож
+                наступний run() почне з нього.
+        """
+        members = len(self.assignment)
+        if not processes:
+            return [_consume_member(self, member, handler, max_messages) for member in range(members)]
+
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(target=_run_member, args=(self, member, handler, max_messages, results))
+            for member in range(members)
+        ]
+        for worker in workers:
+            worker.start()
+        counts = [0] * members
+        errors = []
+        for _ in workers:
+            member, count, error = results.get()
+            counts[member] = count
+            if error is not None:
+                errors.append(f"учасник {member}: {error}")
+        for worker in workers:
+            worker.join()
+        if errors:
+            raise RuntimeError(f"Consumer group '{self.group_id}' не обробила всі повідомлення: "
+                               + "; ".join(errors))
+        return counts
+
+    def lag(self) -> Dict[int, int]:
+        """Скільки повідомлень ще не прочитано групою в кожній партиції"""
+        lag = {}
+        for member in range(len(self.assignment)):
+            for consumer in self.create_consumers(member):
+                lag[consumer.partition] = consumer.get_total_messages() - consumer.current_offset
+        return dict(sorted(lag.items()))
+
+
+def _consume_member(group: FileKafkaConsumerGroup, member: int, handler: Callable[[Dict], None],
+                    max_messages: int) -> int:
+    """Учасник групи: читає свої партиції по колу, поки є нові повідомлення"""
+    consumers = group.create_consumers(member)
+    processed = 0
+    try:
+        while True:
+            polled = 0
+            for consumer in consumers:
+                records = consumer.poll_with_offsets(max_messages)
+                for offset, record in records:
+                    try:
+                        handler(record)
+                    except Exception:
+                        # Комітимо лише оброблені записи: наступний запуск
+                        # групи почне з запису, на якому впав handler
+                        consumer.seek(offset)
+                        raise
+                    processed += 1
+                polled += len(records)
+            if not polled:
+                break
+    finally:
+        for consumer in consumers:
+            consumer.close()
+    return processed
+
+
+def _run_member(group: FileKafkaConsumerGroup, member: int, handler: Callable[[Dict], None],
+                max_messages: int, results):
+    """Точка входу процесу учасника групи"""
+    processed, error = 0, "процес учасника завершився аварійно"
+    try:
+        processed = _consume_member(group, member, handler, max_messages)
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        # Відповідь потрібна навіть при помилці, інакше run() чекатиме вічно
+        results.put((member, processed, error))
 
 
 # ====================================
 # ДЕМОНСТРАЦІЯ
 # ====================================
 
+def process_payment(record: Dict):
+    """Обробник для consumer group (рівня модуля - передається в процеси)"""
+    print(f"  💳 [pid {os.getpid()}] Платіж користувача {record['key']}: {record['message']}", flush=True)
+
+
 if __name__ == "__main__":
     print("=" * 60)
     print("FILE-BASED KAFKA - Log Storage Demo")
@@ -189,8 +691,11 @@ if __name__ == "__main__":
     print("📤 PRODUCER: Додаємо ще повідомлення")
     print("=" * 60 + "\n")
 
-    producer.send({"order_id": 6, "amount": 600})
-    producer.send({"order_id": 7, "amount": 700})
+    # Пачка повідомлень - один запис у файл замість двох
+    producer.send_batch([
+        {"order_id": 6, "amount": 600},
+        {"order_id": 7, "amount": 700},
+    ])
 
     # ====================================
     # СЦЕНАРІЙ 4: Consumer 1 читає нові
@@ -235,6 +740,26 @@ if __name__ == "__main__":
     for msg in messages:
         print(f"  ✅ {msg['message']}")
 
+    # ====================================
+    # СЦЕНАРІЙ 7: Партиції та consumer group
+    # ====================================
+
+    print("\n" + "=" * 60)
+    print("👥 CONSUMER GROUP: 3 партиції, 2 учасники в окремих процесах")
+    print("=" * 60 + "\n")
+
+    payments = FileKafkaProducer("payments", partitions=3)
+    for payment_id in range(1, 9):
+        user = f"user_{payment_id % 4}"
+        # Ключ = користувач: всі його платежі в одній партиції, по порядку
+        payments.send({"payment_id": payment_id, "amount": payment_id * 100}, key=user)
+    payments.close()
+
+    group = FileKafkaConsumerGroup("payments", "billing", members=2)
+    print(f"\nРозподіл партицій: {group.assignment}")
+    counts = group.run(process_payment)
+    print(f"Оброблено учасниками: {counts}, залишок (lag): {group.lag()}")
+
     # ====================================
     # СТАТИСТИКА
     # ====================================
@@ -246,6 +771,11 @@ if __name__ == "__main__":
     print(f"Consumer 1 offset: {consumer1.current_offset}")
     print(f"Consumer 2 offset: {consumer2.current_offset}")
 
+    # Зберігаємо offset-и, які ще не встигли закомітитися пачкою
+    consumer1.close()
+    consumer2.close()
+    producer.close()
+
     # ====================================
     # ВИСНОВКИ
     # ====================================
@@ -265,5 +795,6 @@ if __name__ == "__main__":
     print("   - Consumer group координує offset між consumer-ами")
     print("   - Це дає величезну швидкість (10M+ msg/sec)")
 
-    print("\n🔥 Файл з повідомленнями: kafka_data/orders.log")
-    print("🔥 Offset consumer-ів: kafka_data/*_offset.txt")
\ No newline at end of file
+    print("\n🔥 Сегменти з повідомленнями: kafka_data/orders-0/*.log (+ індекси *.index)")
+    print("🔥 Offset consumer-ів: kafka_data/*_offset.txt")
+    print("🔥 Offset-и групи: kafka_data/groups/billing/*.offset")
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""
+ASYNC EVENTBUS - EventBus для asyncio
+
+Той самий API, що й у a1_eventbus_basic.EventBus (subscribe / unsubscribe /
+wildcard-підписки / лог подій), але emit() - корутина:
+    - async listener-и виконуються одночасно в asyncio.TaskGroup;
+    - звичайні (sync) listener-и виконуються в потоці через asyncio.to_thread,
+      щоб не блокувати event loop;
+    - кожен listener обмежений listener_timeout секунд.
+
+Підходить для aiohttp / FastAPI сервісів: emit_nowait() публікує подію у фоні
+і одразу повертає керування обробнику запиту.
+"""
+
+import asyncio
+import inspect
+import time
+from typing import Callable, Optional, Set
+
+from a1_eventbus_basic import EventBus
+
+
+class AsyncEventBus(EventBus):
+    """EventBus з конкурентним викликом async та sync listener-ів"""
+
+    def __init__(self, listener_timeout: Optional[float] = 5.0,
+                 log_capacity: int = 10_000, log_spill_path: Optional[str] = None):
+        super().__init__(log_capacity, log_spill_path)
+        self.listener_timeout = listener_timeout  # None - без обмеження
+        self._background: Set[asyncio.Task] = set()
+
+    async def emit(self, event_name: str, data: dict = None):
+        """Випустити подію і дочекатися всіх listener-ів"""
+        self.event_log.append(event_name, data)
+        print(f"\n🔔 Подія: {event_name} | Дані: {data}")
+
+        callbacks = list(self.listeners.get(event_name, ()))
+        for pattern in self._wildcard_patterns(event_name):
+            callbacks.extend(self.listeners[pattern])
+
+        # Помилки та таймаути обробляються в _safe_call_async,
+        # тому один listener не скасовує решту задач групи
+        async with asyncio.TaskGroup() as group:
+            for callback in callbacks:
+                group.create_task(self._safe_call_async(callback, data))
+
+    def emit_nowait(self, event_name: str, data: dict = None) -> asyncio.Task:
+        """Випустити подію у фоні (не чекаючи listener-ів)"""
+        task = asyncio.create_task(self.emit(event_name, data))
+        # Тримаємо посилання на задачу, щоб її не прибрав збирач сміття
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+
+    async def wait_pending(self):
+        """Дочекатися всіх подій, випущених через emit_nowait()"""
+        while self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+
+    async def _safe_call_async(self, callback: Callable, data):
+        name = getattr(callback, "__name__", repr(callback))
+        try:
+            async with asyncio.timeout(self.listener_timeout):
+                if inspect.iscoroutinefunction(callback):
+                    await callback(data)
+                else:
+                    # Потік не можна перервати: по таймауту ми лише перестаємо чекати
+                    await asyncio.to_thread(callback, data)
+        except TimeoutError:
+            print(f"⏱️ Таймаут {self.listener_timeout} с у {name}")
+        except Exception as e:
+            print(f"❗ Помилка в {name}: {e}")
+
+
+# ==============================================
+# ПРИКЛАД ВИКОРИСТАННЯ
+# ==============================================
+if __name__ == "__main__":
+    async def send_email(data):
+        await asyncio.sleep(0.5)  # Імітація запиту до SMTP
+        print(f"  📧 Email: Вітаємо користувача {data.get('user_id')}!")
+
+
+    async def push_notification(data):
+        await asyncio.sleep(0.5)
+        print(f"  📱 Push: Нове повідомлення для {data.get('user_id')}")
+
+
+    def save_to_db(data):
+        time.sleep(0.5)  # Блокуючий код - виконується в окремому потоці
+        print(f"  💾 DB: Збережено {data}")
+
+
+    async def slow_listener(data):
+        await asyncio.sleep(10)
+
+
+    async def buggy_listener(data):
+        raise ValueError("Ой! Щось пішло не так!")
+
+
+    async def main():
+        bus = AsyncEventBus(listener_timeout=1.0)
+        bus.subscribe("user.registered", send_email)
+        bus.subscribe("user.registered", push_notification)
+        bus.subscribe("user.registered", save_to_db)
+        bus.subscribe("user.*", slow_listener)  # Буде перервано по таймауту
+        bus.subscribe("user.*", buggy_listener)
+
+        start = time.perf_counter()
+        await bus.emit("user.registered", {"user_id": 123})
+        # Три listener-и по 0.5 с + таймаут 1 с виконуються одночасно: ~1 с, а не 11.5 с
+        print(f"\n⏱️ emit() зайняв {time.perf_counter() - start:.2f} с")
+
+        bus.emit_nowait("user.deleted", {"user_id": 456})
+        print("📤 Подію user.deleted випущено у фоні")
+        await bus.wait_pending()
+
+        bus.print_logs()
+
+
+    asyncio.run(main())
@@ -0,0 +1,168 @@
+"""
+Бенчмарк EventBusWithQueue: початковий worker проти пулу worker-ів з пачками.
+
+Базовий рівень - LegacyEventBusWithQueue, копія початкової версії
+EventBusWithQueue: один потік, get(timeout=1) на кожну подію, необмежена
+черга та журнал подій у списку.
+
+Для кожного сценарію (I/O-bound listener - time.sleep, CPU-bound listener -
+обчислення в циклі) публікує --events подій з --names різними назвами і
+вимірює пропускну здатність (подій/с) та затримку від emit() до обробки.
+Заодно перевіряє, що події з однаковою назвою оброблені в порядку emit().
+
+CPU-bound listener-и виконуються під GIL, тому пул потоків для них не дає
+прискорення - це очікуваний результат.
+
+Запуск:
+    python benchmark_event_queue.py
+    python benchmark_event_queue.py --events 5000 --workers 8 --batch-size 32
+"""
+
+import argparse
+import contextlib
+import os
+import queue
+import statistics
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+from a4_event_queue import EventBusWithQueue
+
+
+class LegacyEventBusWithQueue:
+    """Початкова версія EventBusWithQueue (до пулу worker-ів)"""
+
+    def __init__(self):
+        self.listeners = {}
+        self.event_log = []
+        self.event_queue = queue.Queue()
+        self.running = True
+
+    def subscribe(self, event_name, callback):
+        if event_name not in self.listeners:
+            self.listeners[event_name] = []
+        self.listeners[event_name].append(callback)
+        print(f"✅ Підписка: {callback.__name__} -> {event_name}")
+
+    def emit(self, event_name, data=None):
+        event = {
+            "timestamp": datetime.now().isoformat(),
+            "name": event_name,
+            "data": data
+        }
+        self.event_queue.put(event)
+        print(f"➕ Подія додана в чергу: {event_name}")
+
+    def process_event(self, event):
+        event_name = event["name"]
+        data = event["data"]
+        self.event_log.append(event)
+        print(f"\n🔔 Обробка події: {event_name} | {data}")
+        if event_name in self.listeners:
+            for callback in self.listeners[event_name]:
+                try:
+                    callback(data)
+                except Exception as e:
+                    print(f"❗ Помилка в {callback.__name__}: {e}")
+
+    def worker(self):
+        print("🚀 Worker запущено")
+        while self.running:
+            try:
+                event = self.event_queue.get(timeout=1)
+                self.process_event(event)
+                self.event_queue.task_done()
+            except queue.Empty:
+                continue
+            except Exception as e:
+                print(f"❗ Критична помилка в worker: {e}")
+        print("🛑 Worker зупинено")
+
+    def start_worker(self):
+        worker_thread = threading.Thread(target=self.worker, daemon=True)
+        worker_thread.start()
+        return worker_thread
+
+    def stop(self):
+        # У початковій версії running скидався до join(): worker міг вийти,
+        # не дообробивши чергу, і join() зависав. Для бенчмарку - навпаки
+        self.event_queue.join()
+        self.running = False
+
+
+def io_listener(data):
+    time.sleep(0.001)  # Імітація запиту до мережі / бази
+
+
+def cpu_listener(data):
+    total = 0
+    for i in range(2_000):
+        total += i * i
+    return total
+
+
+def run(listener, events, names, make_bus):
+    """Один прогін: повертає (подій/с, p50 мс, p95 мс, чи збережено порядок)"""
+    latencies = []
+    last_seen = defaultdict(lambda: -1)
+    ordered = [True]
+    lock = threading.Lock()
+
+    def measure(data):
+        listener(data)
+        with lock:
+            latencies.append(time.perf_counter() - data["sent"])
+            if data["seq"] < last_seen[data["name"]]:
+                ordered[0] = False
+            last_seen[data["name"]] = data["seq"]
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        bus = make_bus()
+        for n in range(names):
+            bus.subscribe(f"event.{n}", measure)
+        bus.start_worker()
+
+        start = time.perf_counter()
+        for seq in range(events):
+            name = f"event.{seq % names}"
+            bus.emit(name, {"name": name, "seq": seq, "sent": time.perf_counter()})
+        bus.stop()
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    return events / elapsed, statistics.median(latencies) * 1000, p95 * 1000, ordered[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк пулу worker-ів EventBusWithQueue")
+    parser.add_argument("--events", type=int, default=2_000)
+    parser.add_argument("--names", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--max-queue-size", type=int, default=1_000)
+    args = parser.parse_args()
+
+    configs = [
+        ("початкова версія", LegacyEventBusWithQueue),
+        ("1 worker, без пачок", lambda: EventBusWithQueue(workers=1, batch_size=1)),
+        (f"{args.workers} worker-ів, пачка {args.batch_size}",
+         lambda: EventBusWithQueue(workers=args.workers, batch_size=args.batch_size,
+                                   max_queue_size=args.max_queue_size)),
+    ]
+
+    print(f"Подій: {args.events}, назв подій: {args.names}")
+    print(f"\n{'Сценарій':<12}{'Конфігурація':<28}{'подій/с':>10}{'p50, мс':>10}"
+          f"{'p95, мс':>10}{'порядок':>10}")
+    print("-" * 80)
+    for scenario, listener in (("I/O-bound", io_listener), ("CPU-bound", cpu_listener)):
+        for label, make_bus in configs:
+            rate, p50, p95, ordered = run(listener, args.events, args.names, make_bus)
+            print(f"{scenario:<12}{label:<28}{rate:>10.0f}{p50:>10.1f}{p95:>10.1f}"
+                  f"{'так' if ordered else 'НІ':>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Бенчмарк публікації подій у EventBus з великою кількістю wildcard-підписок.
+
+Порівнює пошук підписок через індекс сегментів (WildcardIndex) з початковим
+варіантом - перебором усіх шаблонів через fnmatch на кожну подію.
+Перебір на 1 000 000 подій займає години, тому для нього вимірюється
+--legacy-events подій, а результат перераховується на повну кількість.
+
+Запуск:
+    python benchmark_eventbus.py
+    python benchmark_eventbus.py --events 100000 --subscriptions 1000
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import os
+import random
+import time
+from typing import List
+
+from a1_eventbus_basic import EventBus
+
+
+class LinearEventBus(EventBus):
+    """EventBus з початковим пошуком: fnmatch для кожного wildcard-шаблону"""
+
+    def _wildcard_patterns(self, event_name: str) -> List[str]:
+        return [pattern for pattern in self.listeners
+                if "*" in pattern and fnmatch.fnmatch(event_name, pattern)]
+
+
+def build_bus(bus: EventBus, subscriptions: int, counter: list) -> EventBus:
+    """Підписує subscriptions обробників на шаблони різного вигляду"""
+
+    def listener(data):
+        counter[0] += 1
+
+    services = max(1, subscriptions // 4)
+    for i in range(subscriptions):
+        kind = i % 4
+        if kind == 0:
+            pattern = f"service{i // 4}.*"
+        elif kind == 1:
+            pattern = f"*.action{i // 4}"
+        elif kind == 2:
+            pattern = f"service{i // 4}.*.deleted"
+        else:
+            pattern = f"service{i // 4}.action{i % services}"
+        bus.subscribe(pattern, listener)
+    return bus
+
+
+def make_events(count: int, subscriptions: int, seed: int = 42) -> List[str]:
+    """Імена подій: частина з двох сегментів, частина з трьох"""
+    rng = random.Random(seed)
+    services = max(1, subscriptions // 4)
+    names = []
+    for _ in range(count):
+        service = rng.randrange(services * 2)  # половина подій без точних підписок
+        action = rng.randrange(services)
+        if rng.random() < 0.2:
+            names.append(f"service{service}.item{action}.deleted")
+        else:
+            names.append(f"service{service}.action{action}")
+    return names
+
+
+def publish(bus: EventBus, events: List[str]) -> float:
+    """Публікує події і повертає час у секундах (вивід emit відкидається)"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        for i, name in enumerate(events):
+            bus.emit(name, {"n": i})
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк wildcard-підписок EventBus")
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--subscriptions", type=int, default=10_000)
+    parser.add_argument("--legacy-events", type=int, default=2_000)
+    args = parser.parse_args()
+
+    events = make_events(args.events, args.subscriptions)
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        indexed_calls, linear_calls = [0], [0]
+        indexed = build_bus(EventBus(), args.subscriptions, indexed_calls)
+        linear = build_bus(LinearEventBus(), args.subscriptions, linear_calls)
+
+    legacy_events = events[:args.legacy_events]
+    linear_time = publish(linear, legacy_events)
+    indexed_sample_time = publish(indexed, legacy_events)
+    assert indexed_calls == linear_calls, "результати пошуку підписок відрізняються"
+
+    indexed_time = publish(indexed, events)
+
+    linear_per_event = linear_time / len(legacy_events)
+    indexed_per_event = indexed_time / len(events)
+    print(f"Підписок: {args.subscriptions}, подій: {args.events}")
+    print(f"Перевірка на {len(legacy_events)} подіях: {linear_calls[0]} викликів обробників, "
+          f"індекс {indexed_sample_time:.2f} с, перебір {linear_time:.2f} с")
+    print(f"\n{'Спосіб':<24}{'мкс/подію':>12}{'усього, с':>14}")
+    print("-" * 50)
+    print(f"{'перебір fnmatch':<24}{linear_per_event * 1e6:>12.1f}"
+          f"{linear_per_event * args.events:>13.1f}*")
+    print(f"{'індекс сегментів':<24}{indexed_per_event * 1e6:>12.1f}{indexed_time:>14.1f}")
+    print(f"\n* оцінка за {len(legacy_events)} подіями; прискорення "
+          f"{linear_per_event / indexed_per_event:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Бенчмарк consumer group файлової Kafka: пропускна здатність залежно від
+кількості учасників (процесів).
+
+Записує --messages повідомлень з ключами в топік з --partitions партиціями
+і читає їх групами з 1, 2, 4, ... учасників з CPU-bound обробником.
+Прискорення обмежене кількістю ядер (os.cpu_count()) та партицій.
+
+Запуск:
+    python benchmark_file_kafka.py
+    python benchmark_file_kafka.py --messages 50000 --partitions 4 --work 5000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+from functools import partial
+
+from a8_file_kafka import FileKafkaConsumerGroup, FileKafkaProducer
+
+
+def cpu_handler(record, work):
+    """Обробник з work ітераціями обчислень на повідомлення"""
+    total = 0
+    for i in range(work):
+        total += i * i
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк consumer group файлової Kafka")
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--partitions", type=int, default=8)
+    parser.add_argument("--work", type=int, default=2_000)
+    args = parser.parse_args()
+    handler = partial(cpu_handler, work=args.work)
+
+    cores = os.cpu_count() or 1
+    member_counts = sorted({1, 2, 4, cores, args.partitions} & set(range(1, args.partitions + 1)))
+
+    with tempfile.TemporaryDirectory() as data_dir, contextlib.redirect_stdout(io.StringIO()):
+        producer = FileKafkaProducer("bench", data_dir, partitions=args.partitions, batch_size=1_000)
+        for start in range(0, args.messages, 10_000):
+            count = min(10_000, args.messages - start)
+            producer.send_batch([{"n": start + i} for i in range(count)],
+                                keys=[f"key_{(start + i) % 1000}" for i in range(count)])
+        producer.close()
+
+        results = []
+        for members in member_counts:
+            # Нова група для кожного прогону - читає топік з початку
+            group = FileKafkaConsumerGroup("bench", f"group_{members}", members, data_dir)
+            start = time.perf_counter()
+            processed = sum(group.run(handler))
+            results.append((members, processed, time.perf_counter() - start))
+
+    print(f"Повідомлень: {args.messages}, партицій: {args.partitions}, ядер: {cores}")
+    print(f"\n{'Учасників':>10}{'повідомлень':>14}{'с':>10}{'повідомлень/с':>16}{'прискорення':>14}")
+    print("-" * 64)
+    base_rate = results[0][1] / results[0][2]
+    for members, processed, elapsed in results:
+        rate = processed / elapsed
+        print(f"{members:>10}{processed:>14}{elapsed:>10.2f}{rate:>16.0f}{rate / base_rate:>13.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Навантажувальний тест SimulatedRabbitMQ: конкуруючі consumer-и однієї черги.
+
+Публікує --messages повідомлень у fanout exchange з двома чергами
+(registration і analytics, як у a6_rabbitmq_simple.py) і для кількох
+конфігурацій consumer-ів / prefetch вимірює пропускну здатність та затримку
+від publish() до обробки. Кожне 10-те повідомлення обробляється в 20 разів
+довше - саме тут work-stealing не дає "повільному" буферу затримати решту.
+Заодно перевіряє, що кожне повідомлення оброблене рівно один раз.
+
+Запуск:
+    python benchmark_rabbitmq.py
+    python benchmark_rabbitmq.py --messages 5000 --consumers 8
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import threading
+import time
+from collections import Counter
+
+from a6_rabbitmq_simple import SimulatedRabbitMQ
+
+
+def run(messages, consumers, prefetch, work):
+    """Один прогін: повертає (повідомлень/с, p50 мс, p95 мс, чи кожне оброблене рівно раз)"""
+    latencies = []
+    seen = Counter()
+    lock = threading.Lock()
+
+    def handler(body):
+        seq, sent = body
+        time.sleep(work * (20 if seq % 10 == 0 else 1))  # Імітація I/O
+        with lock:
+            latencies.append(time.perf_counter() - sent)
+            seen[seq] += 1
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        broker = SimulatedRabbitMQ(verbose=False)
+        broker.create_exchange("user_events", "fanout")
+        broker.bind("registration", "user_events")
+        broker.bind("analytics", "user_events")
+        broker.start_consumers("registration", handler, "registration", consumers, prefetch)
+        broker.start_consumers("analytics", handler, "analytics", consumers, prefetch)
+
+        start = time.perf_counter()
+        for seq in range(messages):
+            broker.publish("user_events", (seq, time.perf_counter()))
+        broker.wait_until_idle()
+        elapsed = time.perf_counter() - start
+        broker.stop()
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    exactly_once = len(seen) == messages and set(seen.values()) == {2}
+    return 2 * messages / elapsed, statistics.median(latencies) * 1000, p95 * 1000, exactly_once
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Навантажувальний тест SimulatedRabbitMQ")
+    parser.add_argument("--messages", type=int, default=2_000)
+    parser.add_argument("--consumers", type=int, default=4)
+    parser.add_argument("--work", type=float, default=0.0005, help="час обробки повідомлення, с")
+    args = parser.parse_args()
+
+    configs = [(1, 1), (args.consumers, 1), (args.consumers, 10), (args.consumers, 50)]
+
+    print(f"Повідомлень: {args.messages} x 2 черги, обробка: {args.work * 1000:.1f} мс "
+          f"(кожне 10-те - x20)")
+    print(f"\n{'consumer-ів':>12}{'prefetch':>10}{'повідомлень/с':>16}{'p50, мс':>10}"
+          f"{'p95, мс':>10}{'рівно раз':>11}")
+    print("-" * 69)
+    for consumers, prefetch in configs:
+        rate, p50, p95, exactly_once = run(args.messages, consumers, prefetch, args.work)
+        print(f"{consumers:>12}{prefetch:>10}{rate:>16.0f}{p50:>10.1f}{p95:>10.1f}"
+              f"{'так' if exactly_once else 'НІ':>11}")
+
+
+if __name__ == "__main__":
+    main()
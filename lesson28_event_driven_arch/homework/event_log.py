@@ -0,0 +1,114 @@
+"""
+EVENT LOG - обмежений лог подій для EventBus
+
+Зберігає лише останні capacity подій (кільцевий буфер на deque), тому
+пам'ять не росте в довготривалому процесі. Кожен запис - компактний
+кортеж з монотонним часом (float) замість dict з ISO-рядком; ISO-час
+обчислюється лише при читанні логу.
+
+Події, що витісняються з буфера, за бажанням дописуються у файл
+(spill_path, JSON Lines) пачками по spill_batch записів. Неповна пачка
+дописується при close() - його викликає stop() шини (або with EventLog(...)).
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+
+class LogRecord(NamedTuple):
+    """Запис логу: монотонний час, назва події, дані"""
+    timestamp: float
+    event: str
+    data: Any
+
+
+class EventLog:
+    """Кільцевий буфер подій з опціональним вивантаженням на диск"""
+
+    def __init__(self, capacity: int = 10_000, spill_path: Optional[str] = None,
+                 spill_batch: int = 1_000):
+        if capacity < 1:
+            raise ValueError("capacity має бути додатним числом")
+
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self.spill_batch = spill_batch
+        self.records = deque(maxlen=capacity)
+        self.total = 0  # Скільки подій записано за весь час (разом з витісненими)
+        self._spill_buffer: List[LogRecord] = []
+        self._lock = threading.Lock()
+
+        # Точка відліку для перетворення монотонного часу в дату
+        self._wall_start = datetime.now()
+        self._monotonic_start = time.monotonic()
+
+    def append(self, event_name: str, data: Any = None) -> LogRecord:
+        """Записати подію"""
+        record = LogRecord(time.monotonic(), event_name, data)
+        with self._lock:
+            if self.spill_path and len(self.records) == self.capacity:
+                self._spill_buffer.append(self.records[0])
+                if len(self._spill_buffer) >= self.spill_batch:
+                    self._flush_spill()
+            self.records.append(record)
+            self.total += 1
+        return record
+
+    def to_datetime(self, timestamp: float) -> datetime:
+        """Монотонний час запису -> дата та час"""
+        return self._wall_start + timedelta(seconds=timestamp - self._monotonic_start)
+
+    def to_dict(self, record: LogRecord) -> Dict:
+        """Запис у форматі старого event_log: {"timestamp", "event", "data"}"""
+        return {
+            "timestamp": self.to_datetime(record.timestamp).isoformat(),
+            "event": record.event,
+            "data": record.data
+        }
+
+    def get_logs(self, limit: Optional[int] = None) -> List[Dict]:
+        """Останні limit подій (або всі з буфера) у вигляді словників"""
+        with self._lock:
+            records = list(self.records)
+        if limit is not None:
+            records = records[-limit:] if limit > 0 else []
+        return [self.to_dict(record) for record in records]
+
+    def flush(self):
+        """Дописати у файл події, що вже витіснені з буфера"""
+        with self._lock:
+            self._flush_spill()
+
+    def close(self):
+        """Дописати неповну пачку витіснених подій; викликати при зупинці шини"""
+        self.flush()
+
+    def __enter__(self) -> "EventLog":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _flush_spill(self):
+        if not self._spill_buffer:
+            return
+        with open(self.spill_path, 'a', encoding='utf-8') as f:
+            for record in self._spill_buffer:
+                f.write(json.dumps(self.to_dict(record), ensure_ascii=False, default=str) + '\n')
+        self._spill_buffer.clear()
+
+    def clear(self):
+        with self._lock:
+            self.records.clear()
+            # Витіснені до clear() події теж відкидаються, а не дописуються пізніше
+            self._spill_buffer.clear()
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.get_logs())
@@ -0,0 +1,483 @@
+"""
+SAGA ENGINE - конкурентне виконання Saga на asyncio з журналом у SQLite
+
+На відміну від SagaOrchestrator з a9_saga_pattern.py (одна Saga, крок за
+кроком у потоці виклику, лог лише в пам'яті):
+- тисячі Saga виконуються одночасно в одному event loop;
+- кроки описуються як граф залежностей (depends_on): незалежні кроки
+  виконуються паралельно, крок стартує, щойно готові всі його залежності;
+- кожна зміна стану записується в журнал (SQLite, append-only таблиця
+  saga_events). Записи групуються: один commit на всі події, що
+  накопичились, поки виконувався попередній commit (group commit);
+- після перезапуску процесу recover() продовжує незавершені Saga: виконані
+  кроки (їхні результати є в журналі) не повторюються, а Saga, що падала,
+  докомпенсовується.
+
+Кроки, що були розпочаті, але не завершені до падіння, виконуються
+повторно - дії кроків мають бути ідемпотентними.
+"""
+
+import asyncio
+import inspect
+import json
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from a9_saga_pattern import SagaStatus
+
+
+# Статуси, після яких Saga більше не змінюється
+FINAL_STATUSES = (SagaStatus.COMPLETED, SagaStatus.COMPENSATED)
+
+JOURNAL_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS sagas
+       (saga_id TEXT PRIMARY KEY,
+        definition TEXT NOT NULL,
+        input TEXT NOT NULL,
+        status TEXT NOT NULL)""",
+    """CREATE TABLE IF NOT EXISTS saga_events
+       (seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        saga_id TEXT NOT NULL,
+        timestamp TEXT NOT NULL,
+        event TEXT NOT NULL,
+        step TEXT,
+        payload TEXT)""",
+    "CREATE INDEX IF NOT EXISTS idx_saga_events_saga ON saga_events (saga_id, seq)",
+    "CREATE INDEX IF NOT EXISTS idx_sagas_status ON sagas (status)",
+]
+
+
+# ====================================
+# ОПИС SAGA
+# ====================================
+
+@dataclass
+class SagaStep:
+    """
+    Крок Saga.
+
+    action(ctx) та compensate(ctx) - async або звичайні функції (звичайні
+    виконуються в потоці). ctx = {"input": вхідні дані, "results": {крок: результат}}.
+    Результат action має бути JSON-сумісним - він зберігається в журналі.
+    """
+    name: str
+    action: Callable[[Dict], Any]
+    compensate: Optional[Callable[[Dict], Any]] = None
+    depends_on: Sequence[str] = ()
+
+
+@dataclass
+class SagaDefinition:
+    """Іменований граф кроків; ім'я пов'язує запис журналу з кодом кроків"""
+    name: str
+    steps: List[SagaStep]
+
+    def __post_init__(self):
+        names = [step.name for step in self.steps]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Повторювані назви кроків у Saga '{self.name}'")
+        for step in self.steps:
+            unknown = set(step.depends_on) - set(names)
+            if unknown:
+                raise ValueError(f"Крок '{step.name}' залежить від невідомих кроків {unknown}")
+
+
+@dataclass
+class SagaState:
+    """Стан однієї Saga в пам'яті (відновлюється з журналу)"""
+    saga_id: str
+    definition: SagaDefinition
+    input: Dict
+    status: SagaStatus = SagaStatus.STARTED
+    results: Dict[str, Any] = field(default_factory=dict)
+    # Порядок завершення кроків - компенсація йде у зворотному порядку
+    completed: List[str] = field(default_factory=list)
+    compensated: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def context(self) -> Dict:
+        return {"input": self.input, "results": self.results}
+
+
+# ====================================
+# ЖУРНАЛ
+# ====================================
+
+class SagaJournal:
+    """Append-only журнал подій Saga у SQLite з груповим commit-ом"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn: Optional[sqlite3.Connection] = None
+        # (рядок saga_events, новий статус, назва визначення, Future commit-у)
+        self._pending: List[Tuple[tuple, Optional[str], Optional[str], asyncio.Future]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        # close(): flusher дописує все з _pending і завершується сам
+        self._closing = False
+
+    async def open(self):
+        # З'єднанням користується лише flusher (по одному запису за раз)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        for statement in JOURNAL_SCHEMA:
+            self.conn.execute(statement)
+        self.conn.commit()
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    def append(self, saga_id: str, event: str, step: Optional[str] = None, payload: Any = None,
+               status: Optional[SagaStatus] = None, definition: Optional[str] = None) -> asyncio.Future:
+        """
+        Додати подію в журнал; повертає Future, що завершиться після commit-у.
+
+        definition передається лише для першої події Saga (створює запис у sagas).
+
+        Raises:
+            RuntimeError: Якщо журнал уже закривається
+        """
+        if self._closing:
+            raise RuntimeError("Журнал Saga закрито")
+        row = (saga_id, datetime.now().isoformat(), event, step,
+               json.dumps(payload, ensure_ascii=False) if payload is not None else None)
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((row, status.value if status else None, definition, future))
+        self._wakeup.set()
+        return future
+
+    async def _flush_loop(self):
+        while True:
+            if not self._closing:
+                await self._wakeup.wait()
+            self._wakeup.clear()
+            batch, self._pending = self._pending, []
+            if not batch:
+                if self._closing:
+                    return
+                continue
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except Exception as e:
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_result(None)
+
+    def _write(self, batch):
+        with self.conn:
+            for row, status, definition, _ in batch:
+                saga_id, _, _, _, payload = row
+                if definition is not None:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO sagas (saga_id, definition, input, status) VALUES (?, ?, ?, ?)",
+                        (saga_id, definition, payload, status)
+                    )
+                elif status is not None:
+                    self.conn.execute("UPDATE sagas SET status = ? WHERE saga_id = ?", (status, saga_id))
+            self.conn.executemany(
+                "INSERT INTO saga_events (saga_id, timestamp, event, step, payload) VALUES (?, ?, ?, ?, ?)",
+                [row for row, *_ in batch]
+            )
+
+    def load_unfinished(self) -> List[Tuple[str, str, Dict, SagaStatus, List[tuple]]]:
+        """Незавершені Saga: (id, визначення, вхідні дані, статус, події по порядку)"""
+        final = tuple(status.value for status in FINAL_STATUSES)
+        sagas = self.conn.execute(
+            f"SELECT saga_id, definition, input, status FROM sagas WHERE status NOT IN ({', '.join('?' * len(final))})",
+            final
+        ).fetchall()
+        result = []
+        for saga_id, definition, input_json, status in sagas:
+            events = self.conn.execute(
+                "SELECT event, step, payload FROM saga_events WHERE saga_id = ? ORDER BY seq", (saga_id,)
+            ).fetchall()
+            result.append((saga_id, definition, json.loads(input_json), SagaStatus(status), events))
+        return result
+
+    def count_by_status(self) -> Dict[str, int]:
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM sagas GROUP BY status").fetchall())
+
+    async def close(self):
+        if self._flusher:
+            # Flusher завершує поточний запис, дописує все, що ще чекає
+            # commit-у, і виходить; з'єднання закриваємо лише після цього
+            self._closing = True
+            self._wakeup.set()
+            await self._flusher
+            self._flusher = None
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+
+# ====================================
+# ENGINE
+# ====================================
+
+class SagaEngine:
+    """Виконує Saga конкурентно та відновлює їх після перезапуску"""
+
+    def __init__(self, journal_path: str = "sagas.db", max_concurrency: int = 1_000):
+        self.journal = SagaJournal(journal_path)
+        self.definitions: Dict[str, SagaDefinition] = {}
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def register(self, definition: SagaDefinition):
+        self.definitions[definition.name] = definition
+
+    async def start(self):
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        await self.journal.open()
+
+    async def close(self):
+        """Дочекатися запущених Saga та закрити журнал"""
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        await self.journal.close()
+
+    async def submit(self, definition_name: str, saga_input: Dict, saga_id: Optional[str] = None) -> str:
+        """Зареєструвати Saga в журналі і запустити її у фоні; повертає saga_id"""
+        definition = self.definitions[definition_name]
+        saga = SagaState(saga_id or uuid.uuid4().hex, definition, saga_input)
+        await self.journal.append(saga.saga_id, "SAGA_STARTED", payload=saga_input,
+                                  status=SagaStatus.STARTED, definition=definition_name)
+        self._launch(saga)
+        return saga.saga_id
+
+    async def run(self, definition_name: str, saga_input: Dict) -> SagaState:
+        """Виконати Saga і дочекатися результату"""
+        saga_id = await self.submit(definition_name, saga_input)
+        return await self._tasks[saga_id]
+
+    async def wait(self, saga_id: str) -> SagaState:
+        return await self._tasks[saga_id]
+
+    def _launch(self, saga: SagaState):
+        task = asyncio.create_task(self._execute(saga))
+        self._tasks[saga.saga_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(saga.saga_id, None))
+
+    async def recover(self) -> List[str]:
+        """Продовжити або докомпенсувати Saga, не завершені попереднім процесом"""
+        recovered = []
+        for saga_id, definition_name, saga_input, status, events in self.journal.load_unfinished():
+            definition = self.definitions.get(definition_name)
+            if definition is None:
+                print(f"⚠️ [{saga_id}] Невідома Saga '{definition_name}' - пропускаємо")
+                continue
+            saga = SagaState(saga_id, definition, saga_input, status)
+            for event, step, payload in events:
+                if event == "STEP_COMPLETED":
+                    saga.results[step] = json.loads(payload) if payload else None
+                    saga.completed.append(step)
+                elif event == "STEP_COMPENSATED":
+                    saga.compensated.append(step)
+                elif event == "STEP_FAILED":
+                    saga.error = json.loads(payload)
+            self._launch(saga)
+            recovered.append(saga_id)
+        return recovered
+
+    async def _journal(self, saga: SagaState, event: str, step: Optional[str] = None,
+                       payload: Any = None, status: Optional[SagaStatus] = None):
+        if status is not None:
+            saga.status = status
+        await self.journal.append(saga.saga_id, event, step, payload, status)
+
+    async def _execute(self, saga: SagaState) -> SagaState:
+        async with self._semaphore:
+            if saga.status in (SagaStatus.STARTED, SagaStatus.IN_PROGRESS):
+                await self._journal(saga, "SAGA_IN_PROGRESS", status=SagaStatus.IN_PROGRESS)
+                if await self._run_steps(saga):
+                    await self._journal(saga, "SAGA_COMPLETED", status=SagaStatus.COMPLETED)
+                    return saga
+                await self._journal(saga, "SAGA_FAILED", payload=saga.error, status=SagaStatus.FAILED)
+            await self._compensate(saga)
+            return saga
+
+    async def _run_steps(self, saga: SagaState) -> bool:
+        """Виконати кроки графа; False - якийсь крок впав"""
+        steps = {step.name: step for step in saga.definition.steps}
+        done = set(saga.completed)
+        running: Dict[asyncio.Task, str] = {}
+        failed = False
+
+        try:
+            while True:
+                if not failed:
+                    for name, step in steps.items():
+                        if name not in done and name not in running.values() and done.issuperset(step.depends_on):
+                            running[asyncio.create_task(self._run_step(saga, step))] = name
+                if not running:
+                    break
+
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    name = running.pop(task)
+                    if task.exception() is None:
+                        done.add(name)
+                    else:
+                        # Нові кроки не стартуємо, але чекаємо вже запущені - їх теж треба компенсувати
+                        failed = True
+                        saga.error = saga.error or f"{name}: {task.exception()}"
+        finally:
+            # Saga скасовано (зупинка, падіння) - кроки не повинні писати в журнал після неї
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+        return not failed and len(done) == len(steps)
+
+    async def _run_step(self, saga: SagaState, step: SagaStep):
+        await self._journal(saga, "STEP_STARTED", step.name)
+        try:
+            result = await _call(step.action, saga.context)
+        except Exception as e:
+            await self._journal(saga, "STEP_FAILED", step.name, payload=str(e))
+            raise
+        saga.results[step.name] = result
+        saga.completed.append(step.name)
+        await self._journal(saga, "STEP_COMPLETED", step.name, payload=result)
+
+    async def _compensate(self, saga: SagaState):
+        """Компенсувати виконані кроки у зворотному порядку (вже компенсовані - пропустити)"""
+        await self._journal(saga, "COMPENSATION_STARTED", status=SagaStatus.COMPENSATING)
+        steps = {step.name: step for step in saga.definition.steps}
+        for name in reversed(saga.completed):
+            if name in saga.compensated or steps[name].compensate is None:
+                continue
+            try:
+                await _call(steps[name].compensate, saga.context)
+            except Exception as e:
+                # Saga лишається в COMPENSATING - recover() спробує ще раз
+                await self._journal(saga, "COMPENSATION_FAILED", name, payload=str(e))
+                return
+            saga.compensated.append(name)
+            await self._journal(saga, "STEP_COMPENSATED", name)
+        await self._journal(saga, "SAGA_COMPENSATED", status=SagaStatus.COMPENSATED)
+
+
+async def _call(func: Callable[[Dict], Any], ctx: Dict):
+    if inspect.iscoroutinefunction(func):
+        return await func(ctx)
+    return await asyncio.to_thread(func, ctx)
+
+
+# ====================================
+# ДЕМОНСТРАЦІЯ
+# ====================================
+
+# Асинхронні версії сервісів з a9_saga_pattern.py (кроки ідемпотентні за order_id)
+async def reserve_product(ctx):
+    await asyncio.sleep(0.05)
+    if ctx["input"]["product_id"] == 999:
+        raise Exception(f"Товар {ctx['input']['product_id']} відсутній на складі")
+    return {"reserved": True, "product_id": ctx["input"]["product_id"]}
+
+
+async def cancel_reservation(ctx):
+    await asyncio.sleep(0.01)
+
+
+async def charge_payment(ctx):
+    await asyncio.sleep(0.05)
+    amount = ctx["input"]["amount"]
+    if amount > 10000:
+        raise Exception(f"Недостатньо коштів для суми {amount}")
+    return {"transaction_id": f"TXN_{ctx['input']['order_id']}", "amount": amount}
+
+
+async def refund(ctx):
+    await asyncio.sleep(0.01)
+
+
+async def create_delivery(ctx):
+    await asyncio.sleep(0.05)
+    return {"delivery_id": f"DEL_{ctx['input']['order_id']}"}
+
+
+async def cancel_delivery(ctx):
+    await asyncio.sleep(0.01)
+
+
+# Резервування і оплата незалежні - виконуються паралельно; доставка - після обох
+ORDER_SAGA = SagaDefinition("order", [
+    SagaStep("Reserve Product", reserve_product, cancel_reservation),
+    SagaStep("Charge Payment", charge_payment, refund),
+    SagaStep("Create Delivery", create_delivery, cancel_delivery,
+             depends_on=("Reserve Product", "Charge Payment")),
+])
+
+
+if __name__ == "__main__":
+    import os
+
+    JOURNAL = "sagas.db"
+
+    def order_input(order_id):
+        return {
+            "order_id": order_id,
+            "product_id": 999 if order_id % 10 == 0 else 123,
+            "amount": 15000 if order_id % 7 == 0 else 1500,
+        }
+
+    async def main():
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(JOURNAL + suffix):
+                os.remove(JOURNAL + suffix)
+
+        print("=" * 60)
+        print("🎬 1000 SAGA ОДНОЧАСНО")
+        print("=" * 60)
+        engine = SagaEngine(JOURNAL)
+        engine.register(ORDER_SAGA)
+        await engine.start()
+        start = time.perf_counter()
+        sagas = await asyncio.gather(*(engine.run("order", order_input(i)) for i in range(1, 1001)))
+        elapsed = time.perf_counter() - start
+        statuses = {}
+        for saga in sagas:
+            statuses[saga.status.value] = statuses.get(saga.status.value, 0) + 1
+        print(f"⏱️ {elapsed:.2f} с (послідовно: ~{1000 * 0.15:.0f} с) | {statuses}")
+        await engine.close()
+
+        print("\n" + "=" * 60)
+        print("💥 ПАДІННЯ ПРОЦЕСУ ПОСЕРЕДИНІ ВИКОНАННЯ")
+        print("=" * 60)
+        engine = SagaEngine(JOURNAL)
+        engine.register(ORDER_SAGA)
+        await engine.start()
+        for i in range(1001, 1101):
+            await engine.submit("order", order_input(i))
+        await asyncio.sleep(0.08)
+        # Імітація падіння: задачі скасовано, журнал лишився як є
+        for task in list(engine._tasks.values()):
+            task.cancel()
+        await asyncio.gather(*engine._tasks.values(), return_exceptions=True)
+        await engine.journal.close()
+
+        engine = SagaEngine(JOURNAL)
+        engine.register(ORDER_SAGA)
+        await engine.start()
+        print(f"📋 Статуси в журналі після падіння: {engine.journal.count_by_status()}")
+        recovered = await engine.recover()
+        print(f"🔄 Відновлено Saga: {len(recovered)}")
+        await engine.close()
+
+        engine = SagaEngine(JOURNAL)
+        await engine.start()
+        print(f"📋 Статуси в журналі після recover(): {engine.journal.count_by_status()}")
+        await engine.close()
+
+    asyncio.run(main())
@@ -8,14 +8,28 @@ from datetime import datetime
 # EVENTBUS З ЧЕРГОЮ
 # ====================================
 class EventBusWithQueue:
-    """EventBus з асинхронною обробкою через чергу"""
+    """
+    EventBus з асинхронною обробкою через пул worker-ів.
+
+    Кожен worker має власну чергу, а подія потрапляє в чергу за хешем назви,
+    тому події з однаковою назвою обробляються по черзі одним worker-ом
+    (порядок зберігається), а повільний listener гальмує лише свою чергу.
+    Worker забирає з черги до batch_size подій за раз. Якщо черга
+    заповнена (max_queue_size), emit() чекає - це backpressure для producer-а.
+    """
+
+    def __init__(self, workers=1, batch_size=1, max_queue_size=0):
+        if workers < 1 or batch_size < 1:
+            raise ValueError("workers та batch_size мають бути додатними")
 
-    def __init__(self):
         self.listeners = {}
         self.event_log = []
-        # Створюємо чергу для подій
-        self.event_queue = queue.Queue()
-        # Прапорець для зупинки worker-а
+        self.workers = workers
+        self.batch_size = batch_size
+        # Окрема черга на кожен worker (max_queue_size=0 - без обмеження)
+        self.event_queues = [queue.Queue(maxsize=max_queue_size) for _ in range(workers)]
+        self.worker_threads = []
+        # False після stop(): emit() відхиляє нові події
         self.running = True
 
     def subscribe(self, event_name, callback):
@@ -25,16 +39,32 @@ class EventBusWithQueue:
         self.listeners[event_name].append(callback)
         print(f"✅ Підписка: {callback.__name__} -> {event_name}")
 
-    def emit(self, event_name, data=None):
-        """Додати подію в чергу (не обробляється одразу!)"""
+    def emit(self, event_name, data=None, timeout=None):
+        """
+        Додати подію в чергу (не обробляється одразу!)
+
+        Якщо черга worker-а заповнена - чекає до timeout секунд
+        (None - без обмеження), після чого викидає queue.Full.
+        Після stop() події не приймаються (RuntimeError): їх нікому обробити.
+        """
+        if not self.running:
+            raise RuntimeError("EventBus зупинено - подію не прийнято")
         event = {
             "timestamp": datetime.now().isoformat(),
             "name": event_name,
             "data": data
         }
-        self.event_queue.put(event)
+        self._queue_for(event_name).put(event, timeout=timeout)
         print(f"➕ Подія додана в чергу: {event_name}")
 
+    def _queue_for(self, event_name):
+        """Черга worker-а, який обробляє події з цією назвою"""
+        return self.event_queues[hash(event_name) % self.workers]
+
+    def pending(self):
+        """Кількість подій, що чекають в чергах"""
+        return sum(q.qsize() for q in self.event_queues)
+
     def process_event(self, event):
         """Обробити одну подію"""
         event_name = event["name"]
@@ -53,104 +83,124 @@ class EventBusWithQueue:
                     print(f"❗ Помилка в {callback.__name__}: {e}")
                     # Worker НЕ падає від помилок!
 
-    def worker(self):
-        """Worker для обробки подій з черги"""
-        print("🚀 Worker запущено")
-
-        while self.running:
-            try:
-                # Чекаємо подію з черги (timeout 1 секунда)
-                event = self.event_queue.get(timeout=1)
-                self.process_event(event)
-                self.event_queue.task_done()
-            except queue.Empty:
-                # Черга порожня - просто чекаємо далі
-                continue
-            except Exception as e:
-                print(f"❗ Критична помилка в worker: {e}")
-                # Worker продовжує працювати!
-
-        print("🛑 Worker зупинено")
+    def worker(self, event_queue):
+        """Worker: забирає з своєї черги пачки до batch_size подій"""
+        print(f"🚀 Worker запущено: {threading.current_thread().name}")
+
+        while True:
+            # Чекаємо першу подію без опитування по таймауту;
+            # None - сигнал зупинки від stop()
+            batch = [event_queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(event_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for event in batch:
+                try:
+                    if event is None:
+                        print("🛑 Worker зупинено")
+                        return
+                    self.process_event(event)
+                except Exception as e:
+                    print(f"❗ Критична помилка в worker: {e}")
+                    # Worker продовжує працювати!
+                finally:
+                    event_queue.task_done()
 
     def start_worker(self):
-        """Запустити worker в окремому потоці"""
-        worker_thread = threading.Thread(target=self.worker, daemon=True)
-        worker_thread.start()
-        return worker_thread
+        """Запустити пул worker-ів в окремих потоках"""
+        self.running = True
+        for number, event_queue in enumerate(self.event_queues, 1):
+            worker_thread = threading.Thread(
+                target=self.worker, args=(event_queue,), name=f"worker-{number}", daemon=True
+            )
+            worker_thread.start()
+            self.worker_threads.append(worker_thread)
+        return self.worker_threads
 
     def stop(self):
-        """Зупинити worker"""
+        """Зупинити worker-и"""
+        # Нові події більше не приймаються; вже прийняті - дообробляються
         self.running = False
-        self.event_queue.join()  # Чекаємо обробки всіх подій
+        for event_queue in self.event_queues:
+            event_queue.join()  # Чекаємо обробки всіх подій
+        for event_queue in self.event_queues:
+            event_queue.put(None)
+        for worker_thread in self.worker_threads:
+            worker_thread.join()
+        self.worker_threads = []
 
 
 # ====================================
 # ПРИКЛАД ВИКОРИСТАННЯ
 # ====================================
 
-# Створюємо listener-и
-def send_email(data):
-    print(f"  📧 Email: Привіт, користувач {data['user_id']}!")
-    time.sleep(0.5)  # Імітація повільної операції
+if __name__ == "__main__":
+    # Створюємо listener-и
+    def send_email(data):
+        print(f"  📧 Email: Привіт, користувач {data['user_id']}!")
+        time.sleep(0.5)  # Імітація повільної операції
 
 
-def save_to_db(data):
-    print(f"  💾 DB: Збережено в базу даних")
-    time.sleep(0.3)
+    def save_to_db(data):
+        print(f"  💾 DB: Збережено в базу даних")
+        time.sleep(0.3)
 
 
-def send_sms(data):
-    print(f"  📱 SMS: Повідомлення надіслано")
-    time.sleep(0.2)
+    def send_sms(data):
+        print(f"  📱 SMS: Повідомлення надіслано")
+        time.sleep(0.2)
 
 
-def buggy_listener(data):
-    """Listener з помилкою - worker НЕ повинен падати"""
-    print(f"  🐛 Buggy: Починаю обробку...")
-    raise Exception("Ой! Щось пішло не так!")
+    def buggy_listener(data):
+        """Listener з помилкою - worker НЕ повинен падати"""
+        print(f"  🐛 Buggy: Починаю обробку...")
+        raise Exception("Ой! Щось пішло не так!")
 
 
-# Створюємо EventBus
-bus = EventBusWithQueue()
+    # Створюємо EventBus: 2 worker-и, пачки до 4 подій, черга до 100 подій на worker
+    bus = EventBusWithQueue(workers=2, batch_size=4, max_queue_size=100)
 
-# Підписуємося
-bus.subscribe("user.registered", send_email)
-bus.subscribe("user.registered", save_to_db)
-bus.subscribe("user.registered", buggy_listener)  # Цей listener з помилкою!
-bus.subscribe("order.created", send_sms)
-bus.subscribe("order.created", save_to_db)
+    # Підписуємося
+    bus.subscribe("user.registered", send_email)
+    bus.subscribe("user.registered", save_to_db)
+    bus.subscribe("user.registered", buggy_listener)  # Цей listener з помилкою!
+    bus.subscribe("order.created", send_sms)
+    bus.subscribe("order.created", save_to_db)
 
-# Запускаємо worker в окремому потоці
-print("=" * 50)
-print("ЗАПУСК АСИНХРОННОЇ ОБРОБКИ ПОДІЙ")
-print("=" * 50 + "\n")
+    # Запускаємо worker-и в окремих потоках
+    print("=" * 50)
+    print("ЗАПУСК АСИНХРОННОЇ ОБРОБКИ ПОДІЙ")
+    print("=" * 50 + "\n")
 
-worker_thread = bus.start_worker()
+    worker_threads = bus.start_worker()
 
-# Генеруємо події (producer)
-print("\n📤 Producer генерує події:\n")
+    # Генеруємо події (producer)
+    print("\n📤 Producer генерує події:\n")
 
-bus.emit("user.registered", {"user_id": 123, "email": "test@example.com"})
-bus.emit("user.registered", {"user_id": 456, "email": "user@example.com"})
-bus.emit("order.created", {"order_id": 789, "amount": 1500})
-bus.emit("user.registered", {"user_id": 999, "email": "admin@example.com"})
+    bus.emit("user.registered", {"user_id": 123, "email": "test@example.com"})
+    bus.emit("user.registered", {"user_id": 456, "email": "user@example.com"})
+    bus.emit("order.created", {"order_id": 789, "amount": 1500})
+    bus.emit("user.registered", {"user_id": 999, "email": "admin@example.com"})
 
-print("\n📤 Всі події додані в чергу. Worker обробляє...")
+    print("\n📤 Всі події додані в чергу. Worker обробляє...")
 
-# Чекаємо, поки worker обробить всі події
-time.sleep(5)
+    # Чекаємо, поки worker обробить всі події
+    time.sleep(5)
 
-# Зупиняємо worker
-print("\n" + "=" * 50)
-print("ЗУПИНКА")
-print("=" * 50)
-bus.stop()
+    # Зупиняємо worker-и
+    print("\n" + "=" * 50)
+    print("ЗУПИНКА")
+    print("=" * 50)
+    bus.stop()
 
-# Статистика
-print(f"\n📊 Оброблено подій: {len(bus.event_log)}")
-print(f"📋 Події в черзі: {bus.event_queue.qsize()}")
+    # Статистика
+    print(f"\n📊 Оброблено подій: {len(bus.event_log)}")
+    print(f"📋 Події в черзі: {bus.pending()}")
 
-print("\n✅ Програма завершена. Зверни увагу:")
-print("   - Події оброблялися асинхронно (не одразу)")
-print("   - Worker НЕ впав, навіть коли buggy_listener викинув помилку")
-print("   - Решта listener-ів продовжили працювати")
\ No newline at end of file
+    print("\n✅ Програма завершена. Зверни увагу:")
+    print("   - Події оброблялися асинхронно (не одразу)")
+    print("   - Worker НЕ впав, навіть коли buggy_listener викинув помилку")
+    print("   - Решта listener-ів продовжили працювати")
\ No newline at end of file
@@ -5,14 +5,128 @@
 Программа анализирует лог-файл веб-сервера в формате Common Log Format (CLF)
 или Combined Log Format и выводит статистику по количеству запросов с различных IP-адрес.
 
+Поддерживаются режимы загрузки:
+    - обычный: все записи сохраняются в памяти в компактном колоночном виде
+      (self.log_entries - LogColumns: array-колонки чисел и словарно
+      закодированные строковые колонки);
+    - потоковый (streaming=True): файл читается один раз, записи не сохраняются,
+      а сразу учитываются в счетчиках LogStatistics. Память не зависит от размера лога;
+    - параллельный (load_log_file_parallel): файл делится на фрагменты по границам
+      строк, фрагменты парсятся в ProcessPoolExecutor, частичные счетчики объединяются;
+    - слежение (follow): аналог tail -F, статистика обновляется по мере
+      дописывания файла, с учетом ротации; копию можно получить через snapshot().
+
 Автор: Assistant
-Версия: 1.0
+Версия: 1.2
 """
 
+import copy
+import os
 import re
+import threading
 from collections import Counter, defaultdict
-from typing import Dict, List, Tuple, Optional, NamedTuple
+from array import array
+from functools import lru_cache, partial
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Set, Tuple, Optional, NamedTuple, Union
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Количество фрагментов файла на один процесс при параллельной загрузке
+CHUNKS_PER_WORKER = 4
+
+# Регулярное выражение для извлечения часа из timestamp
+# Поддерживает различные форматы: [25/Dec/2023:10:00:01 +0000] или 2023-12-25 10:00:01
+# (?<!\d) не дает захватить "25" из года "2025:11:20:35"
+HOUR_PATTERN = re.compile(r'(?<!\d)(\d{2}):\d{2}:\d{2}')
+
+# Регулярные выражения для определения браузеров (порядок важен - первый найденный)
+BROWSER_PATTERNS = {
+    'Chrome': re.compile(r'Chrome/[\d.]+', re.IGNORECASE),
+    'Firefox': re.compile(r'Firefox/[\d.]+', re.IGNORECASE),
+    'Safari': re.compile(r'Safari/[\d.]+', re.IGNORECASE),
+    'Edge': re.compile(r'Edge/[\d.]+', re.IGNORECASE),
+    'Internet Explorer': re.compile(r'MSIE\s[\d.]+', re.IGNORECASE),
+    'Opera': re.compile(r'Opera/[\d.]+', re.IGNORECASE),
+    'Bot': re.compile(r'bot|crawler|spider|scraper', re.IGNORECASE),
+}
+
+# Подозрительные паттерны в URL. Все они объединены в одно регулярное
+# выражение-альтернативу, поэтому каждый URL просматривается один раз.
+SUSPICIOUS_PATTERNS = {
+    'SQL Injection': r'union|select|insert|delete|drop|script',
+    'XSS Attempt': r'<script|javascript:|onload=|onerror=',
+    'Directory Traversal': r'\.\./|\.\.\\|/etc/passwd|/windows/system32',
+    'Admin Panel Access': r'admin|wp-admin|administrator|dashboard',
+    'Config Files': r'\.env|config\.php|wp-config|database',
+}
+
+# Группа для каждого паттерна обернута в lookahead: совпадение имеет нулевую
+# длину и не "съедает" текст, поэтому перекрывающиеся паттерны (например,
+# '<script' и 'script') находятся так же, как при отдельных проверках.
+_SUSPICIOUS_GROUPS = {f'p{i}': name for i, name in enumerate(SUSPICIOUS_PATTERNS)}
+SUSPICIOUS_URL_PATTERN = re.compile(
+    '|'.join(
+        f'(?=(?P<{group}>{SUSPICIOUS_PATTERNS[name]}))'
+        for group, name in _SUSPICIOUS_GROUPS.items()
+    ),
+    re.IGNORECASE,
+)
+
+
+def extract_hour(timestamp: str) -> Optional[str]:
+    """
+    Извлекает час из timestamp в виде "HH:00".
+
+    Args:
+        timestamp: Время запроса из лог-файла
+
+    Returns:
+        Строка "HH:00" или None, если час не найден
+    """
+    hour_match = HOUR_PATTERN.search(timestamp)
+    if hour_match:
+        return f"{hour_match.group(1)}:00"
+    return None
+
+
+def detect_browser(user_agent: Optional[str]) -> str:
+    """
+    Определяет браузер по строке User-Agent.
+
+    Args:
+        user_agent: User-Agent клиента
+
+    Returns:
+        Название браузера, 'Other' или 'Unknown'
+    """
+    if not user_agent or user_agent == '-':
+        return 'Unknown'
+
+    for browser_name, pattern in BROWSER_PATTERNS.items():
+        if pattern.search(user_agent):
+            return browser_name
+
+    return 'Other'
+
+
+@lru_cache(maxsize=65536)
+def classify_url(url: str) -> FrozenSet[str]:
+    """
+    Находит подозрительные паттерны в URL за один проход по строке.
+
+    Результат кешируется, так как одни и те же URL повторяются в логе много раз.
+
+    Args:
+        url: Запрашиваемый URL
+
+    Returns:
+        Множество названий найденных паттернов (ключи SUSPICIOUS_PATTERNS)
+    """
+    return frozenset(
+        _SUSPICIOUS_GROUPS[match.lastgroup]
+        for match in SUSPICIOUS_URL_PATTERN.finditer(url)
+    )
 
 
 class LogEntry(NamedTuple):
@@ -37,6 +151,321 @@ class LogEntry(NamedTuple):
     user_agent: Optional[str] = None
 
 
+class StringColumn:
+    """
+    Колонка строк со словарным кодированием.
+
+    Каждое различное значение хранится один раз (в self.values), а для каждой
+    записи хранится только его 4-байтовый код в array('I').
+
+    Attributes:
+        values: Список различных значений (код -> значение)
+        codes: Код значения для каждой записи
+    """
+
+    def __init__(self):
+        """
+        Инициализация пустой колонки.
+        """
+        self.values: List[Optional[str]] = []
+        self.codes = array('I')
+        self._value_codes: Dict[Optional[str], int] = {}
+
+    def append(self, value: Optional[str]) -> None:
+        """
+        Добавляет значение в конец колонки.
+
+        Args:
+            value: Строка (или None)
+        """
+        code = self._value_codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._value_codes[value] = code
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        return self.values[self.codes[index]]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def code_counts(self) -> Counter:
+        """
+        Считает количество записей для каждого кода за один проход по array.
+
+        Returns:
+            Counter {код: количество}
+        """
+        return Counter(self.codes)
+
+    def value_counts(self) -> Counter:
+        """
+        Считает количество записей для каждого значения.
+
+        Returns:
+            Counter {значение: количество}
+        """
+        values = self.values
+        return Counter({values[code]: count for code, count in self.code_counts().items()})
+
+
+class LogColumns:
+    """
+    Компактное колоночное хранилище распознанных записей лога.
+
+    Числовые поля хранятся в array (статус - 2 байта, размер - 8 байт,
+    час - 1 байт), строковые - в StringColumn со словарным кодированием.
+    Поддерживает интерфейс списка LogEntry (append, extend, len, индексация,
+    итерация), поэтому может использоваться вместо List[LogEntry].
+    """
+
+    # Значение в колонке hours, если час не удалось определить
+    NO_HOUR = -1
+
+    def __init__(self):
+        """
+        Инициализация пустого хранилища.
+        """
+        self.ips = StringColumn()
+        self.timestamps = StringColumn()
+        self.methods = StringColumn()
+        self.urls = StringColumn()
+        self.user_agents = StringColumn()
+        self.status_codes = array('H')
+        self.response_sizes = array('Q')
+        self.hours = array('b')
+
+    def append(self, entry: LogEntry) -> None:
+        """
+        Добавляет запись во все колонки.
+
+        Args:
+            entry: Запись лог-файла
+        """
+        self.ips.append(entry.ip)
+        self.timestamps.append(entry.timestamp)
+        self.methods.append(entry.method)
+        self.urls.append(entry.url)
+        self.user_agents.append(entry.user_agent)
+        self.status_codes.append(int(entry.status_code))
+        self.response_sizes.append(int(entry.response_size))
+
+        hour = extract_hour(entry.timestamp)
+        self.hours.append(int(hour[:2]) if hour else self.NO_HOUR)
+
+    def extend(self, entries: Iterable[LogEntry]) -> None:
+        """
+        Добавляет несколько записей.
+
+        Args:
+            entries: Итерируемый объект с записями
+        """
+        for entry in entries:
+            self.append(entry)
+
+    def __len__(self) -> int:
+        return len(self.status_codes)
+
+    def __getitem__(self, index: int) -> LogEntry:
+        """
+        Восстанавливает запись по ее позиции.
+
+        Args:
+            index: Позиция записи (поддерживаются отрицательные индексы)
+
+        Returns:
+            LogEntry в исходном строковом представлении
+        """
+        if index < 0:
+            index += len(self)
+        return LogEntry(
+            ip=self.ips[index],
+            timestamp=self.timestamps[index],
+            method=self.methods[index],
+            url=self.urls[index],
+            status_code=f"{self.status_codes[index]:03d}",
+            response_size=str(self.response_sizes[index]),
+            user_agent=self.user_agents[index],
+        )
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+class LogStatistics:
+    """
+    Накопитель статистики для однопроходной (потоковой) обработки лога.
+
+    Каждая запись учитывается сразу во всех счетчиках, поэтому сами записи
+    хранить не нужно. Счетчики IP, статусов, методов, часов и браузеров точные
+    (их размер ограничен числом различных значений, а не числом строк).
+    Счетчик URL ограничен url_capacity и ведется по алгоритму Misra-Gries:
+    при переполнении все счетчики уменьшаются на одну и ту же величину, а
+    обнулившиеся удаляются. Любой URL, встретившийся больше
+    total_entries / (url_capacity + 1) раз, гарантированно остается в
+    счетчике, а его количество занижено не более чем на эту величину.
+
+    Attributes:
+        total_entries: Количество учтенных записей
+        ip_counter: Количество запросов для каждого IP
+        status_counter: Количество ответов для каждого статус-кода
+        method_counter: Количество запросов для каждого метода
+        hourly_counter: Количество запросов по часам ("HH:00")
+        browser_counter: Количество запросов по браузерам
+        url_counter: Приближенный счетчик наиболее частых URL
+        ip_patterns: Подозрительные паттерны, найденные в URL каждого IP
+        url_capacity: Сколько URL гарантированно хранится в url_counter
+    """
+
+    def __init__(self, url_capacity: int = 1000):
+        """
+        Инициализация пустой статистики.
+
+        Args:
+            url_capacity: Максимальное количество отслеживаемых URL (топ-K)
+        """
+        if url_capacity < 1:
+            raise ValueError("url_capacity должен быть положительным числом")
+
+        self.url_capacity = url_capacity
+        self.total_entries = 0
+        self.ip_counter: Counter = Counter()
+        self.status_counter: Counter = Counter()
+        self.method_counter: Counter = Counter()
+        self.hourly_counter: Counter = Counter()
+        self.browser_counter: Counter = Counter()
+        self.url_counter: Counter = Counter()
+        self.ip_patterns: Dict[str, Set[str]] = defaultdict(set)
+
+    def add(self, entry: LogEntry) -> None:
+        """
+        Учитывает одну запись во всех счетчиках.
+
+        Args:
+            entry: Запись лог-файла
+        """
+        self.total_entries += 1
+        self.ip_counter[entry.ip] += 1
+        self.status_counter[entry.status_code] += 1
+        self.method_counter[entry.method] += 1
+        self.browser_counter[detect_browser(entry.user_agent)] += 1
+
+        hour = extract_hour(entry.timestamp)
+        if hour:
+            self.hourly_counter[hour] += 1
+
+        patterns = classify_url(entry.url)
+        if patterns:
+            self.ip_patterns[entry.ip].update(patterns)
+
+        self.url_counter[entry.url] += 1
+        # Сжимаем счетчик URL не на каждой записи, а при двукратном переполнении,
+        # чтобы стоимость most_common() амортизировалась
+        if len(self.url_counter) > 2 * self.url_capacity:
+            self._prune_urls()
+
+    def merge(self, other: 'LogStatistics') -> None:
+        """
+        Добавляет к текущей статистике частичную статистику (например, от
+        другого процесса, обработавшего свой фрагмент файла).
+
+        Счетчики URL складываются и сжимаются тем же шагом Misra-Gries, что и
+        в add(): ошибки частей суммируются, поэтому для объединенной
+        статистики остается та же оценка total_entries / (url_capacity + 1).
+
+        Args:
+            other: Статистика, которую нужно прибавить
+        """
+        self.total_entries += other.total_entries
+        self.ip_counter.update(other.ip_counter)
+        self.status_counter.update(other.status_counter)
+        self.method_counter.update(other.method_counter)
+        self.hourly_counter.update(other.hourly_counter)
+        self.browser_counter.update(other.browser_counter)
+        for ip, patterns in other.ip_patterns.items():
+            self.ip_patterns[ip].update(patterns)
+        self.url_counter.update(other.url_counter)
+        if len(self.url_counter) > 2 * self.url_capacity:
+            self._prune_urls()
+
+    def _prune_urls(self) -> None:
+        """
+        Пакетный шаг Misra-Gries: вычитает из всех счетчиков URL значение
+        (url_capacity + 1)-го по величине и удаляет неположительные.
+
+        После шага остается не больше url_capacity URL. Каждое вычитание
+        затрагивает не меньше url_capacity + 1 счетчиков, поэтому суммарная
+        ошибка любого счетчика не превышает total_entries / (url_capacity + 1).
+        """
+        if len(self.url_counter) <= self.url_capacity:
+            return
+        counts = sorted(self.url_counter.values(), reverse=True)
+        decrement = counts[self.url_capacity]
+        self.url_counter = Counter({
+            url: count - decrement
+            for url, count in self.url_counter.items()
+            if count > decrement
+        })
+
+    def get_top_urls(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """
+        Возвращает топ наиболее запрашиваемых URL.
+
+        Args:
+            limit: Количество URL для возврата (не больше url_capacity)
+
+        Returns:
+            Список кортежей (URL, количество_запросов)
+        """
+        return self.url_counter.most_common(min(limit, self.url_capacity))
+
+    def find_suspicious_ips(self, min_requests: int = 100) -> List[Tuple[str, int, List[str]]]:
+        """
+        Находит подозрительные IP по накопленной статистике (в том числе по
+        копии, полученной через LogAnalyzer.snapshot()).
+
+        Args:
+            min_requests: Минимальное количество запросов для подозрительности
+
+        Returns:
+            Список кортежей (IP, количество_запросов, список_подозрительных_паттернов)
+        """
+        return rank_suspicious_ips(self.ip_counter, self.ip_patterns, min_requests)
+
+
+def rank_suspicious_ips(ip_stats: Counter, ip_patterns: Dict[str, Set[str]],
+                        min_requests: int) -> List[Tuple[str, int, List[str]]]:
+    """
+    Отбирает подозрительные IP: много запросов и/или подозрительные паттерны в URL.
+
+    Args:
+        ip_stats: Количество запросов для каждого IP
+        ip_patterns: Паттерны, найденные в URL каждого IP
+        min_requests: Минимальное количество запросов для подозрительности
+
+    Returns:
+        Список кортежей (IP, количество_запросов, список_подозрительных_паттернов),
+        от самых активных
+    """
+    suspicious_ips = []
+
+    for ip, count in ip_stats.items():
+        if count >= min_requests:
+            found = ip_patterns.get(ip, ())
+            # Сохраняем порядок паттернов как в SUSPICIOUS_PATTERNS
+            found_patterns = [name for name in SUSPICIOUS_PATTERNS if name in found]
+
+            if found_patterns or count > 1000:  # Много запросов тоже подозрительно
+                if count > 1000:
+                    found_patterns.append('High Request Volume')
+                suspicious_ips.append((ip, count, found_patterns))
+
+    return sorted(suspicious_ips, key=lambda x: x[1], reverse=True)
+
+
 class LogAnalyzer:
     """
     Класс для анализа лог-файлов веб-сервера.
@@ -50,7 +479,15 @@ class LogAnalyzer:
             log_file_path: Путь к лог-файлу
         """
         self.log_file_path = Path(log_file_path)
-        self.log_entries: List[LogEntry] = []
+        # Записи хранятся по колонкам (см. LogColumns), а не списком LogEntry
+        self.log_entries = LogColumns()
+        # Заполняется при потоковой загрузке (load_log_file(streaming=True))
+        self.statistics: Optional[LogStatistics] = None
+        # Индекс IP -> позиции в log_entries (см. get_ip_index)
+        self._ip_index: Dict[str, array] = defaultdict(partial(array, 'I'))
+        self._ip_indexed_entries = 0
+        # Защищает self.statistics во время follow() (см. snapshot)
+        self._statistics_lock = threading.Lock()
 
         # Улучшенное регулярное выражение для Common Log Format (CLF)
         # Формат: host ident authuser [timestamp] "request" status size
@@ -77,6 +514,46 @@ class LogAnalyzer:
             r'(?:\s+.*)?'  # Возможные дополнительные поля
         )
 
+        # Улучшенное регулярное выражение для Combined Log Format
+        # Формат: CLF + "referer" "user-agent"
+        self.combined_pattern = re.compile(
+            r'^'  # Начало строки
+            r'(?P<ip>\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}|[:\da-fA-F]+)'  # IPv4 или IPv6
+            r'\s+'
+            r'(?P<ident>\S+)'  # remote logname
+            r'\s+'
+            r'(?P<authuser>\S+)'  # remote user
+            r'\s+'
+            r'\[(?P<timestamp>[^\]]+)\]'  # timestamp
+            r'\s+'
+            r'"(?P<method>[A-Z]+)'  # HTTP метод
+            r'\s+'
+            r'(?P<url>\S+)'  # URL
+            r'\s+'
+            r'(?P<protocol>HTTP/[\d\.]+)"'  # HTTP версия
+            r'\s+'
+            r'(?P<status>\d{3})'  # HTTP статус код
+            r'\s+'
+            r'(?P<size>\d+|-)'  # Размер ответа
+            r'\s+'
+            r'"(?P<referer>[^"]*)"'  # Referer
+            r'\s+'
+            r'"(?P<user_agent>[^"]*)"'  # User-Agent
+            r'(?:\s+.*)?'  # Дополнительные поля
+        )
+
+        # Простое регулярное выражение для извлечения только IP адресов
+        # Полезно для нестандартных форматов логов
+        self.ip_only_pattern = re.compile(
+            r'(?P<ip>\b(?:\d{1,3}\.){3}\d{1,3}\b|(?:[a-fA-F0-9]*:+)+[a-fA-F0-9]+)'
+        )
+
+        # Регулярное выражение для проверки валидности IP адресов
+        self.valid_ipv4_pattern = re.compile(
+            r'^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}'
+            r'(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$'
+        )
+
     def is_valid_ip(self, ip: str) -> bool:
         """
         Проверяет валидность IP адреса.
@@ -167,9 +644,36 @@ class LogAnalyzer:
 
         return None
 
-    def load_log_file(self) -> None:
+
+    def _parse_or_warn(self, line: Union[str, bytes], location: str) -> Optional[LogEntry]:
         """
-        Загружает и парсит лог-файл.
+        Парсит строку и печатает предупреждение, если это не удалось.
+
+        Args:
+            line: Строка из лог-файла (bytes декодируются как UTF-8)
+            location: Описание места строки в файле для сообщений
+
+        Returns:
+            LogEntry или None
+        """
+        try:
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            entry = self.parse_log_line(line)
+        except Exception as e:
+            print(f"Ошибка при парсинге строки {location}: {e}")
+            return None
+
+        if entry is None:
+            print(f"Предупреждение: не удалось парсить строку {location}")
+        return entry
+
+    def iter_log_entries(self) -> Iterator[LogEntry]:
+        """
+        Построчно читает и парсит лог-файл, не сохраняя записи в памяти.
+
+        Yields:
+            LogEntry для каждой успешно распознанной строки
 
         Raises:
             FileNotFoundError: Если файл не найден
@@ -181,18 +685,211 @@ class LogAnalyzer:
         try:
             with open(self.log_file_path, 'r', encoding='utf-8') as file:
                 for line_number, line in enumerate(file, 1):
-                    try:
-                        entry = self.parse_log_line(line)
-                        if entry:
-                            self.log_entries.append(entry)
-                        else:
-                            print(f"Предупреждение: не удалось парсить строку {line_number}")
-                    except Exception as e:
-                        print(f"Ошибка при парсинге строки {line_number}: {e}")
+                    entry = self._parse_or_warn(line, str(line_number))
+                    if entry:
+                        yield entry
 
         except PermissionError:
             raise PermissionError(f"Нет прав на чтение файла: {self.log_file_path}")
 
+    def load_log_file(self, streaming: bool = False, url_capacity: int = 1000) -> None:
+        """
+        Загружает и парсит лог-файл.
+
+        Args:
+            streaming: Если True, файл читается за один проход, записи не
+                сохраняются, а сразу учитываются в self.statistics
+            url_capacity: Размер топа URL для потокового режима
+
+        Raises:
+            FileNotFoundError: Если файл не найден
+            PermissionError: Если нет прав на чтение файла
+        """
+        # Повторная загрузка заменяет прежние данные, а не дописывает к ним
+        self.log_entries = LogColumns()
+        self._reset_ip_index()
+
+        if streaming:
+            self.statistics = LogStatistics(url_capacity)
+            for entry in self.iter_log_entries():
+                self.statistics.add(entry)
+        else:
+            self.statistics = None
+            self.log_entries.extend(self.iter_log_entries())
+
+    def iter_chunk_entries(self, start: int, end: int) -> Iterator[LogEntry]:
+        """
+        Парсит строки, начинающиеся в диапазоне байтов [start, end).
+
+        Границы диапазона должны совпадать с началами строк
+        (см. split_file_into_chunks).
+
+        Args:
+            start: Смещение первого байта фрагмента
+            end: Смещение байта, следующего за фрагментом
+
+        Yields:
+            LogEntry для каждой успешно распознанной строки
+        """
+        with open(self.log_file_path, 'rb') as file:
+            file.seek(start)
+            position = start
+            while position < end:
+                raw_line = file.readline()
+                if not raw_line:
+                    break
+                entry = self._parse_or_warn(raw_line, f"(байт {position})")
+                position += len(raw_line)
+                if entry:
+                    yield entry
+
+    def load_log_file_parallel(self, workers: Optional[int] = None,
+                               url_capacity: int = 1000) -> None:
+        """
+        Загружает лог-файл параллельно в нескольких процессах.
+
+        Файл делится на диапазоны байтов по границам строк, каждый процесс
+        парсит свой диапазон и возвращает частичную LogStatistics, которые
+        затем объединяются. Результат доступен так же, как после
+        load_log_file(streaming=True).
+
+        Args:
+            workers: Количество процессов (по умолчанию - число ядер)
+            url_capacity: Размер топа URL
+
+        Raises:
+            FileNotFoundError: Если файл не найден
+        """
+        if not self.log_file_path.exists():
+            raise FileNotFoundError(f"Лог-файл не найден: {self.log_file_path}")
+
+        workers = workers or os.cpu_count() or 1
+        # Несколько фрагментов на процесс сглаживают неравномерную нагрузку
+        chunks = split_file_into_chunks(self.log_file_path, workers * CHUNKS_PER_WORKER)
+
+        self.log_entries = LogColumns()
+        self._reset_ip_index()
+        self.statistics = LogStatistics(url_capacity)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_analyze_chunk, str(self.log_file_path), start, end, url_capacity)
+                for start, end in chunks
+            ]
+            for future in futures:
+                self.statistics.merge(future.result())
+
+    def follow(self, poll_interval: float = 1.0, from_beginning: bool = True,
+               url_capacity: int = 1000,
+               stop_event: Optional[threading.Event] = None) -> Iterator[LogEntry]:
+        """
+        Следит за дописываемым лог-файлом (аналог tail -F) и обновляет
+        self.statistics по мере появления новых строк.
+
+        Ротация обрабатывается так же, как в tail -F: если по пути появился
+        новый файл (другой inode), старый дочитывается до конца и чтение
+        продолжается с начала нового. Если файл усечен, чтение начинается
+        заново. Незавершенная последняя строка ждет своего перевода строки.
+
+        Методы get_*_statistics(), get_top_urls() и find_suspicious_ips()
+        читают статистику под блокировкой, поэтому их можно вызывать из
+        другого потока; snapshot() возвращает согласованную копию целиком.
+
+        Args:
+            poll_interval: Пауза между проверками файла в секундах
+            from_beginning: Учесть уже существующие строки (иначе - только новые)
+            url_capacity: Размер топа URL
+            stop_event: Событие для остановки слежения
+
+        Yields:
+            LogEntry для каждой новой распознанной строки
+        """
+        with self._statistics_lock:
+            self.log_entries = LogColumns()
+            self._reset_ip_index()
+            self.statistics = LogStatistics(url_capacity)
+
+        stop_event = stop_event or threading.Event()
+        file = None
+        inode = None
+        pending = b''
+        line_number = 0
+        first_open = True
+
+        try:
+            while not stop_event.is_set():
+                if file is None:
+                    try:
+                        file = open(self.log_file_path, 'rb')
+                    except FileNotFoundError:
+                        stop_event.wait(poll_interval)
+                        continue
+                    inode = os.fstat(file.fileno()).st_ino
+                    if first_open and not from_beginning:
+                        file.seek(0, os.SEEK_END)
+                    first_open = False
+
+                chunk = file.readline()
+                if chunk:
+                    pending += chunk
+                    if not pending.endswith(b'\n'):
+                        continue
+                    line, pending = pending, b''
+                    line_number += 1
+
+                    entry = self._parse_or_warn(line, str(line_number))
+                    if entry:
+                        with self._statistics_lock:
+                            self.statistics.add(entry)
+                        yield entry
+                    continue
+
+                # Достигнут конец файла - проверяем ротацию и усечение
+                try:
+                    current = os.stat(self.log_file_path)
+                except FileNotFoundError:
+                    current = None
+
+                if current is not None and current.st_ino != inode:
+                    # Старый файл уже дочитан: переходим к новому
+                    file.close()
+                    file = None
+                    pending = b''
+                    line_number = 0
+                elif current is not None and current.st_size < file.tell():
+                    file.seek(0)
+                    pending = b''
+                    line_number = 0
+                else:
+                    stop_event.wait(poll_interval)
+        finally:
+            if file is not None:
+                file.close()
+
+    def snapshot(self) -> LogStatistics:
+        """
+        Возвращает согласованную копию текущей статистики.
+
+        Безопасно вызывать из другого потока во время follow().
+
+        Returns:
+            Копия LogStatistics
+
+        Raises:
+            RuntimeError: Если статистика еще не собиралась
+        """
+        with self._statistics_lock:
+            if self.statistics is None:
+                raise RuntimeError("Статистика доступна после load_log_file(streaming=True) или follow()")
+            return copy.deepcopy(self.statistics)
+
+    def _reset_ip_index(self) -> None:
+        """
+        Сбрасывает индекс IP перед новой загрузкой файла.
+        """
+        self._ip_index = defaultdict(partial(array, 'I'))
+        self._ip_indexed_entries = 0
+
     def get_ip_statistics(self) -> Counter:
         """
         Вычисляет статистику по IP-адресам.
@@ -200,7 +897,10 @@ class LogAnalyzer:
         Returns:
             Counter с количеством запросов для каждого IP
         """
-        return Counter(entry.ip for entry in self.log_entries)
+        with self._statistics_lock:
+            if self.statistics is not None:
+                return Counter(self.statistics.ip_counter)
+        return self.log_entries.ips.value_counts()
 
     def get_status_code_statistics(self) -> Counter:
         """
@@ -209,7 +909,13 @@ class LogAnalyzer:
         Returns:
             Counter с количеством ответов для каждого статус-кода
         """
-        return Counter(entry.status_code for entry in self.log_entries)
+        with self._statistics_lock:
+            if self.statistics is not None:
+                return Counter(self.statistics.status_counter)
+        return Counter({
+            f"{code:03d}": count
+            for code, count in Counter(self.log_entries.status_codes).items()
+        })
 
     def get_method_statistics(self) -> Counter:
         """
@@ -218,7 +924,10 @@ class LogAnalyzer:
         Returns:
             Counter с количеством запросов для каждого метода
         """
-        return Counter(entry.method for entry in self.log_entries)
+        with self._statistics_lock:
+            if self.statistics is not None:
+                return Counter(self.statistics.method_counter)
+        return self.log_entries.methods.value_counts()
 
     def get_top_urls(self, limit: int = 10) -> List[Tuple[str, int]]:
         """
@@ -230,8 +939,10 @@ class LogAnalyzer:
         Returns:
             Список кортежей (URL, количество_запросов)
         """
-        url_counter = Counter(entry.url for entry in self.log_entries)
-        return url_counter.most_common(limit)
+        with self._statistics_lock:
+            if self.statistics is not None:
+                return self.statistics.get_top_urls(limit)
+        return self.log_entries.urls.value_counts().most_common(limit)
 
     def get_hourly_statistics(self) -> Dict[str, int]:
         """
@@ -240,19 +951,15 @@ class LogAnalyzer:
         Returns:
             Словарь с количеством запросов по часам
         """
-        hourly_stats = defaultdict(int)
-
-        # Регулярное выражение для извлечения часа из timestamp
-        # Поддерживает различные форматы: [25/Dec/2023:10:00:01 +0000] или 2023-12-25 10:00:01
-        hour_pattern = re.compile(r'(\d{2}):\d{2}:\d{2}')
-
-        for entry in self.log_entries:
-            hour_match = hour_pattern.search(entry.timestamp)
-            if hour_match:
-                hour = hour_match.group(1)
-                hourly_stats[f"{hour}:00"] += 1
-
-        return dict(hourly_stats)
+        with self._statistics_lock:
+            if self.statistics is not None:
+                return dict(self.statistics.hourly_counter)
+
+        return {
+            f"{hour:02d}:00": count
+            for hour, count in Counter(self.log_entries.hours).items()
+            if hour != LogColumns.NO_HOUR
+        }
 
     def analyze_user_agents(self) -> Dict[str, int]:
         """
@@ -261,34 +968,33 @@ class LogAnalyzer:
         Returns:
             Словарь с количеством запросов по браузерам
         """
+        with self._statistics_lock:
+            if self.statistics is not None:
+                return dict(self.statistics.browser_counter)
+
         browser_stats = defaultdict(int)
 
-        # Регулярные выражения для определения браузеров
-        browser_patterns = {
-            'Chrome': re.compile(r'Chrome/[\d.]+', re.IGNORECASE),
-            'Firefox': re.compile(r'Firefox/[\d.]+', re.IGNORECASE),
-            'Safari': re.compile(r'Safari/[\d.]+', re.IGNORECASE),
-            'Edge': re.compile(r'Edge/[\d.]+', re.IGNORECASE),
-            'Internet Explorer': re.compile(r'MSIE\s[\d.]+', re.IGNORECASE),
-            'Opera': re.compile(r'Opera/[\d.]+', re.IGNORECASE),
-            'Bot': re.compile(r'bot|crawler|spider|scraper', re.IGNORECASE),
-        }
+        # Браузер определяется один раз для каждого различного User-Agent
+        for user_agent, count in self.log_entries.user_agents.value_counts().items():
+            browser_stats[detect_browser(user_agent)] += count
 
-        for entry in self.log_entries:
-            if entry.user_agent and entry.user_agent != '-':
-                browser_found = False
-                for browser_name, pattern in browser_patterns.items():
-                    if pattern.search(entry.user_agent):
-                        browser_stats[browser_name] += 1
-                        browser_found = True
-                        break
+        return dict(browser_stats)
 
-                if not browser_found:
-                    browser_stats['Other'] += 1
-            else:
-                browser_stats['Unknown'] += 1
+    def get_ip_index(self) -> Dict[str, array]:
+        """
+        Возвращает индекс IP -> список позиций записей в self.log_entries.
 
-        return dict(browser_stats)
+        Индекс строится один раз и дополняется только новыми записями,
+        если log_entries с момента прошлого вызова вырос.
+
+        Returns:
+            Словарь {IP: [индексы записей]}
+        """
+        ip_column = self.log_entries.ips
+        for offset in range(self._ip_indexed_entries, len(ip_column)):
+            self._ip_index[ip_column[offset]].append(offset)
+        self._ip_indexed_entries = len(self.log_entries)
+        return self._ip_index
 
     def find_suspicious_ips(self, min_requests: int = 100) -> List[Tuple[str, int, List[str]]]:
         """
@@ -300,63 +1006,76 @@ class LogAnalyzer:
         Returns:
             Список кортежей (IP, количество_запросов, список_подозрительных_паттернов)
         """
-        ip_stats = self.get_ip_statistics()
-        suspicious_ips = []
-
-        # Регулярные выражения для подозрительных паттернов в URL
-        suspicious_patterns = {
-            'SQL Injection': re.compile(r'(union|select|insert|delete|drop|script)', re.IGNORECASE),
-            'XSS Attempt': re.compile(r'(<script|javascript:|onload=|onerror=)', re.IGNORECASE),
-            'Directory Traversal': re.compile(r'(\.\./|\.\.\\|/etc/passwd|/windows/system32)', re.IGNORECASE),
-            'Admin Panel Access': re.compile(r'(admin|wp-admin|administrator|dashboard)', re.IGNORECASE),
-            'Config Files': re.compile(r'(\.env|config\.php|wp-config|database)', re.IGNORECASE),
-        }
+        with self._statistics_lock:
+            if self.statistics is not None:
+                return self.statistics.find_suspicious_ips(min_requests)
 
+        ip_stats = self.get_ip_statistics()
+        ip_index = self.get_ip_index()
+        url_column = self.log_entries.urls
+        ip_patterns = {}
         for ip, count in ip_stats.items():
             if count >= min_requests:
-                # Анализируем запросы от этого IP
-                ip_requests = [entry for entry in self.log_entries if entry.ip == ip]
-                found_patterns = []
+                found = set()
+                for offset in ip_index[ip]:
+                    found.update(classify_url(url_column[offset]))
+                ip_patterns[ip] = found
 
-                for entry in ip_requests:
-                    for pattern_name, pattern in suspicious_patterns.items():
-                        if pattern.search(entry.url) and pattern_name not in found_patterns:
-                            found_patterns.append(pattern_name)
+        return rank_suspicious_ips(ip_stats, ip_patterns, min_requests)
 
-                if found_patterns or count > 1000:  # Много запросов тоже подозрительно
-                    if count > 1000:
-                        found_patterns.append('High Request Volume')
-                    suspicious_ips.append((ip, count, found_patterns))
+def split_file_into_chunks(file_path: Path, chunks: int) -> List[Tuple[int, int]]:
+    """
+    Делит файл на диапазоны байтов примерно одинакового размера.
 
-        return sorted(suspicious_ips, key=lambda x: x[1], reverse=True)  # Конец строки
+    Каждая граница сдвигается на начало следующей строки, поэтому ни одна
+    строка не разрезается между фрагментами.
 
-        # Улучшенное регулярное выражение для Combined Log Format
-        # Формат: CLF + "referer" "user-agent"
-        self.combined_pattern = re.compile(
-        r'^'  # Начало строки
-        r'(?P<ip>\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}|[:\da-fA-F]+)'  # IPv4 или IPv6
-        r'\s+'
-        r'(?P<ident>\S+)'  # remote logname
-        r'\s+'
-        r'(?P<authuser>\S+)'  # remote user
-        r'\s+'
-        r'\[(?P<timestamp>[^\]]+)\]'  # timestamp
-        r'\s+'
-        r'"(?P<method>[A-Z]+)'  # HTTP метод
-        r'\s+'
-        r'(?P<url>\S+)'  # URL
-        r'\s+'
-        r'(?P<protocol>HTTP/[\d\.]+)"'  # HTTP версия
-        r'\s+'
-        r'(?P<status>\d{3})'  # HTTP статус код
-        r'\s+'
-        r'(?P<size>\d+|-)'  # Размер ответа
-        r'\s+'
-        r'"(?P<referer>[^"]*)"'  # Referer
-        r'\s+'
-        r'"(?P<user_agent>[^"]*)"'  # User-Agent
-        r'(?:\s+.*)?'  # Дополнительные поля
-        )
+    Args:
+        file_path: Путь к файлу
+        chunks: Желаемое количество фрагментов
+
+    Returns:
+        Список непустых диапазонов (start, end)
+    """
+    file_size = os.path.getsize(file_path)
+    if file_size == 0:
+        return []
+
+    chunk_size = max(1, file_size // max(1, chunks))
+    boundaries = [0]
+
+    with open(file_path, 'rb') as file:
+        for i in range(1, chunks):
+            file.seek(i * chunk_size)
+            file.readline()  # Дочитываем текущую строку до конца
+            boundary = min(file.tell(), file_size)
+            if boundary > boundaries[-1]:
+                boundaries.append(boundary)
+
+    if boundaries[-1] < file_size:
+        boundaries.append(file_size)
+
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def _analyze_chunk(log_file_path: str, start: int, end: int, url_capacity: int) -> LogStatistics:
+    """
+    Обрабатывает один фрагмент файла в дочернем процессе.
+
+    Args:
+        log_file_path: Путь к лог-файлу
+        start: Начало фрагмента (байт)
+        end: Конец фрагмента (байт)
+        url_capacity: Размер топа URL
+
+    Returns:
+        Частичная статистика по фрагменту
+    """
+    analyzer = LogAnalyzer(log_file_path)
+    statistics = LogStatistics(url_capacity)
+    for entry in analyzer.iter_chunk_entries(start, end):
+        statistics.add(entry)
+    return statistics
 
 
 def parse_log_line(self, line: str) -> Optional[LogEntry]:
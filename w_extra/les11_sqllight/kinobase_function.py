@@ -446,21 +446,19 @@ def show_actors_and_movies_union(cursor: sqlite3.Cursor) -> None:
 
 def show_movies_with_age(cursor: sqlite3.Cursor) -> None:
     """
-    Відображення фільмів з їхнім віком (використовує власну функцію movie_age).
+    Відображення фільмів з їхнім віком.
 
-    Функція демонструє використання користувацької SQL-функції movie_age(),
-    яка обчислює, скільки років минуло з моменту випуску фільму.
+    Вік обчислюється прямо в SQL: поточний рік передається параметром і
+    віднімається від release_year. Це та сама арифметика, що й у
+    movie_age(), але без виклику Python-функції для кожного рядка.
 
     SQL Operations:
-        - movie_age(): Користувацька функція для обчислення віку
-        - ORDER BY: Сортування за віком (спадання)
+        - ? - release_year: Вік фільму відносно поточного року
+        - ORDER BY: Сортування за роком випуску (від найстаріших)
 
     Args:
         cursor (Cursor): Курсор для виконання SQL-запитів
 
-    Note:
-        Потрібно попередньо зареєструвати функцію через register_custom_function()
-
     Example:
         >>> show_movies_with_age(cursor)
         1. Фільм: "Матриця" — 26 рок(ів) (випущено у 1999)
@@ -472,11 +470,11 @@ def show_movies_with_age(cursor: sqlite3.Cursor) -> None:
             SELECT 
                 title,
                 release_year,
-                movie_age(release_year) as age
+                ? - release_year as age
             FROM movies
-            ORDER BY age DESC
+            ORDER BY release_year
         '''
-        cursor.execute(query)
+        cursor.execute(query, (datetime.now().year,))
         movies = cursor.fetchall()
 
         if not movies:
@@ -623,9 +621,108 @@ def main() -> None:
     - movie_cast: movie_id, actor_id
 """
 
+import base64
+import json
 import sqlite3
 from datetime import datetime
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+
+
+# =====================================================
+# СХЕМА ТА ЗАПИТИ
+# =====================================================
+
+# Розмір кешу підготовлених запитів з'єднання. sqlite3 кешує скомпільовані
+# запити за текстом SQL, тому запити меню винесені в константи.
+STATEMENT_CACHE_SIZE = 256
+
+# Міграції схеми: версія (PRAGMA user_version) -> список SQL-команд
+SCHEMA_MIGRATIONS: Dict[int, List[str]] = {
+    1: [
+        "CREATE INDEX IF NOT EXISTS idx_movies_title ON movies (title)",
+        "CREATE INDEX IF NOT EXISTS idx_movies_genre ON movies (genre)",
+        "CREATE INDEX IF NOT EXISTS idx_actors_name ON actors (name)",
+        "CREATE INDEX IF NOT EXISTS idx_movie_cast_actor ON movie_cast (actor_id, movie_id)",
+    ],
+}
+
+# Фільми з акторами. Актори групуються прямо при послідовному обході
+# первинного ключа movie_cast (movie_id, actor_id), без GROUP BY по всім
+# колонкам movies; потім кожна група з'єднується з фільмом по id.
+MOVIES_WITH_ACTORS_QUERY = """
+    SELECT m.title,
+           m.release_year,
+           m.genre,
+           c.actors
+    FROM (SELECT mc.movie_id, GROUP_CONCAT(a.name, ', ') AS actors
+          FROM movie_cast mc
+                   INNER JOIN actors a ON a.id = mc.actor_id
+          GROUP BY mc.movie_id) c
+             INNER JOIN movies m ON m.id = c.movie_id
+    ORDER BY m.title
+"""
+
+UNIQUE_GENRES_QUERY = "SELECT DISTINCT genre FROM movies ORDER BY genre"
+
+COUNT_MOVIES_BY_GENRE_QUERY = """
+    SELECT genre, COUNT(*) AS count
+    FROM movies
+    GROUP BY genre
+    ORDER BY count DESC, genre
+"""
+
+AVG_ACTOR_BIRTH_YEAR_QUERY = """
+    SELECT AVG(a.birth_year) AS avg_birth_year
+    FROM movies m
+             INNER JOIN movie_cast mc ON mc.movie_id = m.id
+             INNER JOIN actors a ON a.id = mc.actor_id
+    WHERE m.genre = ?
+"""
+
+SEARCH_MOVIES_QUERY = """
+    SELECT id, title, release_year, genre
+    FROM movies
+    WHERE title LIKE ?
+    ORDER BY title
+"""
+
+COUNT_MOVIES_QUERY = "SELECT COUNT(*) FROM movies"
+
+# Keyset-пагінація: сторінка починається одразу після (title, id) останнього
+# показаного фільму, тому її час не залежить від номера сторінки
+FIRST_MOVIES_PAGE_QUERY = """
+    SELECT id, title, release_year, genre
+    FROM movies
+    ORDER BY title, id
+    LIMIT ?
+"""
+
+NEXT_MOVIES_PAGE_QUERY = """
+    SELECT id, title, release_year, genre
+    FROM movies
+    WHERE (title, id) > (?, ?)
+    ORDER BY title, id
+    LIMIT ?
+"""
+
+ACTORS_AND_MOVIES_QUERY = """
+    SELECT name AS item, 'Актор' AS type
+    FROM actors
+    UNION
+    SELECT title AS item, 'Фільм' AS type
+    FROM movies
+    ORDER BY item
+"""
+
+# Вік фільму: поточний рік передається параметром, тому текст запиту
+# незмінний і береться з кешу підготовлених запитів
+MOVIES_WITH_AGE_QUERY = """
+    SELECT title,
+           release_year,
+           ? - release_year AS age
+    FROM movies
+    ORDER BY release_year
+"""
 
 
 # =====================================================
@@ -649,7 +746,7 @@ def connect_to_database(db_name: str = "kinobase.db") -> Tuple[Optional[sqlite3.
         ...     print("Підключено успішно")
     """
     try:
-        conn = sqlite3.connect(db_name)
+        conn = sqlite3.connect(db_name, cached_statements=STATEMENT_CACHE_SIZE)
         cursor = conn.cursor()
         # Увімкнення підтримки зовнішніх ключів для забезпечення цілісності даних
         cursor.execute("PRAGMA foreign_keys = ON")
@@ -660,6 +757,41 @@ def connect_to_database(db_name: str = "kinobase.db") -> Tuple[Optional[sqlite3.
         return None, None
 
 
+def migrate_schema(conn: sqlite3.Connection, cursor: sqlite3.Cursor) -> None:
+    """
+    Застосування міграцій схеми (індексів) з SCHEMA_MIGRATIONS.
+
+    Поточна версія схеми зберігається у PRAGMA user_version, тому кожна
+    міграція виконується лише один раз.
+
+    Args:
+        conn (Connection): Об'єкт з'єднання з базою даних
+        cursor (Cursor): Курсор для виконання SQL-запитів
+
+    Raises:
+        sqlite3.Error: Якщо міграцію не вдалося застосувати
+    """
+    version = cursor.execute("PRAGMA user_version").fetchone()[0]
+    pending = [v for v in sorted(SCHEMA_MIGRATIONS) if v > version]
+    if not pending:
+        return
+
+    try:
+        for target_version in pending:
+            for statement in SCHEMA_MIGRATIONS[target_version]:
+                cursor.execute(statement)
+            # PRAGMA не підтримує параметри, версія - ціле число з коду
+            cursor.execute(f"PRAGMA user_version = {int(target_version)}")
+        # Оновлення статистики для планувальника запитів
+        cursor.execute("ANALYZE")
+        conn.commit()
+        print(f"✓ Схему оновлено до версії {pending[-1]}")
+    except sqlite3.Error as e:
+        print(f"✗ Помилка міграції схеми: {e}")
+        conn.rollback()
+        raise
+
+
 def register_custom_function(conn: sqlite3.Connection) -> None:
     """
     Реєстрація власної SQL-функції movie_age().
@@ -874,18 +1006,7 @@ def show_movies_with_actors(cursor: sqlite3.Cursor) -> None:
     """
     print("\n=== ФІЛЬМИ ТА АКТОРИ ===")
     try:
-        query = '''
-                SELECT m.title, \
-                       m.release_year, \
-                       m.genre, \
-                       GROUP_CONCAT(a.name, ', ') as actors
-                FROM movies m
-                         INNER JOIN movie_cast mc ON m.id = mc.movie_id
-                         INNER JOIN actors a ON mc.actor_id = a.id
-                GROUP BY m.id, m.title, m.release_year, m.genre
-                ORDER BY m.title \
-                '''
-        cursor.execute(query)
+        cursor.execute(MOVIES_WITH_ACTORS_QUERY)
         movies = cursor.fetchall()
 
         if not movies:
@@ -921,7 +1042,7 @@ def show_unique_genres(cursor: sqlite3.Cursor) -> None:
     """
     print("\n=== УНІКАЛЬНІ ЖАНРИ ===")
     try:
-        cursor.execute("SELECT DISTINCT genre FROM movies ORDER BY genre")
+        cursor.execute(UNIQUE_GENRES_QUERY)
         genres = cursor.fetchall()
 
         if not genres:
@@ -956,13 +1077,7 @@ def count_movies_by_genre(cursor: sqlite3.Cursor) -> None:
     """
     print("\n=== КІЛЬКІСТЬ ФІЛЬМІВ ЗА ЖАНРОМ ===")
     try:
-        query = '''
-                SELECT genre, COUNT(*) as count
-                FROM movies
-                GROUP BY genre
-                ORDER BY count DESC, genre \
-                '''
-        cursor.execute(query)
+        cursor.execute(COUNT_MOVIES_BY_GENRE_QUERY)
         results = cursor.fetchall()
 
         if not results:
@@ -1005,14 +1120,7 @@ def avg_actor_birth_year_by_genre(cursor: sqlite3.Cursor) -> None:
             print("✗ Жанр не може бути порожнім!")
             return
 
-        query = '''
-                SELECT AVG(a.birth_year) as avg_birth_year
-                FROM actors a
-                         INNER JOIN movie_cast mc ON a.id = mc.actor_id
-                         INNER JOIN movies m ON mc.movie_id = m.id
-                WHERE m.genre = ? \
-                '''
-        cursor.execute(query, (genre,))
+        cursor.execute(AVG_ACTOR_BIRTH_YEAR_QUERY, (genre,))
         result = cursor.fetchone()
 
         if result[0] is None:
@@ -1051,13 +1159,7 @@ def search_movies_by_title(cursor: sqlite3.Cursor) -> None:
             print("✗ Ключове слово не може бути порожнім!")
             return
 
-        query = '''
-                SELECT id, title, release_year, genre
-                FROM movies
-                WHERE title LIKE ?
-                ORDER BY title \
-                '''
-        cursor.execute(query, (f'%{keyword}%',))
+        cursor.execute(SEARCH_MOVIES_QUERY, (f'%{keyword}%',))
         movies = cursor.fetchall()
 
         if not movies:
@@ -1071,9 +1173,76 @@ def search_movies_by_title(cursor: sqlite3.Cursor) -> None:
         print(f"✗ Помилка пошуку: {e}")
 
 
+def encode_page_cursor(title: str, movie_id: int) -> str:
+    """
+    Кодує позицію останнього фільму сторінки у непрозорий курсор.
+
+    Args:
+        title (str): Назва останнього фільму сторінки
+        movie_id (int): ID останнього фільму сторінки
+
+    Returns:
+        str: Курсор для запиту наступної сторінки
+    """
+    payload = json.dumps([title, movie_id], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_page_cursor(page_cursor: str) -> Tuple[str, int]:
+    """
+    Розкодовує курсор, створений encode_page_cursor().
+
+    Args:
+        page_cursor (str): Курсор сторінки
+
+    Returns:
+        Tuple[str, int]: (назва, ID) останнього фільму попередньої сторінки
+
+    Raises:
+        ValueError: Якщо курсор пошкоджений
+    """
+    try:
+        title, movie_id = json.loads(base64.urlsafe_b64decode(page_cursor.encode("ascii")))
+        return str(title), int(movie_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Некоректний курсор сторінки: {page_cursor!r}") from e
+
+
+def fetch_movies_page(cursor: sqlite3.Cursor, page_size: int,
+                      page_cursor: Optional[str] = None) -> Tuple[List[tuple], Optional[str]]:
+    """
+    Повертає одну сторінку фільмів, відсортованих за назвою (keyset-пагінація).
+
+    Args:
+        cursor (Cursor): Курсор для виконання SQL-запитів
+        page_size (int): Кількість фільмів на сторінці
+        page_cursor (Optional[str]): Курсор з попереднього виклику
+            або None для першої сторінки
+
+    Returns:
+        Tuple: (список (id, назва, рік, жанр), курсор наступної сторінки
+            або None, якщо сторінка остання)
+
+    Raises:
+        ValueError: Якщо курсор пошкоджений
+    """
+    # Запитуємо на один рядок більше, щоб дізнатися, чи є наступна сторінка
+    if page_cursor is None:
+        rows = cursor.execute(FIRST_MOVIES_PAGE_QUERY, (page_size + 1,)).fetchall()
+    else:
+        title, movie_id = decode_page_cursor(page_cursor)
+        rows = cursor.execute(NEXT_MOVIES_PAGE_QUERY, (title, movie_id, page_size + 1)).fetchall()
+
+    if len(rows) <= page_size:
+        return rows, None
+
+    rows = rows[:page_size]
+    return rows, encode_page_cursor(rows[-1][1], rows[-1][0])
+
+
 def show_movies_paginated(cursor: sqlite3.Cursor) -> None:
     """
-    Відображення фільмів з пагінацією (використовує LIMIT та OFFSET).
+    Відображення фільмів з пагінацією (keyset-пагінація з курсором).
 
     Функція розбиває результати на сторінки та дозволяє користувачу
     переглядати їх поступово. Використовується для роботи з великими
@@ -1081,8 +1250,8 @@ def show_movies_paginated(cursor: sqlite3.Cursor) -> None:
 
     SQL Operations:
         - COUNT(*): Підрахунок загальної кількості записів
+        - WHERE (title, id) > (?, ?): Початок сторінки після курсора
         - LIMIT: Обмеження кількості результатів
-        - OFFSET: Зміщення початку вибірки
 
     Args:
         cursor (Cursor): Курсор для виконання SQL-запитів
@@ -1099,7 +1268,7 @@ def show_movies_paginated(cursor: sqlite3.Cursor) -> None:
     print("\n=== ПЕРЕГЛЯД ФІЛЬМІВ (ПАГІНАЦІЯ) ===")
     try:
         # Підрахунок загальної кількості фільмів
-        cursor.execute("SELECT COUNT(*) FROM movies")
+        cursor.execute(COUNT_MOVIES_QUERY)
         total = cursor.fetchone()[0]
 
         if total == 0:
@@ -1109,26 +1278,20 @@ def show_movies_paginated(cursor: sqlite3.Cursor) -> None:
         page_size = 5
         total_pages = (total + page_size - 1) // page_size
         page = 1
+        shown = 0
+        page_cursor = None
 
         while True:
-            offset = (page - 1) * page_size
-
-            query = '''
-                    SELECT id, title, release_year, genre
-                    FROM movies
-                    ORDER BY title LIMIT ? \
-                    OFFSET ? \
-                    '''
-            cursor.execute(query, (page_size, offset))
-            movies = cursor.fetchall()
+            movies, page_cursor = fetch_movies_page(cursor, page_size, page_cursor)
 
             print(f"\n--- Сторінка {page} з {total_pages} ---")
-            for i, movie in enumerate(movies, offset + 1):
+            for i, movie in enumerate(movies, shown + 1):
                 print(f"{i}. {movie[1]} ({movie[2]}), Жанр: {movie[3]}")
+            shown += len(movies)
 
             print(f"\nВсього фільмів: {total}")
 
-            if page < total_pages:
+            if page_cursor is not None:
                 action = input("\nНаступна сторінка (Enter) або вихід (q): ").strip().lower()
                 if action == 'q':
                     break
@@ -1161,15 +1324,7 @@ def show_actors_and_movies_union(cursor: sqlite3.Cursor) -> None:
     """
     print("\n=== ІМЕНА АКТОРІВ ТА НАЗВИ ФІЛЬМІВ ===")
     try:
-        query = '''
-                SELECT name as item, 'Актор' as type \
-                FROM actors
-                UNION
-                SELECT title as item, 'Фільм' as type \
-                FROM movies
-                ORDER BY item \
-                '''
-        cursor.execute(query)
+        cursor.execute(ACTORS_AND_MOVIES_QUERY)
         results = cursor.fetchall()
 
         if not results:
@@ -1184,21 +1339,19 @@ def show_actors_and_movies_union(cursor: sqlite3.Cursor) -> None:
 
 def show_movies_with_age(cursor: sqlite3.Cursor) -> None:
     """
-    Відображення фільмів з їхнім віком (використовує власну функцію movie_age).
+    Відображення фільмів з їхнім віком.
 
-    Функція демонструє використання користувацької SQL-функції movie_age(),
-    яка обчислює, скільки років минуло з моменту випуску фільму.
+    Вік обчислюється прямо в SQL: поточний рік передається параметром і
+    віднімається від release_year. Це та сама арифметика, що й у
+    movie_age(), але без виклику Python-функції для кожного рядка.
 
     SQL Operations:
-        - movie_age(): Користувацька функція для обчислення віку
-        - ORDER BY: Сортування за віком (спадання)
+        - ? - release_year: Вік фільму відносно поточного року
+        - ORDER BY: Сортування за роком випуску (від найстаріших)
 
     Args:
         cursor (Cursor): Курсор для виконання SQL-запитів
 
-    Note:
-        Потрібно попередньо зареєструвати функцію через register_custom_function()
-
     Example:
         >>> show_movies_with_age(cursor)
         1. Фільм: "Матриця" — 26 рок(ів) (випущено у 1999)
@@ -1206,14 +1359,7 @@ def show_movies_with_age(cursor: sqlite3.Cursor) -> None:
     """
     print("\n=== ФІЛЬМИ ТА ЇХНІЙ ВІК ===")
     try:
-        query = '''
-                SELECT title, \
-                       release_year, \
-                       movie_age(release_year) as age
-                FROM movies
-                ORDER BY age DESC \
-                '''
-        cursor.execute(query)
+        cursor.execute(MOVIES_WITH_AGE_QUERY, (datetime.now().year,))
         movies = cursor.fetchall()
 
         if not movies:
@@ -1269,7 +1415,12 @@ def main() -> None:
         print("\nНе вдалося підключитися до бази даних!")
         return
 
-    # Реєстрація власної функції
+    # Індекси для запитів меню та реєстрація власної функції
+    try:
+        migrate_schema(conn, cursor)
+    except sqlite3.Error:
+        conn.close()
+        return
     register_custom_function(conn)
 
     # Головний цикл програми